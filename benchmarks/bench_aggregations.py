@@ -0,0 +1,187 @@
+"""Benchmark agregasi dashboard: lambda per grup vs sum/mean bawaan.
+
+Membandingkan tiga cara menghitung persentase terlambat per state dan tabel
+"Detail per Skor Review", "Detail per State", "Detail per Bulan":
+
+- ``lambda``: cara lama, ``apply``/``agg`` dengan lambda Python per grup
+- ``is_late``: groupby bawaan pandas di atas kolom ``is_late``
+- ``cube``: rollup dari sel cube (biaya build cube dicetak terpisah)
+
+Hasil ketiganya dicek sama sebelum diukur.
+
+    python -m benchmarks.bench_aggregations --rows 100000 1000000 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import END, START, STATES
+
+import cube
+
+
+def make_frame(n, seed=0):
+    """Kolom yang dipakai agregasi dashboard, tanpa kolom id (hemat memori)"""
+    rng = np.random.default_rng(seed)
+    span = (END - START).astype(np.int64)
+    weights = np.array([s[1] for s in STATES])
+    delivery = rng.gamma(2.0, 6.0, n).astype(np.int64)
+    late = rng.random(n) < 0.08
+    return pd.DataFrame(
+        {
+            "order_purchase_timestamp": (
+                START + rng.integers(0, span, n).astype("m8[s]")
+            ).astype("M8[ns]"),
+            "review_score": rng.integers(1, 6, n),
+            "delivery_time": delivery,
+            "delivery_status": np.where(late, "Terlambat", "Tepat Waktu"),
+            "customer_state": np.array([s[0] for s in STATES])[
+                rng.choice(len(STATES), n, p=weights / weights.sum())
+            ],
+        }
+    )
+
+
+def with_lambda(df):
+    """Agregasi seperti dashboard sebelum ada ``is_late``"""
+    late_pct = df.groupby("customer_state").apply(
+        lambda x: (x["delivery_status"] == "Terlambat").sum() / len(x) * 100
+    )
+    score_detail = df.groupby("review_score").agg(
+        {
+            "delivery_time": ["count", "mean", "median", "std", "min", "max"],
+            "delivery_status": lambda x: (x == "Terlambat").sum(),
+        }
+    )
+    state_detail = df.groupby("customer_state").agg(
+        {
+            "delivery_time": ["count", "mean"],
+            "delivery_status": lambda x: (x == "Terlambat").sum(),
+        }
+    )
+    monthly_df = df.copy()
+    monthly_df["month"] = (
+        monthly_df["order_purchase_timestamp"].dt.to_period("M").astype(str)
+    )
+    monthly_detail = monthly_df.groupby("month").agg(
+        {
+            "delivery_time": ["count", "mean"],
+            "review_score": "mean",
+            "delivery_status": lambda x: (x == "Terlambat").sum(),
+        }
+    )
+    return late_pct, score_detail, state_detail, monthly_detail
+
+
+def with_is_late(df):
+    """Agregasi yang sama dengan groupby bawaan di atas ``is_late``"""
+    late_pct = df.groupby("customer_state")["is_late"].mean() * 100
+    score_detail = df.groupby("review_score").agg(
+        Jumlah=("delivery_time", "count"),
+        Mean=("delivery_time", "mean"),
+        Median=("delivery_time", "median"),
+        Std=("delivery_time", "std"),
+        Min=("delivery_time", "min"),
+        Max=("delivery_time", "max"),
+        Terlambat=("is_late", "sum"),
+    )
+    state_detail = df.groupby("customer_state").agg(
+        total=("delivery_time", "count"),
+        mean=("delivery_time", "mean"),
+        late=("is_late", "sum"),
+    )
+    # Kelompokkan per periode dulu, konversi ke string hanya untuk label
+    month = df["order_purchase_timestamp"].dt.to_period("M")
+    monthly_detail = df.groupby(month.rename("month")).agg(
+        total=("delivery_time", "count"),
+        delivery=("delivery_time", "mean"),
+        score=("review_score", "mean"),
+        late=("is_late", "sum"),
+    )
+    monthly_detail.index = monthly_detail.index.astype(str)
+    return late_pct, score_detail, state_detail, monthly_detail
+
+
+def with_cube(reviews_cube, geo_cube):
+    """Agregasi yang sama dari sel cube seperti di dashboard"""
+    state_totals = cube.rollup(geo_cube, "customer_state")
+    late_pct = state_totals["late_count"] / state_totals["count"] * 100
+    score_detail = cube.delivery_detail(reviews_cube, "review_score")
+    state_detail = pd.DataFrame(
+        {
+            "total": state_totals["count"],
+            "mean": state_totals["delivery_sum"] / state_totals["count"],
+            "late": state_totals["late_count"],
+        }
+    )
+    month_totals = cube.time_buckets(reviews_cube).groupby(level="month_id").sum()
+    month_totals.index = cube.month_labels(month_totals.index)
+    monthly_detail = pd.DataFrame(
+        {
+            "total": month_totals["count"],
+            "delivery": month_totals["delivery_sum"] / month_totals["count"],
+            "score": month_totals["score_sum"] / month_totals["count"],
+            "late": month_totals["late_count"],
+        }
+    )
+    return late_pct, score_detail, state_detail, monthly_detail
+
+
+def check_same(expected, actual):
+    """Bandingkan nilai hasil agregasi (abaikan nama kolom dan dtype)"""
+    for old, new in zip(expected, actual):
+        np.testing.assert_allclose(
+            np.asarray(old, dtype=np.float64),
+            np.asarray(new, dtype=np.float64),
+            rtol=1e-9,
+        )
+
+
+def best_time(func, repeat):
+    """Waktu tercepat dari ``repeat`` kali pemanggilan"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'baris':>12}{'lambda':>10}{'is_late':>10}{'cube':>10}"
+        f"{'build cube':>12}{'x is_late':>11}{'x cube':>9}"
+    )
+    for n in args.rows:
+        df = cube.add_is_late(make_frame(n, args.seed))
+        start = time.perf_counter()
+        reviews_cube = cube.build_cube(df, cube.REVIEW_DIMENSIONS)
+        geo_cube = cube.build_cube(df, cube.GEO_DIMENSIONS)
+        t_build = time.perf_counter() - start
+
+        expected = with_lambda(df)
+        check_same(expected, with_is_late(df))
+        check_same(expected, with_cube(reviews_cube, geo_cube))
+
+        t_lambda = best_time(lambda: with_lambda(df), args.repeat)
+        t_native = best_time(lambda: with_is_late(df), args.repeat)
+        t_cube = best_time(lambda: with_cube(reviews_cube, geo_cube), args.repeat)
+        print(
+            f"{n:>12,}{t_lambda:>10.3f}{t_native:>10.3f}{t_cube:>10.3f}"
+            f"{t_build:>12.3f}{t_lambda / t_native:>11.1f}{t_lambda / t_cube:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
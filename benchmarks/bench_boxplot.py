@@ -0,0 +1,108 @@
+"""Benchmark boxplot waktu pengiriman: ``sns.boxplot`` per baris vs ``bxp``.
+
+Chart lama mengirim semua baris hasil filter ke ``sns.boxplot`` (sort
+``delivery_time`` per skor, satu marker per outlier). Chart baru menggambar
+statistik per skor dari jumlah order per (skor, hari) di sel cube
+(``views.delivery_boxes``) dengan ``Axes.bxp``. Statistik dicek sama dengan
+``matplotlib.cbook.boxplot_stats`` atas baris sebelum diukur; kolom ``stats``
+adalah waktu ``views.delivery_boxes`` saja.
+
+    python -m benchmarks.bench_boxplot --rows 100000 1000000
+"""
+
+import argparse
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import seaborn as sns  # noqa: E402
+from matplotlib import cbook  # noqa: E402
+
+from benchmarks.synthetic import make_orders_reviews  # noqa: E402
+
+import charts  # noqa: E402
+import cube  # noqa: E402
+import figcache  # noqa: E402
+import views  # noqa: E402
+
+STATS = ["q1", "med", "q3", "whislo", "whishi", "mean"]
+
+
+def boxplot_rows(df):
+    """Boxplot dashboard sebelum memakai statistik ringkas"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.boxplot(
+        data=df,
+        x="review_score",
+        y="delivery_time",
+        hue="review_score",
+        palette="coolwarm",
+        legend=False,
+        ax=ax,
+    )
+    return fig
+
+
+def check_same(df, boxes):
+    """Statistik ``bxp`` sama dengan ``cbook.boxplot_stats`` atas baris"""
+    groups = df.groupby("review_score")["delivery_time"]
+    exact = cbook.boxplot_stats([values.to_numpy() for _, values in groups])
+    for expected, box in zip(exact, boxes):
+        for key in STATS:
+            if not np.isclose(expected[key], box[key]):
+                raise AssertionError(f"{key} skor {box['label']} berbeda")
+        if not np.array_equal(np.unique(expected["fliers"]), box["fliers"]):
+            raise AssertionError(f"outlier skor {box['label']} berbeda")
+
+
+def best_of(func, repeat):
+    """(hasil, waktu terbaik) dari ``repeat`` kali pemanggilan"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def render(func, *args):
+    """Bytes PNG chart (``create`` + ``savefig``), seperti cache gambar"""
+    return figcache.figure_bytes(func(*args))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'baris':>12}{'outlier':>9}{'stats':>9}{'chart baris':>13}{'chart bxp':>11}"
+    )
+    print(f"{'':>21}{'(ms)':>9}{'(ms)':>13}{'(ms)':>11}")
+    for rows in args.rows:
+        df = make_orders_reviews(rows, args.seed)
+        cube.add_is_late(df)
+        cells = cube.build_cube(df, ["review_score", "delivery_time", "is_late"])
+
+        boxes, t_stats = best_of(lambda: views.delivery_boxes(cells), args.repeat)
+        check_same(df, boxes)
+        _, t_rows = best_of(lambda: render(boxplot_rows, df), args.repeat)
+        _, t_bxp = best_of(
+            lambda: render(charts.create_delivery_boxplot, views.delivery_boxes(cells)),
+            args.repeat,
+        )
+        fliers = sum(len(box["fliers"]) for box in boxes)
+        print(
+            f"{rows:>12,}{fliers:>9}{t_stats * 1000:>9.1f}"
+            f"{t_rows * 1000:>13.1f}{t_bxp * 1000:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
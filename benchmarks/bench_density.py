@@ -0,0 +1,88 @@
+"""Benchmark histogram/KDE waktu pengiriman: per baris vs jumlah per hari.
+
+Membandingkan chart histogram lama (``sns.histplot(kde=True)`` atas baris
+hasil filter, KDE Gaussian dievaluasi terhadap setiap order) dengan
+``charts.create_delivery_histogram`` atas jumlah order per hari dari sel cube
+(``views.delivery_counts``, KDE lewat konvolusi FFT di ``density``). Baris
+``kde`` hanya mengukur perhitungan densitas; KDE kedua cara dicek sama.
+
+    python -m benchmarks.bench_density --rows 100000 1000000
+"""
+
+import argparse
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import seaborn as sns  # noqa: E402
+from seaborn.external.kde import gaussian_kde  # noqa: E402
+
+from benchmarks.synthetic import make_orders_reviews  # noqa: E402
+
+import charts  # noqa: E402
+import cube  # noqa: E402
+import density  # noqa: E402
+import views  # noqa: E402
+
+
+def histplot_rows(df):
+    """Histogram dashboard sebelum memakai jumlah per hari"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.histplot(data=df, x="delivery_time", bins=30, kde=True, color="#3498db", ax=ax)
+    ax.axvline(df["delivery_time"].mean(), color="red", linestyle="--")
+    ax.axvline(df["delivery_time"].median(), color="green", linestyle="--")
+    return fig
+
+
+def best_of(func, repeat):
+    """(hasil, waktu terbaik) dari ``repeat`` kali pemanggilan"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+        plt.close("all")
+    return result, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'baris':>12}{'hari':>6}{'kde baris':>11}{'kde fft':>9}"
+        f"{'chart baris':>13}{'chart hari':>12}"
+    )
+    print(f"{'':>18}{'(ms)':>11}{'(ms)':>9}{'(ms)':>13}{'(ms)':>12}")
+    for rows in args.rows:
+        df = make_orders_reviews(rows, args.seed)
+        cube.add_is_late(df)
+        cells = cube.build_cube(df, ["delivery_time", "is_late"])
+        counts = views.delivery_counts(cells)
+        values = df["delivery_time"].to_numpy(np.float64)
+
+        (grid, fast), t_fft = best_of(lambda: density.kde(counts), args.repeat)
+        exact, t_rows = best_of(lambda: gaussian_kde(values)(grid), args.repeat)
+        if not np.allclose(fast, exact, rtol=1e-9, atol=1e-12):
+            raise AssertionError("KDE FFT berbeda dengan KDE per baris")
+
+        _, t_chart_rows = best_of(lambda: histplot_rows(df), args.repeat)
+        _, t_chart_days = best_of(
+            lambda: charts.create_delivery_histogram(views.delivery_counts(cells)),
+            args.repeat,
+        )
+        print(
+            f"{rows:>12,}{len(counts):>6}{t_rows * 1000:>11.1f}{t_fft * 1000:>9.2f}"
+            f"{t_chart_rows * 1000:>13.1f}{t_chart_days * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark stage jarak seller-pelanggan.
+
+Mengukur ``etl.seller_distances`` (geocoding seller lewat index, haversine
+tervektorisasi, lalu max/mean per order) dan membandingkannya dengan loop
+Python per item (``math`` + dict lookup). Hasil keduanya dicek sama.
+
+    python -m benchmarks.bench_distance --items 100000 1000000
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_dashboard_datasets, random_hex_ids
+from pipeline import etl, geocode
+
+
+def make_inputs(n_items, seed=0, n_sellers=3000):
+    """geo_orders, sellers, item order, dan index geocoding sintetis"""
+    rng = np.random.default_rng(seed)
+    n_orders = max(int(n_items / 1.15), 1)
+    _, geo_orders = make_dashboard_datasets(n_orders, seed)
+
+    geo_agg = geo_orders.drop_duplicates("geolocation_zip_code_prefix")
+    index = geocode.build_index(geo_agg)
+
+    # Sebagian kecil seller memakai kode pos yang tidak ada di geolocation
+    zips = np.append(index["zip"], [99998, 99999])
+    sellers = pd.DataFrame(
+        {
+            "seller_id": random_hex_ids(rng, n_sellers),
+            "seller_zip_code_prefix": rng.choice(zips, n_sellers).astype(np.int32),
+        }
+    )
+    order_ids = geo_orders["order_id"].to_numpy()
+    items = pd.DataFrame(
+        {
+            "order_id": order_ids[np.sort(rng.integers(0, len(order_ids), n_items))],
+            "seller_id": sellers["seller_id"].to_numpy()[
+                rng.integers(0, n_sellers, n_items)
+            ],
+        }
+    )
+    return items, sellers, geo_orders, index
+
+
+def per_row_loop(items, sellers, geo_orders, index):
+    """Cara naif: lookup dict dan ``math`` untuk setiap item"""
+    seller_zip = dict(zip(sellers["seller_id"], sellers["seller_zip_code_prefix"]))
+    zip_coord = dict(zip(index["zip"].tolist(), zip(index["lat"], index["lng"])))
+    known = index["zip"].tolist()
+    customer = dict(
+        zip(
+            geo_orders["order_id"],
+            zip(geo_orders["geolocation_lat"], geo_orders["geolocation_lng"]),
+        )
+    )
+    per_order = {}
+    for order_id, seller_id in zip(items["order_id"], items["seller_id"]):
+        zip_code = int(seller_zip[seller_id])
+        if zip_code not in zip_coord:
+            # Prefix terdekat, sama seperti lookup(nearest=True)
+            pos = min(np.searchsorted(known, zip_code), len(known) - 1)
+            left = max(pos - 1, 0)
+            if abs(zip_code - known[left]) <= abs(known[pos] - zip_code):
+                pos = left
+            zip_code = known[pos]
+        lat1, lng1 = (math.radians(float(v)) for v in zip_coord[zip_code])
+        lat2, lng2 = (math.radians(v) for v in customer[order_id])
+        a = (
+            math.sin((lat2 - lat1) / 2) ** 2
+            + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+        )
+        km = 2 * etl.EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+        per_order.setdefault(order_id, []).append(km)
+    return pd.DataFrame(
+        {
+            "order_id": list(per_order),
+            "seller_customer_km_max": [max(v) for v in per_order.values()],
+            "seller_customer_km_mean": [sum(v) / len(v) for v in per_order.values()],
+        }
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--loop-items", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'item':>12}{'vektor (s)':>12}{'item/s':>14}{'loop (s)':>10}{'x':>8}")
+    for n in args.items:
+        items, sellers, geo_orders, index = make_inputs(n, args.seed)
+
+        start = time.perf_counter()
+        result = etl.seller_distances(items, sellers, geo_orders, index)
+        t_vector = time.perf_counter() - start
+
+        # Loop hanya dijalankan pada sebagian item lalu diekstrapolasi
+        sample = items.iloc[: min(n, args.loop_items)]
+        start = time.perf_counter()
+        expected = per_row_loop(sample, sellers, geo_orders, index)
+        t_loop = (time.perf_counter() - start) * n / len(sample)
+
+        check = etl.seller_distances(sample, sellers, geo_orders, index)
+        pd.testing.assert_frame_equal(
+            check.reset_index(drop=True), expected, check_exact=False, rtol=1e-9
+        )
+
+        print(
+            f"{n:>12,}{t_vector:>12.3f}{n / t_vector:>14,.0f}"
+            f"{t_loop:>10.2f}{t_loop / t_vector:>8.0f}"
+        )
+        del result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark filter sidebar: mask-and-copy vs index filter.
+
+Membandingkan blok filter lama dashboard (``copy()`` lalu rangkaian boolean
+mask, termasuk ``.dt.date``) dengan ``filters.select`` + ``filters.take`` pada
+beberapa kombinasi filter. Hasil kedua cara dicek sama sebelum diukur.
+
+    python -m benchmarks.bench_filters --rows 1000000 --repeat 5
+"""
+
+import argparse
+import datetime
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_dashboard_datasets
+
+import cube
+import filters
+
+REVIEW_COLUMNS = ["review_score", "delivery_time"]
+GEO_COLUMNS = [
+    "is_late",
+    "geolocation_lat",
+    "geolocation_lng",
+    "geolocation_city",
+]
+
+
+def mask_and_copy(orders_reviews, geo_orders, f):
+    """Blok "Apply filters" dashboard sebelum memakai index"""
+    filtered_reviews = orders_reviews.copy()
+    filtered_reviews = filtered_reviews[
+        (filtered_reviews["order_purchase_timestamp"].dt.date >= f["date_range"][0])
+        & (filtered_reviews["order_purchase_timestamp"].dt.date <= f["date_range"][1])
+    ]
+    filtered_reviews = filtered_reviews[
+        (filtered_reviews["review_score"] >= f["score_range"][0])
+        & (filtered_reviews["review_score"] <= f["score_range"][1])
+        & (filtered_reviews["delivery_time"] >= f["delivery_range"][0])
+        & (filtered_reviews["delivery_time"] <= f["delivery_range"][1])
+    ]
+    if f["status"] is not None:
+        filtered_reviews = filtered_reviews[
+            filtered_reviews["delivery_status"] == f["status"]
+        ]
+
+    filtered_geo = geo_orders[geo_orders["customer_state"].isin(f["states"])].copy()
+    if f["status"] is not None:
+        filtered_geo = filtered_geo[filtered_geo["delivery_status"] == f["status"]]
+    filtered_geo = filtered_geo[
+        (filtered_geo["delivery_time"] >= f["delivery_range"][0])
+        & (filtered_geo["delivery_time"] <= f["delivery_range"][1])
+    ]
+    return filtered_reviews, filtered_geo
+
+
+def indexed(orders_reviews, geo_orders, reviews_index, geo_index, f):
+    """Filter lewat index seperti di dashboard"""
+    review_rows = filters.select(
+        reviews_index,
+        date_range=f["date_range"],
+        score_range=f["score_range"],
+        delivery_range=f["delivery_range"],
+        status=f["status"],
+    )
+    geo_rows = filters.select(
+        geo_index,
+        delivery_range=f["delivery_range"],
+        status=f["status"],
+        states=f["states"],
+    )
+    return (
+        filters.take(orders_reviews, review_rows, REVIEW_COLUMNS),
+        filters.take(geo_orders, geo_rows, GEO_COLUMNS),
+    )
+
+
+def scenarios(orders_reviews, geo_orders):
+    """Kombinasi filter: default dashboard sampai filter sempit"""
+    dates = orders_reviews["order_purchase_timestamp"]
+    first, last = dates.min().date(), dates.max().date()
+    states = sorted(geo_orders["customer_state"].unique())
+    default = {
+        "date_range": (first, last),
+        "score_range": (1, 5),
+        "delivery_range": (0, 30),
+        "status": None,
+        "states": states,
+    }
+    return {
+        "default": default,
+        "skor 2-4, terlambat": {
+            **default,
+            "score_range": (2, 4),
+            "status": "Terlambat",
+        },
+        "3 bulan, SP+RJ": {
+            **default,
+            "date_range": (last - datetime.timedelta(days=90), last),
+            "states": ["SP", "RJ"],
+        },
+    }
+
+
+def best_time(func, repeat):
+    """Waktu tercepat dari ``repeat`` kali pemanggilan"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def check_same(expected, actual):
+    """Pastikan kedua cara memilih baris dan nilai yang sama"""
+    for old, new in zip(expected, actual):
+        np.testing.assert_array_equal(old.index.to_numpy(), new.index.to_numpy())
+        for col in new.columns:
+            np.testing.assert_array_equal(
+                old[col].to_numpy(dtype=object), new[col].to_numpy(dtype=object)
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    orders_reviews, geo_orders = make_dashboard_datasets(args.rows, args.seed)
+    cube.add_is_late(orders_reviews)
+    cube.add_is_late(geo_orders)
+    start = time.perf_counter()
+    reviews_index = filters.build_index(orders_reviews, filters.REVIEW_INDEX)
+    geo_index = filters.build_index(geo_orders, filters.GEO_INDEX)
+    print(f"build index: {time.perf_counter() - start:.3f} detik (sekali per load)")
+
+    print(f"\n{'filter':<22}{'baris':>10}{'mask (ms)':>12}{'index (ms)':>12}{'x':>8}")
+    for name, f in scenarios(orders_reviews, geo_orders).items():
+        old = mask_and_copy(orders_reviews, geo_orders, f)
+        new = indexed(orders_reviews, geo_orders, reviews_index, geo_index, f)
+        check_same(old, new)
+
+        t_mask = best_time(
+            lambda: mask_and_copy(orders_reviews, geo_orders, f), args.repeat
+        )
+        t_index = best_time(
+            lambda: indexed(orders_reviews, geo_orders, reviews_index, geo_index, f),
+            args.repeat,
+        )
+        print(
+            f"{name:<22}{len(new[0]):>10,}{t_mask * 1000:>12.1f}"
+            f"{t_index * 1000:>12.1f}{t_mask / t_index:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark peta sebaran: scatter per titik vs raster kepadatan.
+
+Mengukur waktu binning + render PNG (opsi savefig sama dengan dashboard)
+untuk beberapa jumlah order. Mode scatter dilewati di atas ``--max-scatter``
+karena waktunya tumbuh linear.
+
+    python -m benchmarks.bench_geo_raster --rows 10000 100000 1000000 10000000
+"""
+
+import argparse
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import STATES  # noqa: E402
+
+import figcache  # noqa: E402
+import raster  # noqa: E402
+
+
+def make_points(n, seed=0):
+    """Koordinat order sintetis di sekitar pusat state, ~8% terlambat"""
+    rng = np.random.default_rng(seed)
+    weights = np.array([s[1] for s in STATES])
+    centers = np.array([(s[2], s[3]) for s in STATES])
+    state = rng.choice(len(STATES), n, p=weights / weights.sum())
+    lat = centers[state, 0] + rng.normal(0, 1.5, n)
+    lng = centers[state, 1] + rng.normal(0, 1.5, n)
+    return lat, lng, rng.random(n) < 0.08
+
+
+def render_scatter(lat, lng, late):
+    """Cara lama: satu titik matplotlib per order"""
+    fig, ax = plt.subplots(figsize=(10, 10))
+    ax.scatter(lng[~late], lat[~late], s=2, alpha=0.3, color="#27ae60")
+    ax.scatter(lng[late], lat[late], s=2, alpha=0.5, color="#e74c3c")
+    ax.set_xlim(-74, -34)
+    ax.set_ylim(-34, 6)
+    return fig
+
+
+def render_raster(lat, lng, late):
+    """Mode raster: binning lalu satu imshow"""
+    grid = raster.bin_geo(lat, lng, late)
+    fig, ax = plt.subplots(figsize=(10, 10))
+    ax.imshow(
+        raster.density_rgba(grid),
+        origin="lower",
+        extent=raster.GEO_EXTENT,
+        interpolation="nearest",
+        aspect="auto",
+    )
+    ax.set_xlim(-74, -34)
+    ax.set_ylim(-34, 6)
+    return fig
+
+
+def measure(render, lat, lng, late):
+    """Detik untuk membuat figure dan menyimpannya sebagai PNG, ukuran KB"""
+    start = time.perf_counter()
+    fig = render(lat, lng, late)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", **figcache.SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return time.perf_counter() - start, len(buf.getvalue()) / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--max-scatter", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'baris':>12}{'mode':>10}{'detik':>10}{'PNG (KB)':>12}")
+    for n in args.rows:
+        lat, lng, late = make_points(n, args.seed)
+        for mode, render in (("scatter", render_scatter), ("raster", render_raster)):
+            if mode == "scatter" and n > args.max_scatter:
+                continue
+            seconds, size_kb = measure(render, lat, lng, late)
+            print(f"{n:>12,}{mode:>10}{seconds:>10.2f}{size_kb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
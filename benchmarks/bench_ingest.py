@@ -0,0 +1,90 @@
+"""Benchmark ingestion CSV Olist mentah: cara notebook vs ``pipeline.ingest``.
+
+Delapan tabel mentah sintetis (``synthetic.write_raw_tables``) dibaca dengan:
+
+- ``notebook``: ``read_csv`` berurutan, semua kolom, dtype ditebak pandas,
+  lalu kolom tanggal dikonversi dengan ``to_datetime`` seperti di notebook
+- ``typed``: ``ingest.read_tables`` dengan satu worker (dtype dideklarasikan,
+  tanggal di-parse saat dibaca)
+- ``thread``/``process``: ``ingest.read_tables`` dengan ``--workers`` worker
+
+Ditampilkan waktu terbaik dan total memori frame hasil baca. Percepatan
+pool bergantung pada jumlah core yang tersedia.
+
+    python -m benchmarks.bench_ingest --rows 1000000 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import write_raw_tables
+from pipeline import ingest
+
+
+def read_notebook(data_dir):
+    """Cara notebook: baca semua kolom lalu konversi tanggal"""
+    frames = {}
+    for name in ingest.RAW_TABLES:
+        spec = ingest.TABLES[name]
+        df = pd.read_csv(ingest.table_path(data_dir, name))
+        for col in spec.get("dates", []):
+            df[col] = pd.to_datetime(df[col])
+        frames[name] = df
+    return frames
+
+
+def frames_mb(frames):
+    """Total memori (deep) semua frame dalam MB"""
+    return sum(df.memory_usage(deep=True).sum() for df in frames.values()) / 2**20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    modes = {
+        "notebook": read_notebook,
+        "typed": lambda d: ingest.read_tables(d, workers=1),
+        "thread": lambda d: ingest.read_tables(d, workers=args.workers),
+        "process": lambda d: ingest.read_tables(
+            d, workers=args.workers, executor="process"
+        ),
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_raw_tables(data_dir, args.rows, args.seed)
+        total_mb = sum(
+            os.path.getsize(ingest.table_path(data_dir, name))
+            for name in ingest.RAW_TABLES
+        )
+        print(
+            f"{args.rows:,} order, {total_mb / 2**20:.1f} MB CSV, "
+            f"{args.workers} worker, {os.cpu_count()} CPU"
+        )
+
+        report = []
+        ingest.read_tables(data_dir, workers=1, report=report)
+        print(f"\n{ingest.format_report(report)}")
+
+        print(f"\n{'mode':<10}{'detik':>10}{'MB/s':>10}{'memori (MB)':>14}")
+        for mode, read in modes.items():
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                frames = read(data_dir)
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{mode:<10}{best:>10.2f}{total_mb / 2**20 / best:>10.1f}"
+                f"{frames_mb(frames):>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark partisi bulan: filter "Rentang Tanggal" sempit saat histori tumbuh.
+
+``orders_reviews`` sintetis dibuat untuk beberapa panjang histori (tahun)
+dengan jumlah order per tahun tetap, lalu ditulis dua kali: sebagai satu
+snapshot dan sebagai partisi bulan (``pipeline.build.write_partitions``,
+manifest dengan statistik min/max). Untuk rentang satu bulan terakhir diukur
+``snapshot.load_dataset(..., date_range)`` pada partisi vs snapshot tunggal
+lalu ``snapshot.filter_dates`` atas semua baris. Ini jalur tabel "Data Order"
+dashboard; hasil kedua cara dicek sama sebelum diukur.
+
+    python -m benchmarks.bench_partitions --years 2 4 8 --rows-per-year 250000
+"""
+
+import argparse
+import datetime
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_orders_reviews
+from pipeline import build
+
+import snapshot
+
+NAME = "orders_reviews"
+
+
+def make_history(years, rows_per_year, seed=0):
+    """``orders_reviews`` sintetis ``years`` tahun (blok 2 tahun digeser)"""
+    frames = []
+    for block in range(0, years, 2):
+        df = make_orders_reviews(rows_per_year * min(2, years - block), seed + block)
+        shift = pd.DateOffset(years=block)
+        for col in snapshot.DATE_COLUMNS:
+            df[col] = df[col] + shift
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_layouts(df, base_dir):
+    """Tulis ``df`` sebagai partisi bulan dan sebagai snapshot tunggal"""
+    build.write_partitions(
+        df,
+        build.purchase_months(df["order_purchase_timestamp"]),
+        snapshot.partitions_path(base_dir, NAME),
+    )
+    snapshot.write_snapshot(
+        build.canonical(df, NAME), snapshot.snapshot_path(base_dir, NAME)
+    )
+
+
+def last_month(df):
+    """Rentang tanggal satu bulan terakhir histori"""
+    last = df["order_purchase_timestamp"].max().date()
+    return last - datetime.timedelta(days=30), last
+
+
+def best_of(func, repeat):
+    """(hasil, waktu terbaik) dari ``repeat`` kali pemanggilan"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def check_same(expected, actual):
+    """Pastikan kedua cara menghasilkan baris dan nilai yang sama"""
+    assert list(expected.columns) == list(actual.columns)
+    for col in expected.columns:
+        np.testing.assert_array_equal(
+            expected[col].to_numpy(dtype=object), actual[col].to_numpy(dtype=object)
+        )
+
+
+def run(years, rows_per_year, repeat, seed):
+    """Satu baris hasil untuk histori ``years`` tahun"""
+    with tempfile.TemporaryDirectory() as base_dir:
+        write_layouts(make_history(years, rows_per_year, seed), base_dir)
+        parts = snapshot.partitions_path(base_dir, NAME)
+        single = snapshot.snapshot_path(base_dir, NAME)
+        full = snapshot.read_partitioned(parts)
+        partitions = len(snapshot.read_manifest(parts)["partitions"])
+        date_range = last_month(full)
+
+        pruned, t_load_parts = best_of(
+            lambda: snapshot.load_dataset(base_dir, NAME, date_range), repeat
+        )
+        scanned, t_load_scan = best_of(
+            lambda: snapshot.filter_dates(snapshot.read_snapshot(single), date_range),
+            repeat,
+        )
+        check_same(scanned, pruned)
+    return {
+        "years": years,
+        "rows": len(full),
+        "partitions": partitions,
+        "window": len(pruned),
+        "load_scan": t_load_scan,
+        "load_parts": t_load_parts,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--rows-per-year", type=int, default=250_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'tahun':>6}{'baris':>12}{'partisi':>9}{'1 bulan':>9}"
+        f"{'load scan':>11}{'load partisi':>14}"
+    )
+    print(f"{'':>36}{'(ms)':>11}{'(ms)':>14}")
+    for years in args.years:
+        r = run(years, args.rows_per_year, args.repeat, args.seed)
+        print(
+            f"{r['years']:>6}{r['rows']:>12,}{r['partitions']:>9}{r['window']:>9,}"
+            f"{r['load_scan'] * 1000:>11.1f}{r['load_parts'] * 1000:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
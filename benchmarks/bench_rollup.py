@@ -0,0 +1,183 @@
+"""Benchmark rollup kategori produk: merge string vs key integer star schema.
+
+``data/products_dataset.csv`` diperbanyak ``--scale`` kali (default 10x,
+id produk baru, distribusi kategori asli termasuk produk tanpa kategori) dan
+dipakai bersama tabel order sintetis serta terjemahan kategori asli. Rollup
+(kategori, bulan) lalu dibangun dengan:
+
+- ``string``: merge items -> products -> terjemahan -> orders pada kolom
+  string, lalu groupby (cara biasa tanpa pipeline)
+- ``star+rollup``: ``star.build_star`` lalu ``rollup.build_category_rollup``
+- ``rollup``: hanya ``rollup.build_category_rollup`` dari tabel star
+
+Hasil kedua cara harus sama. Baris ``view`` adalah waktu
+``views.category_summary`` (yang dijalankan dashboard per rerun) di atas
+rollup.
+
+    python -m benchmarks.bench_rollup --rows 100000 --scale 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_tables, random_hex_ids
+from pipeline import DATA_DIR, etl, geocode, ingest, rollup, star
+
+import views
+
+
+def scaled_products(scale, seed=0):
+    """Tabel products asli diulang ``scale`` kali dengan id produk baru"""
+    products = pd.read_csv(ingest.table_path(DATA_DIR, "products"))
+    products = pd.concat([products] * scale, ignore_index=True)
+    products["product_id"] = random_hex_ids(np.random.default_rng(seed), len(products))
+    return products
+
+
+def make_tables(data_dir, rows, scale, seed):
+    """Tulis tabel mentah ke ``data_dir`` lalu baca dengan ``ingest``"""
+    raw = make_raw_tables(rows, seed)
+    products = scaled_products(scale, seed)
+    items = raw["order_items_dataset.csv"]
+    rng = np.random.default_rng(seed + 5)
+    items["product_id"] = products["product_id"].to_numpy()[
+        rng.integers(0, len(products), len(items))
+    ]
+    raw["products_dataset.csv"] = products
+    geolocation = raw.pop("geolocation_dataset.csv")
+    raw.pop("product_category_name_translation.csv")
+    for file, df in raw.items():
+        df.to_csv(os.path.join(data_dir, file), index=False)
+
+    tables = ingest.read_tables(
+        data_dir, [t for t in ingest.RAW_TABLES if t != "geolocation"]
+    )
+    tables["product_category_name_translation"] = ingest.read_table(
+        DATA_DIR, "product_category_name_translation"
+    )
+    geo_agg = (
+        geolocation.groupby("geolocation_zip_code_prefix")[
+            ["geolocation_lat", "geolocation_lng"]
+        ]
+        .mean()
+        .reset_index()
+    )
+    return tables, geocode.build_index(geo_agg)
+
+
+def build_string(tables, reviews):
+    """Rollup yang sama lewat merge dan groupby pada kolom string"""
+    orders = tables["orders"]
+    orders = orders[
+        (orders["order_status"] == "delivered")
+        & orders["order_delivered_customer_date"].notna()
+        & orders["order_purchase_timestamp"].notna()
+    ]
+    orders = pd.DataFrame(
+        {
+            "order_id": orders["order_id"],
+            "delivery_time": (
+                orders["order_delivered_customer_date"]
+                - orders["order_purchase_timestamp"]
+            ).dt.days,
+            "late": (
+                orders["order_estimated_delivery_date"]
+                - orders["order_delivered_customer_date"]
+            ).dt.days
+            < 0,
+            "month": orders["order_purchase_timestamp"].dt.strftime("%Y-%m"),
+        }
+    )
+    items = tables["order_items"][["order_id", "product_id", "price"]]
+    items = items.merge(
+        tables["products"][["product_id", "product_category_name"]],
+        on="product_id",
+        how="left",
+    ).merge(
+        tables["product_category_name_translation"],
+        on="product_category_name",
+        how="left",
+    )
+    items["category"] = (
+        items["product_category_name_english"]
+        .astype(object)
+        .fillna(items["product_category_name"].astype(object))
+        .fillna(rollup.UNKNOWN_CATEGORY)
+    )
+    items = items.merge(orders, on="order_id")
+    scores = reviews.groupby("order_id")["review_score"].agg(["sum", "count"])
+    pairs = items.drop_duplicates(["order_id", "category"]).join(scores, on="order_id")
+    return (
+        pairs.groupby(["category", "month"])
+        .agg(
+            orders=("order_id", "size"),
+            late_orders=("late", "sum"),
+            delivery_sum=("delivery_time", "sum"),
+            review_count=("count", "sum"),
+            review_sum=("sum", "sum"),
+        )
+        .join(
+            items.groupby(["category", "month"]).agg(
+                items=("price", "size"), price_sum=("price", "sum")
+            )
+        )
+    )
+
+
+def best_of(func, repeat):
+    """(hasil, waktu terbaik) dari ``repeat`` kali pemanggilan"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        tables, index = make_tables(data_dir, args.rows, args.scale, args.seed)
+    reviews = etl.filter_reviews(tables["order_reviews"])
+    print(
+        f"{len(tables['orders']):,} order, {len(tables['order_items']):,} item, "
+        f"{len(tables['products']):,} produk ({args.scale}x), "
+        f"{tables['products']['product_category_name'].nunique()} kategori"
+    )
+
+    exact, string_seconds = best_of(lambda: build_string(tables, reviews), args.repeat)
+    star_tables, star_seconds = best_of(
+        lambda: star.build_star(tables, reviews, index), args.repeat
+    )
+    result, rollup_seconds = best_of(
+        lambda: rollup.build_category_rollup(star_tables), args.repeat
+    )
+    _, view_seconds = best_of(lambda: views.category_summary(result), args.repeat)
+
+    mine = result.assign(category=result["product_category"].astype(object))
+    mine = mine.set_index(["category", "month"])[exact.columns]
+    exact = exact.reindex(mine.index)
+    if len(exact.dropna()) != len(result) or not np.allclose(mine, exact):
+        raise AssertionError("rollup berbeda dengan hasil merge string")
+
+    print(f"rollup: {len(result):,} baris (kategori x bulan), sama dengan pandas")
+    print(f"\n{'cara':<14}{'detik':>10}")
+    print(f"{'string':<14}{string_seconds:>10.3f}")
+    print(f"{'star+rollup':<14}{star_seconds + rollup_seconds:>10.3f}")
+    print(f"{'rollup':<14}{rollup_seconds:>10.3f}")
+    print(f"{'view':<14}{view_seconds:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Load test sesi dashboard: dataset per sesi (cache_data) vs dataset bersama.
+
+Mensimulasikan N sesi Streamlit yang berjalan bersamaan dengan ``AppTest``
+(satu thread per sesi, seperti server Streamlit). Setiap sesi menjalankan
+beberapa rerun dengan filter skor yang berganti. Setiap kombinasi mode dan
+jumlah sesi berjalan di proses baru dan melaporkan RSS setelah data dimuat,
+puncak RSS selama sesi berjalan, dan latensi per rerun.
+
+    python -m benchmarks.bench_sessions --rows 200000 --sessions 1 4 8
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import DASHBOARD_DIR
+from benchmarks.synthetic import write_dashboard_csvs
+
+import snapshot
+
+# Dijalankan di subprocess: satu AppTest per sesi, semua sesi bersamaan
+_CHILD = """
+import json, sys, threading, time
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+script, sessions, reruns = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+SCORE_RANGES = [(1, 5), (2, 4), (1, 3), (3, 5)]
+
+def status_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+
+peak = [0.0]
+stop = threading.Event()
+
+def monitor():
+    while not stop.is_set():
+        peak[0] = max(peak[0], status_mb("VmRSS"))
+        time.sleep(0.02)
+
+def run(at):
+    start = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return time.perf_counter() - start
+
+def session(i, latencies):
+    at = AppTest.from_file(script, default_timeout=600)
+    for r in range(reruns):
+        if r:
+            at.sidebar.slider[0].set_value(SCORE_RANGES[(i + r) % len(SCORE_RANGES)])
+        latencies.append(run(at))
+
+rss_start = status_mb("VmRSS")
+# Sesi pemanasan: memuat data dan mengisi cache gambar untuk filter default
+warmup = run(AppTest.from_file(script, default_timeout=600))
+rss_loaded = status_mb("VmRSS")
+
+threading.Thread(target=monitor, daemon=True).start()
+latencies = []
+threads = [
+    threading.Thread(target=session, args=(i, latencies)) for i in range(sessions)
+]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+stop.set()
+print(json.dumps({
+    "load_seconds": warmup,
+    "rss_loaded_mb": rss_loaded - rss_start,
+    "peak_rss_mb": max(peak[0], status_mb("VmRSS")) - rss_start,
+    "rerun_p50": float(np.percentile(latencies, 50)),
+    "rerun_p95": float(np.percentile(latencies, 95)),
+    "reruns": len(latencies),
+}))
+"""
+
+
+def measure(base_dir, mode, sessions, reruns):
+    """Menjalankan satu load test di proses baru"""
+    env = {
+        **os.environ,
+        "DASHBOARD_DATA_DIR": base_dir,
+        "DASHBOARD_SHARED_DATA": "1" if mode == "shared" else "0",
+    }
+    script = os.path.join(DASHBOARD_DIR, "dashboard.py")
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, script, str(sessions), str(reruns)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        write_dashboard_csvs(base_dir, args.rows, args.seed)
+        snapshot.export_snapshots(base_dir)
+
+        print(
+            f"\n{'mode':<8}{'sesi':>6}{'muat (s)':>10}{'RSS muat (MB)':>15}"
+            f"{'puncak RSS (MB)':>17}{'p50 (s)':>9}{'p95 (s)':>9}"
+        )
+        for mode in ("copy", "shared"):
+            for sessions in args.sessions:
+                r = measure(base_dir, mode, sessions, args.reruns)
+                print(
+                    f"{mode:<8}{sessions:>6}{r['load_seconds']:>10.2f}"
+                    f"{r['rss_loaded_mb']:>15.1f}{r['peak_rss_mb']:>17.1f}"
+                    f"{r['rerun_p50']:>9.2f}{r['rerun_p95']:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
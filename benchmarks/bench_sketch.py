@@ -0,0 +1,137 @@
+"""Benchmark sketch jarak: akurasi dan kecepatan vs pandas pada baris terfilter.
+
+Data geo sintetis diberi kolom jarak kontinu (lognormal, naik dengan waktu
+pengiriman), lalu ``sketch.build_partitions`` dibangun sekali. Untuk setiap
+kombinasi filter, ``sketch.describe`` dibandingkan dengan ``describe()`` dan
+``corr()`` pandas pada baris yang sama:
+
+- count, mean, std, min, max, dan korelasi harus sama (toleransi float)
+- rank sebenarnya dari setiap kuartil sketch harus dalam ``rank_error(k)``
+
+Proses keluar dengan error jika salah satu batas dilanggar.
+
+    python -m benchmarks.bench_sketch --rows 1000000 --k 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_filters import scenarios
+from benchmarks.synthetic import make_dashboard_datasets
+
+import cube
+import schema
+import sketch
+
+EXACT_STATS = ["count", "mean", "std", "min", "max"]
+QUARTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+
+def add_distance(geo_orders, seed=0):
+    """Kolom ``seller_customer_km_max`` sintetis (km, sebagian kosong)"""
+    rng = np.random.default_rng(seed + 2)
+    n = len(geo_orders)
+    km = rng.lognormal(5.5, 1.0, n) + geo_orders["delivery_time"].to_numpy() * 20
+    km[rng.random(n) < 0.02] = np.nan
+    geo_orders["seller_customer_km_max"] = km
+    return geo_orders
+
+
+def geo_mask(geo_orders, f):
+    """Mask baris geo untuk filter ``f`` (cara pandas biasa)"""
+    mask = geo_orders["delivery_time"].between(*f["delivery_range"])
+    if f["status"] is not None:
+        mask &= geo_orders["is_late"] == (f["status"] == cube.LATE_STATUS)
+    return mask & geo_orders["customer_state"].isin(f["states"])
+
+
+def check(geo_orders, summary, corr, rows, eps):
+    """Galat relatif statistik tepat dan galat rank kuartil sketch"""
+    km = geo_orders.loc[rows, "seller_customer_km_max"]
+    exact = km.describe()
+    stat_error = max(
+        abs(summary[s] - exact[s]) / max(abs(exact[s]), 1e-12) for s in EXACT_STATS
+    )
+    exact_corr = km.corr(geo_orders.loc[rows, "delivery_time"])
+    stat_error = max(stat_error, abs(corr - exact_corr))
+
+    values = np.sort(km.dropna().to_numpy())
+    n = len(values)
+    rank_error = 0.0
+    for label, q in QUARTILES.items():
+        # Rank sketch dihitung dari rentang posisi nilai itu di data terurut
+        lo = np.searchsorted(values, summary[label], side="left") / (n - 1)
+        hi = (np.searchsorted(values, summary[label], side="right") - 1) / (n - 1)
+        rank_error = max(rank_error, max(lo - q, q - hi, 0.0))
+    if stat_error > 1e-9 or rank_error > eps:
+        raise AssertionError(
+            f"batas dilanggar: statistik {stat_error:.2e}, rank {rank_error:.4f}"
+        )
+    return stat_error, rank_error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--k", type=int, default=sketch.DEFAULT_K)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    orders_reviews, geo_orders = make_dashboard_datasets(args.rows, args.seed)
+    geo_orders = add_distance(schema.apply_schema(geo_orders, "geo_orders"))
+
+    start = time.perf_counter()
+    parts = sketch.build_partitions(
+        geo_orders,
+        cube.DISTANCE_SKETCH_DIMENSIONS,
+        "seller_customer_km_max",
+        "delivery_time",
+        k=args.k,
+    )
+    print(
+        f"build: {time.perf_counter() - start:.2f} detik, {len(parts['keys']):,} "
+        f"partisi, {len(parts['items']):,} item sketch untuk {len(geo_orders):,} baris"
+    )
+    eps = sketch.rank_error(args.k)
+    print(f"batas galat rank kuartil (k={args.k}): {eps:.4f}")
+
+    print(
+        f"\n{'filter':<22}{'baris':>10}{'pandas (ms)':>13}{'sketch (ms)':>13}"
+        f"{'galat stat':>12}{'galat rank':>12}"
+    )
+    for name, f in scenarios(orders_reviews, geo_orders).items():
+        rows = geo_mask(geo_orders, f).to_numpy()
+
+        def exact():
+            km = geo_orders.loc[rows, "seller_customer_km_max"]
+            return km.describe(), km.corr(geo_orders.loc[rows, "delivery_time"])
+
+        def sketched():
+            keys = cube.filter_cube(
+                parts["keys"],
+                delivery_range=f["delivery_range"],
+                status=f["status"],
+                states=f["states"],
+            )
+            return sketch.describe(parts, keys.index)
+
+        times = {}
+        for label, func in [("pandas", exact), ("sketch", sketched)]:
+            best = np.inf
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = func()
+                best = min(best, time.perf_counter() - start)
+            times[label] = best
+        stat_error, rank_error = check(geo_orders, *result, rows, eps)
+        print(
+            f"{name:<22}{rows.sum():>10,}{times['pandas'] * 1000:>13.1f}"
+            f"{times['sketch'] * 1000:>13.1f}{stat_error:>12.1e}{rank_error:>12.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
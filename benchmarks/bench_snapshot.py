@@ -0,0 +1,88 @@
+"""Benchmark cold load: CSV vs snapshot kolumnar.
+
+Setiap pengukuran berjalan di proses Python baru agar waktu muat dan memori
+resident (RSS) mencerminkan cold start dashboard.
+
+    python -m benchmarks.bench_snapshot --rows 1000000 --repeat 3
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import DASHBOARD_DIR
+from benchmarks.synthetic import write_dashboard_csvs
+
+import snapshot
+
+# Dijalankan di subprocess: memuat kedua dataset lalu melaporkan waktu dan RSS
+_CHILD = """
+import json, sys, time
+sys.path.append({dashboard_dir!r})
+import pandas as pd
+import snapshot
+
+def status_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+
+base_dir, mode = sys.argv[1], sys.argv[2]
+rss_before = status_mb("VmRSS")
+start = time.perf_counter()
+frames = []
+for name in snapshot.DATASETS:
+    if mode == "csv":
+        frames.append(snapshot.read_csv_dataset(snapshot.csv_path(base_dir, name)))
+    else:
+        frames.append(snapshot.read_snapshot(snapshot.snapshot_path(base_dir, name)))
+# Sentuh kolom yang dipakai filter agar halaman mmap benar-benar dibaca
+for df in frames:
+    df["delivery_time"].sum()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": status_mb("VmRSS") - rss_before,
+    "peak_rss_mb": status_mb("VmHWM") - rss_before,
+}}))
+"""
+
+
+def measure(base_dir, mode):
+    """Menjalankan satu cold load di proses baru"""
+    code = _CHILD.format(dashboard_dir=DASHBOARD_DIR)
+    out = subprocess.run(
+        [sys.executable, "-c", code, base_dir, mode],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        write_dashboard_csvs(base_dir, args.rows, args.seed)
+        snapshot.export_snapshots(base_dir)
+
+        print(f"\n{'mode':<10}{'detik':>10}{'RSS (MB)':>12}{'peak RSS (MB)':>16}")
+        for mode in ("csv", "snapshot"):
+            runs = [measure(base_dir, mode) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r["seconds"])
+            print(
+                f"{mode:<10}{best['seconds']:>10.3f}"
+                f"{best['rss_mb']:>12.1f}{best['peak_rss_mb']:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark star schema: join id string vs surrogate key integer.
+
+Tabel mentah sintetis dibaca sekali dengan ``pipeline.ingest``, lalu tabel
+level order yang sama dibangun dengan dua cara:
+
+- ``string``: ``pd.merge``/groupby berulang pada ``order_id`` dan
+  ``customer_id`` (cara notebook, ditambah agregasi item dan pembayaran)
+- ``star``: ``star.build_star`` (id dipetakan sekali ke key int32)
+
+Ditampilkan waktu build, memori tabel order, dan waktu group-by rata-rata
+skor review per state pelanggan di atas tabel hasilnya.
+
+    python -m benchmarks.bench_star --rows 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_raw_tables
+from pipeline import etl, geocode, ingest, star
+
+
+def build_string(tables, reviews):
+    """Tabel level order lewat merge pada id string"""
+    items = (
+        tables["order_items"]
+        .groupby("order_id")
+        .agg(
+            item_count=("price", "size"),
+            price_total=("price", "sum"),
+            freight_total=("freight_value", "sum"),
+            seller_count=("seller_id", "nunique"),
+        )
+    )
+    payments = (
+        tables["order_payments"]
+        .groupby("order_id")
+        .agg(
+            payment_total=("payment_value", "sum"),
+            payment_count=("payment_value", "size"),
+        )
+    )
+    scores = reviews.groupby("order_id")["review_score"].mean()
+    orders = tables["orders"].merge(tables["customers"], on="customer_id", how="left")
+    orders = orders.merge(scores, on="order_id", how="left")
+    orders = orders.merge(items, on="order_id", how="left")
+    return orders.merge(payments, on="order_id", how="left")
+
+
+def state_scores_string(orders):
+    """Rata-rata skor review per state dari tabel hasil merge string"""
+    return orders.groupby("customer_state", observed=True)["review_score"].mean()
+
+
+def state_scores_star(star_tables):
+    """Rata-rata skor review per state lewat key integer dan ``np.bincount``"""
+    fact = star_tables[star.FACT_TABLE]
+    states = star_tables["dim_customer"]["customer_state"]
+    codes = states.cat.codes.to_numpy()[fact["customer_key"].to_numpy()]
+    score = fact["review_score"].to_numpy(np.float64)
+    valid = ~np.isnan(score)
+    n = len(states.cat.categories)
+    sums = np.bincount(codes[valid], score[valid], n)
+    counts = np.bincount(codes[valid], minlength=n)
+    return pd.Series(sums / counts, index=states.cat.categories)
+
+
+def best_of(func, repeat):
+    """(hasil, waktu terbaik) dari ``repeat`` kali pemanggilan"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def frame_mb(frames):
+    """Total memori (deep) frame dalam MB"""
+    return sum(df.memory_usage(deep=True).sum() for df in frames) / 2**20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_raw_tables(data_dir, args.rows, args.seed)
+        tables = ingest.read_tables(data_dir)
+        tables["product_category_name_translation"] = ingest.read_table(
+            data_dir, "product_category_name_translation"
+        )
+        index = geocode.build_index(etl.aggregate_geolocation(data_dir))
+    reviews = etl.filter_reviews(tables["order_reviews"])
+
+    orders, string_seconds = best_of(lambda: build_string(tables, reviews), args.repeat)
+    star_tables, star_seconds = best_of(
+        lambda: star.build_star(tables, reviews, index), args.repeat
+    )
+    exact, string_groupby = best_of(lambda: state_scores_string(orders), args.repeat)
+    result, star_groupby = best_of(lambda: state_scores_star(star_tables), args.repeat)
+    assert np.allclose(exact.sort_index(), result.reindex(exact.index).sort_index())
+
+    fact = star_tables[star.FACT_TABLE]
+    dims = [star_tables[name] for name in star.DIMENSIONS]
+    print(f"{len(fact):,} order, {len(fact.columns)} kolom fakta")
+    print(
+        f"\n{'cara':<10}{'build (s)':>11}{'tabel order (MB)':>18}"
+        f"{'dimensi (MB)':>14}{'group-by (ms)':>15}"
+    )
+    print(
+        f"{'string':<10}{string_seconds:>11.2f}{frame_mb([orders]):>18.1f}"
+        f"{'':>14}{string_groupby * 1000:>15.1f}"
+    )
+    print(
+        f"{'star':<10}{star_seconds:>11.2f}{frame_mb([fact]):>18.1f}"
+        f"{frame_mb(dims):>14.1f}{star_groupby * 1000:>15.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""Suite benchmark jalur panas analisis dan dashboard, tanpa Streamlit.
+
+Untuk setiap ukuran data sintetis (reprodusibel lewat ``--seed``), suite
+mengukur:
+
+- ``load``: baca CSV, tulis/baca snapshot, skema dtype, kolom turunan, cube,
+  dan index filter
+- ``filter``: ``filters.select`` + ``filters.take`` dan ``cube.filter_cube``
+  untuk beberapa kombinasi filter
+- ``aggregation``: setiap fungsi ``views`` dan metrik utama dari sel cube
+- ``figure``: setiap fungsi ``charts.create_*`` (backend Agg) dan ``savefig``,
+  serta spesifikasi ``vegalite`` untuk chart agregat (dengan ukuran payload)
+
+Hasil ditulis sebagai JSON (``--output``) beserta versi library, platform,
+dan commit git. Dengan ``--baseline`` setiap kasus dibandingkan dengan hasil
+tersimpan; rasio di atas ``1 + --threshold`` ditandai sebagai regresi dan
+``--fail-on-regression`` membuat proses keluar dengan kode 1 (untuk CI)::
+
+    python -m benchmarks.suite --rows 100000 1000000 --output base.json
+    python -m benchmarks.suite --rows 100000 1000000 --baseline base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks import ROOT_DIR  # noqa: E402
+from benchmarks.bench_filters import GEO_COLUMNS, REVIEW_COLUMNS  # noqa: E402
+from benchmarks.bench_filters import scenarios  # noqa: E402
+from benchmarks.synthetic import write_dashboard_csvs  # noqa: E402
+
+import charts  # noqa: E402
+import cube  # noqa: E402
+import figcache  # noqa: E402
+import filters  # noqa: E402
+import schema  # noqa: E402
+import snapshot  # noqa: E402
+import vegalite  # noqa: E402
+import views  # noqa: E402
+
+# Sama dengan kolom turunan di dashboard.py (skrip Streamlit, tidak bisa diimpor)
+DERIVED_COLUMNS = {
+    "orders_reviews": cube.add_time_buckets,
+    "geo_orders": cube.add_distance_bin,
+}
+
+
+def timeit(func, repeat):
+    """Hasil panggilan terakhir ``func`` dan daftar durasi ``repeat`` kali"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def record(results, rows, group, case, times, **fields):
+    """Tambahkan satu kasus ke ``results`` dan cetak ringkasannya"""
+    entry = {
+        "rows": rows,
+        "group": group,
+        "case": case,
+        "min": min(times),
+        "median": float(np.median(times)),
+        "repeat": len(times),
+        **fields,
+    }
+    results.append(entry)
+    best, median = entry["min"] * 1000, entry["median"] * 1000
+    print(f"{group:<12}{case:<38}{best:>12.2f}{median:>12.2f}")
+
+
+def has_distance(geo_cells):
+    """True jika data geo memuat jarak seller-pelanggan (tahap pipeline)"""
+    return (
+        "distance_bin" in geo_cells.columns and (geo_cells["distance_bin"] >= 0).any()
+    )
+
+
+def bench_load(base_dir, rows, repeat, results):
+    """Kasus ``load``; mengembalikan dataset ringkas, cube, dan index"""
+    data = {}
+    for name in snapshot.DATASETS:
+        csv = snapshot.csv_path(base_dir, name)
+        snap = snapshot.snapshot_path(base_dir, name)
+        raw, t = timeit(lambda: snapshot.read_csv_dataset(csv), repeat)
+        record(results, rows, "load", f"read_csv:{name}", t)
+        _, t = timeit(lambda: snapshot.write_snapshot(raw, snap), repeat)
+        record(results, rows, "load", f"write_snapshot:{name}", t)
+        raw, t = timeit(lambda: snapshot.read_snapshot(snap), repeat)
+        record(results, rows, "load", f"read_snapshot:{name}", t)
+        df, t = timeit(lambda: schema.apply_schema(raw, name), repeat)
+        record(results, rows, "load", f"apply_schema:{name}", t)
+        _, t = timeit(lambda: DERIVED_COLUMNS[name](df), repeat)
+        record(results, rows, "load", f"derived_columns:{name}", t)
+        data[name] = df
+
+    orders_reviews, geo_orders = data["orders_reviews"], data["geo_orders"]
+    reviews_cube, t = timeit(
+        lambda: cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS), repeat
+    )
+    record(results, rows, "load", "build_cube:orders_reviews", t)
+    geo_cube, t = timeit(
+        lambda: cube.build_cube(geo_orders, cube.GEO_DIMENSIONS), repeat
+    )
+    record(results, rows, "load", "build_cube:geo_orders", t)
+    reviews_index, t = timeit(
+        lambda: filters.build_index(orders_reviews, filters.REVIEW_INDEX), repeat
+    )
+    record(results, rows, "load", "build_index:orders_reviews", t)
+    geo_index, t = timeit(
+        lambda: filters.build_index(geo_orders, filters.GEO_INDEX), repeat
+    )
+    record(results, rows, "load", "build_index:geo_orders", t)
+    return orders_reviews, geo_orders, reviews_cube, geo_cube, reviews_index, geo_index
+
+
+def bench_filter(loaded, rows, repeat, results):
+    """Kasus ``filter``; mengembalikan baris dan sel hasil filter default"""
+    orders_reviews, geo_orders, reviews_cube, geo_cube, reviews_index, geo_index = (
+        loaded
+    )
+    selected = None
+    for label, f in scenarios(orders_reviews, geo_orders).items():
+        review_filter = {
+            "date_range": f["date_range"],
+            "score_range": f["score_range"],
+            "delivery_range": f["delivery_range"],
+            "status": f["status"],
+        }
+        geo_filter = {
+            "delivery_range": f["delivery_range"],
+            "status": f["status"],
+            "states": f["states"],
+        }
+        review_rows, t = timeit(
+            lambda: filters.take(
+                orders_reviews,
+                filters.select(reviews_index, **review_filter),
+                REVIEW_COLUMNS,
+            ),
+            repeat,
+        )
+        record(results, rows, "filter", f"select_reviews:{label}", t)
+        geo_rows, t = timeit(
+            lambda: filters.take(
+                geo_orders, filters.select(geo_index, **geo_filter), GEO_COLUMNS
+            ),
+            repeat,
+        )
+        record(results, rows, "filter", f"select_geo:{label}", t)
+        cells, t = timeit(
+            lambda: (
+                cube.filter_cube(reviews_cube, **review_filter),
+                cube.filter_cube(geo_cube, **geo_filter),
+            ),
+            repeat,
+        )
+        record(results, rows, "filter", f"filter_cube:{label}", t)
+        if selected is None:
+            selected = (review_rows, geo_rows, *cells)
+    return selected
+
+
+def bench_aggregation(review_cells, geo_cells, rows, repeat, results):
+    """Kasus ``aggregation``; mengembalikan input setiap chart agregat"""
+    review_totals, t = timeit(lambda: cube.total(review_cells), repeat)
+    record(results, rows, "aggregation", "total:orders_reviews", t)
+    geo_totals, t = timeit(lambda: cube.total(geo_cells), repeat)
+    record(results, rows, "aggregation", "total:geo_orders", t)
+    metrics = {
+        "delivery_median": lambda: cube.delivery_median(review_cells),
+        "correlation": lambda: cube.correlation(review_cells),
+        "describe:delivery_time": lambda: cube.describe(review_cells, "delivery_time"),
+        "describe:review_score": lambda: cube.describe(review_cells, "review_score"),
+    }
+    if has_distance(geo_cells):
+        metrics["distance_summary"] = lambda: cube.distance_summary(geo_cells)
+    for case, func in metrics.items():
+        _, t = timeit(func, repeat)
+        record(results, rows, "aggregation", case, t)
+
+    outputs = {}
+    for func, cells in [
+        (views.score_counts, review_cells),
+        (views.status_counts, review_cells),
+        (views.avg_delivery_by_score, review_cells),
+        (views.delivery_counts, review_cells),
+        (views.delivery_boxes, review_cells),
+        (views.score_heatmap, review_cells),
+        (views.score_detail, review_cells),
+        (views.late_percentage_by_state, geo_cells),
+        (views.state_status_counts, geo_cells),
+        (views.state_delivery, geo_cells),
+        (views.state_detail, geo_cells),
+        (views.trend, review_cells),
+    ]:
+        outputs[func.__name__], t = timeit(lambda: func(cells), repeat)
+        record(results, rows, "aggregation", func.__name__, t)
+
+    n_reviews = review_totals["count"]
+    outputs["review_mean"] = review_totals["delivery_sum"] / n_reviews
+    outputs["geo_mean"] = geo_totals["delivery_sum"] / geo_totals["count"]
+    return outputs
+
+
+def bench_figures(review_rows, geo_rows, geo_cells, agg, rows, repeat, results):
+    """Kasus ``figure``: setiap ``create_*``, ``savefig``, dan spesifikasi Vega-Lite"""
+    monthly, _, day_counts = agg["trend"]
+    figures = {
+        "create_score_distribution": (agg["score_counts"],),
+        "create_delivery_status_pie": (agg["status_counts"],),
+        "create_delivery_histogram": (agg["delivery_counts"],),
+        "create_delivery_boxplot": (agg["delivery_boxes"],),
+        "create_avg_delivery_by_score": (
+            agg["avg_delivery_by_score"],
+            agg["review_mean"],
+        ),
+        "create_score_heatmap": (agg["score_heatmap"],),
+        "create_geo_scatter": (geo_rows,),
+        "create_geo_density": (geo_rows,),
+        "create_late_percentage_by_state": (agg["late_percentage_by_state"],),
+        "create_state_barplot": (agg["state_status_counts"],),
+        "create_delivery_time_by_state": (agg["state_delivery"], agg["geo_mean"]),
+        "create_top_cities": (geo_rows,),
+        "create_monthly_trend": (monthly.reset_index(),),
+        "create_day_distribution": (day_counts,),
+    }
+    if has_distance(geo_cells):
+        figures["create_delivery_by_distance"] = (cube.distance_summary(geo_cells),)
+
+    for name, args in figures.items():
+        func = getattr(charts, name)
+        create, save, size = [], [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fig = func(*args)
+            create.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            size = len(figcache.figure_bytes(fig))
+            save.append(time.perf_counter() - start)
+        record(results, rows, "figure", name, create)
+        record(results, rows, "figure", f"savefig:{name}", save, bytes=size)
+        plt.close("all")
+
+        # Padanan Vega-Lite: spesifikasi JSON yang dikirim ke browser
+        chart = name.removeprefix("create_")
+        if chart in vegalite.SPECS:
+            spec, t = timeit(lambda: vegalite.SPECS[chart](*args), repeat)
+            size = vegalite.payload_bytes(spec)
+            record(results, rows, "figure", f"vegalite:{chart}", t, bytes=size)
+
+
+def run_size(rows, repeat, seed, results):
+    """Semua kasus untuk satu ukuran data"""
+    with tempfile.TemporaryDirectory() as base_dir:
+        start = time.perf_counter()
+        n_reviews, n_geo = write_dashboard_csvs(base_dir, rows, seed)
+        print(
+            f"\n# {rows:,} order ({n_reviews:,} review, {n_geo:,} geo), "
+            f"data dibuat dalam {time.perf_counter() - start:.1f} detik"
+        )
+        print(f"{'grup':<12}{'kasus':<38}{'min (ms)':>12}{'median (ms)':>12}")
+        loaded = bench_load(base_dir, rows, repeat, results)
+    review_rows, geo_rows, review_cells, geo_cells = bench_filter(
+        loaded, rows, repeat, results
+    )
+    agg = bench_aggregation(review_cells, geo_cells, rows, repeat, results)
+    bench_figures(review_rows, geo_rows, geo_cells, agg, rows, repeat, results)
+
+
+def git_commit():
+    """Commit git yang sedang di-checkout (None jika bukan repo git)"""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def environment(args):
+    """Metadata run: parameter, versi library, platform, dan commit"""
+    import seaborn
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "seaborn": seaborn.__version__,
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Rasio median terhadap baseline per kasus; kembalikan daftar regresi"""
+    old = {(r["rows"], r["case"]): r for r in baseline["results"]}
+    rows = []
+    for r in results:
+        base = old.get((r["rows"], r["case"]))
+        if base is None:
+            continue
+        ratio = r["median"] / base["median"] if base["median"] > 0 else np.inf
+        rows.append(
+            {
+                "rows": r["rows"],
+                "case": r["case"],
+                "baseline (ms)": base["median"] * 1000,
+                "sekarang (ms)": r["median"] * 1000,
+                "rasio": ratio,
+                "regresi": ratio > 1 + threshold,
+            }
+        )
+    if not rows:
+        print("\nTidak ada kasus yang sama dengan baseline")
+        return []
+
+    table = pd.DataFrame(rows)
+    print(
+        f"\nPerbandingan dengan baseline (commit {baseline['meta'].get('git_commit')})"
+    )
+    print(table.round(3).to_string(index=False))
+    regressions = table[table["regresi"]]
+    print(
+        f"\n{len(regressions)} dari {len(table)} kasus lebih lambat dari "
+        f"{1 + threshold:.2f}x baseline"
+    )
+    return regressions.to_dict("records")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[100_000, 1_000_000],
+        help="jumlah order sintetis (100 ribu sampai 50 juta)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="tulis hasil sebagai JSON")
+    parser.add_argument("--baseline", help="JSON hasil run sebelumnya")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="batas kenaikan median sebelum dianggap regresi (0.25 = 25%%)",
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        run_size(rows, args.repeat, args.seed, results)
+
+    report = {"meta": environment(args), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"\nHasil ditulis ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""Generator data sintetis dengan skema dataset dashboard.
+
+Menghasilkan ``orders_reviews`` dan ``geo_orders`` dengan kolom dan tipe yang
+sama seperti hasil ekspor notebook, pada skala berapa pun, tanpa membutuhkan
+dataset Olist asli.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# (kode state, bobot order, latitude pusat, longitude pusat)
+STATES = [
+    ("SP", 41.9, -23.0, -47.5),
+    ("RJ", 12.9, -22.5, -43.2),
+    ("MG", 11.7, -19.0, -44.5),
+    ("RS", 5.5, -29.9, -51.8),
+    ("PR", 5.1, -24.8, -51.0),
+    ("SC", 3.7, -27.2, -49.9),
+    ("BA", 3.4, -12.9, -40.0),
+    ("DF", 2.1, -15.8, -47.9),
+    ("ES", 2.0, -19.9, -40.6),
+    ("GO", 2.0, -16.5, -49.4),
+    ("PE", 1.7, -8.2, -35.6),
+    ("CE", 1.3, -4.5, -39.0),
+    ("PA", 1.0, -2.8, -49.0),
+    ("MT", 0.9, -14.5, -55.8),
+    ("MA", 0.7, -4.5, -44.6),
+    ("MS", 0.7, -20.8, -54.6),
+    ("PB", 0.5, -7.2, -36.3),
+    ("PI", 0.5, -6.5, -42.3),
+    ("RN", 0.5, -5.8, -36.2),
+    ("AL", 0.4, -9.6, -36.4),
+    ("SE", 0.3, -10.7, -37.3),
+    ("TO", 0.3, -10.3, -48.3),
+    ("RO", 0.3, -10.9, -62.8),
+    ("AM", 0.2, -3.6, -60.7),
+    ("AC", 0.1, -9.5, -68.6),
+    ("AP", 0.1, 0.8, -51.4),
+    ("RR", 0.1, 2.5, -60.9),
+]
+
+START = np.datetime64("2016-09-01T00:00:00", "s")
+END = np.datetime64("2018-09-01T00:00:00", "s")
+DAY = np.timedelta64(1, "D")
+
+# Ukuran chunk generator untuk data besar (sampai puluhan juta order)
+CHUNK_ROWS = 1_000_000
+
+_HEX_PAIRS = np.array([f"{i:02x}" for i in range(256)], dtype="S2")
+
+
+def random_hex_ids(rng, n):
+    """Id hex 32 karakter seperti ``order_id`` Olist (tervektorisasi)"""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    ids = np.ascontiguousarray(_HEX_PAIRS[raw]).view("S32").ravel()
+    return np.char.decode(ids, "ascii")
+
+
+def make_orders_reviews(n, seed=0):
+    """DataFrame sintetis dengan skema ``orders_reviews.csv``"""
+    rng = np.random.default_rng(seed)
+    span = (END - START).astype(np.int64)
+
+    purchase = START + rng.integers(0, span, n).astype("m8[s]")
+    approved = purchase + rng.integers(600, 2 * 86400, n).astype("m8[s]")
+    carrier = approved + rng.integers(86400, 5 * 86400, n).astype("m8[s]")
+    delivery_seconds = (rng.gamma(2.0, 6.0, n) * 86400).astype(np.int64) + 3600
+    delivered = purchase + delivery_seconds.astype("m8[s]")
+    estimate_days = np.maximum(delivery_seconds // 86400 + rng.normal(11, 7, n), 2)
+    estimated = (purchase + estimate_days.astype("m8[D]")).astype("M8[D]")
+
+    df = pd.DataFrame(
+        {
+            "order_id": random_hex_ids(rng, n),
+            "customer_id": random_hex_ids(rng, n),
+            "order_status": "delivered",
+            "order_purchase_timestamp": purchase,
+            "order_approved_at": approved,
+            "order_delivered_carrier_date": np.minimum(carrier, delivered),
+            "order_delivered_customer_date": delivered,
+            "order_estimated_delivery_date": estimated.astype("M8[s]"),
+        }
+    )
+    for col in df.columns[3:]:
+        df[col] = df[col].astype("M8[ns]")
+
+    df["delivery_time"] = (
+        df["order_delivered_customer_date"] - df["order_purchase_timestamp"]
+    ).dt.days
+    df["delivery_diff"] = (
+        df["order_estimated_delivery_date"] - df["order_delivered_customer_date"]
+    ).dt.days
+    late = df["delivery_diff"].to_numpy() < 0
+    df["delivery_status"] = np.where(late, "Terlambat", "Tepat Waktu")
+
+    # Skor review turun seiring keterlambatan, seperti pada data asli
+    probs_ontime = np.array([0.08, 0.03, 0.08, 0.20, 0.61])
+    probs_late = np.array([0.45, 0.09, 0.12, 0.13, 0.21])
+    score = np.where(
+        late,
+        rng.choice(np.arange(1, 6), n, p=probs_late),
+        rng.choice(np.arange(1, 6), n, p=probs_ontime),
+    )
+    df["review_score"] = score
+    return df
+
+
+def make_zip_table(rng, zip_prefixes=15000):
+    """Tabel prefix kode pos: (kode, indeks state, lat, lng, kota) per prefix"""
+    weights = np.array([s[1] for s in STATES])
+    centers = np.array([(s[2], s[3]) for s in STATES])
+
+    zip_state = rng.choice(len(STATES), zip_prefixes, p=weights / weights.sum())
+    zip_state.sort()
+    zip_codes = np.sort(rng.choice(np.arange(1000, 99999), zip_prefixes, replace=False))
+    zip_lat = centers[zip_state, 0] + rng.normal(0, 1.5, zip_prefixes)
+    zip_lng = centers[zip_state, 1] + rng.normal(0, 1.5, zip_prefixes)
+    zip_city = np.array([f"cidade {i // 4:04d}" for i in range(zip_prefixes)])
+    return zip_codes, zip_state, zip_lat, zip_lng, zip_city
+
+
+def make_geo_orders(orders_reviews, seed=0, zip_prefixes=15000, zips=None):
+    """DataFrame sintetis dengan skema ``geo_orders.csv``
+
+    ``zips`` (hasil ``make_zip_table``) dipakai agar semua chunk data besar
+    berbagi geografi yang sama.
+    """
+    rng = np.random.default_rng(seed + 1)
+    n = len(orders_reviews)
+
+    codes = np.array([s[0] for s in STATES])
+    if zips is None:
+        zips = make_zip_table(rng, zip_prefixes)
+    zip_codes, zip_state, zip_lat, zip_lng, zip_city = zips
+
+    # Sebagian kecil order tidak memiliki geolokasi (seperti merge di notebook)
+    keep = rng.random(n) > 0.003
+    orders = orders_reviews.loc[keep]
+    zip_idx = rng.integers(0, len(zip_codes), len(orders))
+
+    return pd.DataFrame(
+        {
+            "order_id": orders["order_id"].to_numpy(),
+            "customer_id": orders["customer_id"].to_numpy(),
+            "delivery_time": orders["delivery_time"].to_numpy(),
+            "delivery_status": orders["delivery_status"].to_numpy(),
+            "customer_zip_code_prefix": zip_codes[zip_idx],
+            "customer_state": codes[zip_state[zip_idx]],
+            "geolocation_zip_code_prefix": zip_codes[zip_idx].astype(np.float64),
+            "geolocation_lat": zip_lat[zip_idx],
+            "geolocation_lng": zip_lng[zip_idx],
+            "geolocation_city": zip_city[zip_idx],
+            "geolocation_state": codes[zip_state[zip_idx]],
+        }
+    )
+
+
+def make_dashboard_datasets(n, seed=0):
+    """Pasangan (orders_reviews, geo_orders) sintetis dengan ``n`` order"""
+    orders_reviews = make_orders_reviews(n, seed)
+    return orders_reviews, make_geo_orders(orders_reviews, seed)
+
+
+def iter_dashboard_chunks(n, seed=0, chunk_rows=CHUNK_ROWS):
+    """Pasangan (orders_reviews, geo_orders) per chunk, total ``n`` order.
+
+    Chunk pertama sama dengan ``make_dashboard_datasets(chunk_rows, seed)``;
+    chunk berikutnya memakai seed turunan dan tabel kode pos yang sama,
+    sehingga data puluhan juta baris tetap reprodusibel tanpa dibuat sekaligus.
+    """
+    zips = make_zip_table(np.random.default_rng(seed + 1))
+    for i, start in enumerate(range(0, n, chunk_rows)):
+        # seed + 1 dipakai geo_orders, jadi seed chunk dilompati dua
+        chunk_seed = seed + 2 * i
+        orders_reviews = make_orders_reviews(min(chunk_rows, n - start), chunk_seed)
+        geo_orders = make_geo_orders(
+            orders_reviews, chunk_seed, zips=None if i == 0 else zips
+        )
+        yield orders_reviews, geo_orders
+
+
+def write_dashboard_csvs(out_dir, n, seed=0, chunk_rows=CHUNK_ROWS):
+    """Menulis ``orders_reviews.csv`` dan ``geo_orders.csv`` sintetis per chunk.
+
+    Mengembalikan jumlah baris (orders_reviews, geo_orders).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [
+        os.path.join(out_dir, "orders_reviews.csv"),
+        os.path.join(out_dir, "geo_orders.csv"),
+    ]
+    rows = [0, 0]
+    for i, frames in enumerate(iter_dashboard_chunks(n, seed, chunk_rows)):
+        for j, df in enumerate(frames):
+            df.to_csv(paths[j], index=False, mode="w" if i == 0 else "a", header=i == 0)
+            rows[j] += len(df)
+    return tuple(rows)
+
+
+# Nama kategori produk untuk tabel products dan tabel terjemahannya
+PRODUCT_CATEGORIES = [
+    ("cama_mesa_banho", "bed_bath_table"),
+    ("beleza_saude", "health_beauty"),
+    ("esporte_lazer", "sports_leisure"),
+    ("moveis_decoracao", "furniture_decor"),
+    ("informatica_acessorios", "computers_accessories"),
+    ("utilidades_domesticas", "housewares"),
+    ("relogios_presentes", "watches_gifts"),
+    ("telefonia", "telephony"),
+    ("ferramentas_jardim", "garden_tools"),
+    ("automotivo", "auto"),
+    ("brinquedos", "toys"),
+    ("cool_stuff", "cool_stuff"),
+    ("perfumaria", "perfumery"),
+    ("bebes", "baby"),
+    ("eletronicos", "electronics"),
+]
+PAYMENT_TYPES = ["credit_card", "boleto", "voucher", "debit_card"]
+
+
+def make_raw_tables(n, seed=0, zip_prefixes=15000):
+    """Tabel CSV Olist mentah sintetis (skema ``data/``) dengan ``n`` order.
+
+    Mengembalikan dict nama file -> DataFrame. Kolom dan format nilainya
+    mengikuti dataset Olist: id hex, tanggal ``YYYY-MM-DD HH:MM:SS``, order
+    yang belum terkirim, review tanpa komentar, beberapa item/pembayaran per
+    order, dan baris geolokasi duplikat per prefix kode pos.
+    """
+    rng = np.random.default_rng(seed + 3)
+    base = make_orders_reviews(n, seed)
+    zip_codes, zip_state, zip_lat, zip_lng, zip_city = make_zip_table(
+        np.random.default_rng(seed + 1), zip_prefixes
+    )
+    codes = np.array([s[0] for s in STATES])
+
+    orders = base.iloc[:, :8].copy()
+    # Sebagian kecil order belum terkirim atau dibatalkan
+    undelivered = rng.random(n) < 0.03
+    orders.loc[undelivered, "order_status"] = rng.choice(
+        ["shipped", "canceled", "processing"], undelivered.sum()
+    )
+    orders.loc[undelivered, "order_delivered_customer_date"] = pd.NaT
+
+    review_created = base[
+        "order_delivered_customer_date"
+    ].dt.normalize() + pd.to_timedelta(rng.integers(0, 3, n), unit="D")
+    has_comment = rng.random(n) < 0.4
+    reviews = pd.DataFrame(
+        {
+            "review_id": random_hex_ids(rng, n),
+            "order_id": base["order_id"],
+            "review_score": base["review_score"],
+            "review_comment_title": np.where(rng.random(n) < 0.1, "recomendo", None),
+            "review_comment_message": np.where(
+                has_comment, "produto chegou dentro do prazo, recomendo", None
+            ),
+            "review_creation_date": review_created,
+            "review_answer_timestamp": review_created
+            + pd.to_timedelta(rng.integers(3600, 5 * 86400, n), unit="s"),
+        }
+    )
+
+    customer_zip = rng.integers(0, zip_prefixes, n)
+    customers = pd.DataFrame(
+        {
+            "customer_id": base["customer_id"],
+            "customer_unique_id": random_hex_ids(rng, n),
+            "customer_zip_code_prefix": zip_codes[customer_zip],
+            "customer_city": zip_city[customer_zip],
+            "customer_state": codes[zip_state[customer_zip]],
+        }
+    )
+
+    # Rata-rata sekitar 70 baris per prefix seperti data asli, termasuk duplikat
+    n_geo = max(n * 10, zip_prefixes)
+    geo_zip = rng.integers(0, zip_prefixes, n_geo)
+    geolocation = pd.DataFrame(
+        {
+            "geolocation_zip_code_prefix": zip_codes[geo_zip],
+            "geolocation_lat": np.round(
+                zip_lat[geo_zip] + rng.normal(0, 0.02, n_geo), 6
+            ),
+            "geolocation_lng": np.round(
+                zip_lng[geo_zip] + rng.normal(0, 0.02, n_geo), 6
+            ),
+            "geolocation_city": zip_city[geo_zip],
+            "geolocation_state": codes[zip_state[geo_zip]],
+        }
+    )
+    duplicate = rng.random(n_geo) < 0.25
+    geolocation.loc[duplicate, ["geolocation_lat", "geolocation_lng"]] = (
+        np.column_stack(
+            [zip_lat[geo_zip[duplicate]], zip_lng[geo_zip[duplicate]]]
+        ).round(6)
+    )
+
+    n_sellers = max(n // 30, 100)
+    seller_zip = rng.integers(0, zip_prefixes, n_sellers)
+    sellers = pd.DataFrame(
+        {
+            "seller_id": random_hex_ids(rng, n_sellers),
+            "seller_zip_code_prefix": zip_codes[seller_zip],
+            "seller_city": zip_city[seller_zip],
+            "seller_state": codes[zip_state[seller_zip]],
+        }
+    )
+
+    n_products = max(n // 3, 100)
+    sizes = rng.gamma(2.0, 10.0, (n_products, 3)).round() + 2
+    products = pd.DataFrame(
+        {
+            "product_id": random_hex_ids(rng, n_products),
+            "product_category_name": rng.choice(
+                [c[0] for c in PRODUCT_CATEGORIES], n_products
+            ),
+            "product_name_lenght": rng.integers(5, 70, n_products).astype(float),
+            "product_description_lenght": rng.integers(20, 4000, n_products).astype(
+                float
+            ),
+            "product_photos_qty": rng.integers(1, 10, n_products).astype(float),
+            "product_weight_g": rng.gamma(1.5, 1000.0, n_products).round(),
+            "product_length_cm": sizes[:, 0],
+            "product_height_cm": sizes[:, 1],
+            "product_width_cm": sizes[:, 2],
+        }
+    )
+    # Beberapa produk tanpa kategori dan atribut, seperti data asli
+    missing = rng.random(n_products) < 0.02
+    products.loc[missing, products.columns[1:5]] = np.nan
+
+    n_items = rng.choice([1, 2, 3], n, p=[0.9, 0.08, 0.02])
+    item_order = np.repeat(np.arange(n), n_items)
+    item_number = np.concatenate([np.arange(1, k + 1) for k in n_items])
+    price = rng.lognormal(4.4, 0.9, len(item_order)).round(2)
+    order_items = pd.DataFrame(
+        {
+            "order_id": base["order_id"].to_numpy()[item_order],
+            "order_item_id": item_number,
+            "product_id": products["product_id"].to_numpy()[
+                rng.integers(0, n_products, len(item_order))
+            ],
+            "seller_id": sellers["seller_id"].to_numpy()[
+                rng.integers(0, n_sellers, len(item_order))
+            ],
+            "shipping_limit_date": base["order_approved_at"].to_numpy()[item_order]
+            + np.timedelta64(6, "D"),
+            "price": price,
+            "freight_value": (price * rng.uniform(0.05, 0.4, len(item_order))).round(2),
+        }
+    )
+
+    n_payments = np.where(rng.random(n) < 0.05, 2, 1)
+    pay_order = np.repeat(np.arange(n), n_payments)
+    order_value = order_items.groupby(item_order)[["price", "freight_value"]].sum()
+    order_value = order_value.sum(axis=1).to_numpy()
+    payments = pd.DataFrame(
+        {
+            "order_id": base["order_id"].to_numpy()[pay_order],
+            "payment_sequential": np.concatenate(
+                [np.arange(1, k + 1) for k in n_payments]
+            ),
+            "payment_type": rng.choice(
+                PAYMENT_TYPES, len(pay_order), p=[0.74, 0.19, 0.05, 0.02]
+            ),
+            "payment_installments": rng.integers(1, 11, len(pay_order)),
+            "payment_value": (order_value[pay_order] / n_payments[pay_order]).round(2),
+        }
+    )
+
+    return {
+        "customers_dataset.csv": customers,
+        "geolocation_dataset.csv": geolocation,
+        "order_items_dataset.csv": order_items,
+        "order_payments_dataset.csv": payments,
+        "order_reviews_dataset.csv": reviews,
+        "orders_dataset.csv": orders,
+        "products_dataset.csv": products,
+        "sellers_dataset.csv": sellers,
+        "product_category_name_translation.csv": pd.DataFrame(
+            PRODUCT_CATEGORIES,
+            columns=["product_category_name", "product_category_name_english"],
+        ),
+    }
+
+
+def write_raw_tables(out_dir, n, seed=0):
+    """Menulis tabel CSV Olist mentah sintetis ke ``out_dir``"""
+    os.makedirs(out_dir, exist_ok=True)
+    tables = make_raw_tables(n, seed)
+    for file, df in tables.items():
+        df.to_csv(os.path.join(out_dir, file), index=False)
+    return {file: len(df) for file, df in tables.items()}
@@ -0,0 +1,453 @@
+"""Fungsi chart matplotlib/seaborn dashboard.
+
+Setiap ``create_*`` menerima data yang sudah diagregasi (atau baris hasil
+filter) dan mengembalikan ``Figure`` tanpa memanggil Streamlit, sehingga
+bisa dirender lewat cache gambar (``figcache``) maupun dijalankan headless
+oleh benchmark.
+"""
+
+import colorsys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+import density
+import raster
+
+sns.set_theme(style="whitegrid")
+
+
+def create_delivery_boxplot(boxes):
+    """Boxplot waktu pengiriman per skor dari statistik ringkas (``Axes.bxp``)"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    # Warna dan garis seperti sns.boxplot(palette="coolwarm"): saturasi 0.75,
+    # garis abu-abu dengan kecerahan 0.6x warna box tergelap
+    colors = sns.color_palette("coolwarm", len(boxes), desat=0.75)
+    gray = min(colorsys.rgb_to_hls(*color)[1] for color in colors) * 0.6
+    linecolor = (gray, gray, gray)
+    positions = range(len(boxes))
+    artists = ax.bxp(
+        boxes,
+        positions=positions,
+        widths=0.8,
+        capwidths=0.4,
+        patch_artist=True,
+        manage_ticks=False,
+        boxprops={"edgecolor": linecolor},
+        medianprops={"color": linecolor, "solid_capstyle": "butt"},
+        whiskerprops={"color": linecolor, "solid_capstyle": "butt"},
+        flierprops={"markeredgecolor": linecolor},
+        capprops={"color": linecolor},
+    )
+    for patch, color in zip(artists["boxes"], colors):
+        patch.set_facecolor(color)
+    ax.set_xticks(positions, [box["label"] for box in boxes])
+    ax.set_xlim(-0.5, len(boxes) - 0.5)
+    ax.xaxis.grid(False)
+    ax.set_title(
+        "Distribusi Waktu Pengiriman per Skor Review", fontsize=14, fontweight="bold"
+    )
+    ax.set_xlabel("Skor Review (1-5)", fontsize=12)
+    ax.set_ylabel("Waktu Pengiriman (hari)", fontsize=12)
+    ax.grid(axis="y", alpha=0.5)
+    plt.tight_layout()
+    return fig
+
+
+def create_delivery_histogram(delivery_counts):
+    """Histogram waktu pengiriman dari jumlah order per hari (``density``)"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    heights, edges = density.histogram(delivery_counts)
+    widths = np.diff(edges)
+    ax.bar(
+        edges[:-1],
+        heights,
+        width=widths,
+        align="edge",
+        color="#3498db",
+        alpha=0.5,
+        edgecolor="white",
+    )
+    stats = density.summary(delivery_counts)
+    curve = density.kde(delivery_counts)
+    if curve is not None:
+        # Skala densitas ke "Jumlah Order" per kelas, seperti histplot(kde=True)
+        grid, values = curve
+        ax.plot(grid, values * stats["n"] * widths[0], color="#3498db", linewidth=2)
+    ax.axvline(
+        stats["mean"],
+        color="red",
+        linestyle="--",
+        label=f"Mean: {stats['mean']:.1f}",
+    )
+    ax.axvline(
+        stats["median"],
+        color="green",
+        linestyle="--",
+        label=f"Median: {stats['median']:.1f}",
+    )
+    ax.set_title("Distribusi Waktu Pengiriman", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Waktu Pengiriman (hari)", fontsize=12)
+    ax.set_ylabel("Jumlah Order", fontsize=12)
+    ax.legend()
+    plt.tight_layout()
+    return fig
+
+
+def create_score_distribution(score_counts):
+    """Distribusi skor review"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    colors = ["#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60"]
+    bars = ax.bar(score_counts.index, score_counts.values, color=colors)
+    ax.set_title("Distribusi Skor Review", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Skor Review", fontsize=12)
+    ax.set_ylabel("Jumlah Order", fontsize=12)
+    for bar, val in zip(bars, score_counts.values):
+        ax.text(
+            bar.get_x() + bar.get_width() / 2,
+            bar.get_height() + 100,
+            f"{val:,}",
+            ha="center",
+            fontsize=10,
+        )
+    plt.tight_layout()
+    return fig
+
+
+def create_delivery_status_pie(status_counts):
+    """Pie chart status pengiriman"""
+    fig, ax = plt.subplots(figsize=(8, 8))
+    palette = {"Tepat Waktu": "#27ae60", "Terlambat": "#e74c3c"}
+    ax.pie(
+        status_counts.values,
+        labels=status_counts.index,
+        autopct="%1.1f%%",
+        colors=[palette[status] for status in status_counts.index],
+        explode=[0.02] * len(status_counts),
+        startangle=90,
+        textprops={"fontsize": 12},
+    )
+    ax.set_title("Proporsi Status Pengiriman", fontsize=14, fontweight="bold")
+    plt.tight_layout()
+    return fig
+
+
+def create_monthly_trend(monthly):
+    """Tren bulanan order"""
+    fig, ax1 = plt.subplots(figsize=(12, 6))
+    ax2 = ax1.twinx()
+
+    ax1.plot(
+        monthly["month"], monthly["order_id"], "b-o", label="Jumlah Order", linewidth=2
+    )
+    ax2.plot(
+        monthly["month"],
+        monthly["review_score"],
+        "g-s",
+        label="Rata-rata Skor",
+        linewidth=2,
+    )
+
+    ax1.set_xlabel("Bulan", fontsize=12)
+    ax1.set_ylabel("Jumlah Order", color="blue", fontsize=12)
+    ax2.set_ylabel("Rata-rata Skor Review", color="green", fontsize=12)
+    ax1.tick_params(axis="x", rotation=45)
+
+    lines1, labels1 = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines1 + lines2, labels1 + labels2, loc="upper left")
+    ax1.set_title("Tren Bulanan: Order dan Skor Review", fontsize=14, fontweight="bold")
+    plt.tight_layout()
+    return fig
+
+
+def create_avg_delivery_by_score(avg_delivery, overall_mean):
+    """Rata-rata pengiriman per skor"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    colors = ["#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60"]
+    bars = ax.bar(avg_delivery.index, avg_delivery.values, color=colors)
+    ax.set_title(
+        "Rata-rata Waktu Pengiriman per Skor Review", fontsize=14, fontweight="bold"
+    )
+    ax.set_xlabel("Skor Review", fontsize=12)
+    ax.set_ylabel("Rata-rata Waktu Pengiriman (hari)", fontsize=12)
+    for bar, val in zip(bars, avg_delivery.values):
+        ax.text(
+            bar.get_x() + bar.get_width() / 2,
+            bar.get_height() + 0.3,
+            f"{val:.1f}",
+            ha="center",
+            fontsize=10,
+        )
+    ax.axhline(
+        overall_mean,
+        color="red",
+        linestyle="--",
+        label=f"Mean keseluruhan: {overall_mean:.1f}",
+    )
+    ax.legend()
+    plt.tight_layout()
+    return fig
+
+
+def create_state_barplot(state_counts):
+    """Barplot status per state"""
+    fig, ax = plt.subplots(figsize=(14, 6))
+    state_order = (
+        state_counts.groupby("customer_state", observed=True)["count"]
+        .sum()
+        .sort_values(ascending=False)
+        .index
+    )
+    sns.barplot(
+        data=state_counts,
+        x="customer_state",
+        y="count",
+        hue="delivery_status",
+        order=state_order,
+        palette={"Terlambat": "#e74c3c", "Tepat Waktu": "#27ae60"},
+        errorbar=None,
+        ax=ax,
+    )
+    ax.set_title(
+        "Pengiriman Tepat Waktu vs Terlambat per State", fontsize=14, fontweight="bold"
+    )
+    ax.set_xlabel("Kode State", fontsize=12)
+    ax.set_ylabel("Jumlah Pengiriman", fontsize=12)
+    ax.legend(title="Status")
+    ax.tick_params(axis="x", rotation=45)
+    ax.grid(axis="y", alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def create_late_percentage_by_state(state_stats):
+    """Persentase keterlambatan per state"""
+    state_stats = state_stats.sort_values(ascending=False)
+
+    fig, ax = plt.subplots(figsize=(14, 6))
+    colors = [
+        "#e74c3c" if val > state_stats.mean() else "#f39c12"
+        for val in state_stats.values
+    ]
+    ax.bar(state_stats.index, state_stats.values, color=colors)
+    ax.axhline(
+        state_stats.mean(),
+        color="blue",
+        linestyle="--",
+        label=f"Rata-rata: {state_stats.mean():.1f}%",
+    )
+    ax.set_title("Persentase Keterlambatan per State", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Kode State", fontsize=12)
+    ax.set_ylabel("Persentase Terlambat (%)", fontsize=12)
+    ax.tick_params(axis="x", rotation=45)
+    ax.legend()
+    plt.tight_layout()
+    return fig
+
+
+def create_geo_scatter(df, raster_threshold=raster.RASTER_THRESHOLD):
+    """Scatter plot geografis (raster kepadatan jika baris > threshold)"""
+    if len(df) > raster_threshold:
+        return create_geo_density(df)
+
+    fig, ax = plt.subplots(figsize=(10, 10))
+    late = df[df["is_late"]]
+    ontime = df[~df["is_late"]]
+
+    ax.scatter(
+        ontime["geolocation_lng"],
+        ontime["geolocation_lat"],
+        s=2,
+        alpha=0.3,
+        color="#27ae60",
+        label="Tepat Waktu",
+    )
+    ax.scatter(
+        late["geolocation_lng"],
+        late["geolocation_lat"],
+        s=2,
+        alpha=0.5,
+        color="#e74c3c",
+        label="Terlambat",
+    )
+
+    ax.set_xlim(-74, -34)
+    ax.set_ylim(-34, 6)
+    ax.set_title("Peta Sebaran Pengiriman di Brasil", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Longitude", fontsize=12)
+    ax.set_ylabel("Latitude", fontsize=12)
+    ax.legend(loc="lower left")
+    ax.grid(alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def create_geo_density(df):
+    """Raster rasio keterlambatan per sel grid, opasitas sesuai jumlah order"""
+    grid = raster.bin_geo(
+        df["geolocation_lat"],
+        df["geolocation_lng"],
+        df["is_late"],
+    )
+    fig, ax = plt.subplots(figsize=(10, 10))
+    ax.imshow(
+        raster.density_rgba(grid),
+        origin="lower",
+        extent=raster.GEO_EXTENT,
+        interpolation="nearest",
+        aspect="auto",
+    )
+    colorbar = fig.colorbar(
+        plt.cm.ScalarMappable(cmap="RdYlGn_r", norm=plt.Normalize(0, 1)),
+        ax=ax,
+        shrink=0.6,
+    )
+    colorbar.set_label("Rasio Terlambat", fontsize=12)
+
+    ax.set_xlim(-74, -34)
+    ax.set_ylim(-34, 6)
+    ax.set_title(
+        f"Peta Kepadatan Pengiriman di Brasil ({len(df):,} order)",
+        fontsize=14,
+        fontweight="bold",
+    )
+    ax.set_xlabel("Longitude", fontsize=12)
+    ax.set_ylabel("Latitude", fontsize=12)
+    ax.grid(alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+
+def create_top_cities(df, n=10):
+    """Top kota dengan order terbanyak"""
+    city_counts = df["geolocation_city"].value_counts().head(n)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bars = ax.barh(city_counts.index[::-1], city_counts.values[::-1], color="#3498db")
+    ax.set_title(f"Top {n} Kota dengan Order Terbanyak", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Jumlah Order", fontsize=12)
+    ax.set_ylabel("Kota", fontsize=12)
+    for bar, val in zip(bars, city_counts.values[::-1]):
+        ax.text(
+            val + 50,
+            bar.get_y() + bar.get_height() / 2,
+            f"{val:,}",
+            va="center",
+            fontsize=10,
+        )
+    plt.tight_layout()
+    return fig
+
+
+def create_delivery_time_by_state(state_delivery, overall_mean, top_n=10):
+    """Waktu pengiriman per state"""
+    state_delivery = state_delivery[state_delivery["count"] >= 100].sort_values(
+        "mean", ascending=True
+    )
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    colors = plt.cm.RdYlGn_r(
+        [i / len(state_delivery) for i in range(len(state_delivery))]
+    )
+    ax.barh(state_delivery.index, state_delivery["mean"], color=colors)
+    ax.axvline(
+        overall_mean,
+        color="red",
+        linestyle="--",
+        label=f"Rata-rata nasional: {overall_mean:.1f} hari",
+    )
+    ax.set_title("Rata-rata Waktu Pengiriman per State", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Rata-rata Waktu Pengiriman (hari)", fontsize=12)
+    ax.set_ylabel("State", fontsize=12)
+    ax.legend()
+    plt.tight_layout()
+    return fig
+
+
+def create_day_distribution(day_counts):
+    """Bar chart jumlah order per hari"""
+    fig, ax = plt.subplots(figsize=(12, 5))
+    colors = plt.cm.Blues([0.3 + i * 0.1 for i in range(7)])
+    ax.bar(day_counts.index, day_counts.values, color=colors)
+    ax.set_title("Distribusi Order per Hari", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Hari", fontsize=12)
+    ax.set_ylabel("Jumlah Order", fontsize=12)
+    ax.tick_params(axis="x", rotation=45)
+    plt.tight_layout()
+    return fig
+
+
+def create_delivery_by_distance(distance_stats):
+    """Rata-rata pengiriman dan persen terlambat per kelas jarak seller"""
+    fig, ax1 = plt.subplots(figsize=(12, 6))
+    ax1.bar(
+        distance_stats.index,
+        distance_stats["Mean Delivery"],
+        color="#3498db",
+        alpha=0.8,
+        label="Rata-rata Pengiriman",
+    )
+    ax1.set_xlabel("Jarak Seller-Pelanggan (km)", fontsize=12)
+    ax1.set_ylabel("Rata-rata Waktu Pengiriman (hari)", fontsize=12, color="#3498db")
+
+    ax2 = ax1.twinx()
+    ax2.plot(
+        distance_stats.index,
+        distance_stats["Persen Terlambat"],
+        color="#e74c3c",
+        marker="o",
+        linewidth=2,
+        label="Persen Terlambat",
+    )
+    ax2.set_ylabel("Persentase Terlambat (%)", fontsize=12, color="#e74c3c")
+
+    ax1.set_title(
+        "Waktu Pengiriman vs Jarak Seller-Pelanggan", fontsize=14, fontweight="bold"
+    )
+    plt.tight_layout()
+    return fig
+
+
+def create_score_heatmap(heatmap_data):
+    """Heatmap skor dan waktu pengiriman"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.heatmap(heatmap_data, annot=True, fmt="d", cmap="YlOrRd", ax=ax)
+    ax.set_title(
+        "Distribusi Skor Review berdasarkan Waktu Pengiriman",
+        fontsize=14,
+        fontweight="bold",
+    )
+    ax.set_xlabel("Skor Review", fontsize=12)
+    ax.set_ylabel("Waktu Pengiriman (hari)", fontsize=12)
+    plt.tight_layout()
+    return fig
+
+
+def create_late_percentage_by_category(category_detail, top_n=15):
+    """Persentase keterlambatan kategori dengan order terbanyak"""
+    overall = (
+        category_detail["Total Terlambat"].sum()
+        / category_detail["Total Order"].sum()
+        * 100
+    )
+    top = category_detail.nlargest(top_n, "Total Order").sort_values("Persen Terlambat")
+
+    fig, ax = plt.subplots(figsize=(12, 7))
+    colors = [
+        "#e74c3c" if val > overall else "#f39c12" for val in top["Persen Terlambat"]
+    ]
+    ax.barh(top.index, top["Persen Terlambat"], color=colors)
+    ax.axvline(
+        overall, color="blue", linestyle="--", label=f"Keseluruhan: {overall:.1f}%"
+    )
+    ax.set_title(
+        f"Persentase Keterlambatan {top_n} Kategori Teratas",
+        fontsize=14,
+        fontweight="bold",
+    )
+    ax.set_xlabel("Persentase Terlambat (%)", fontsize=12)
+    ax.set_ylabel("Kategori Produk", fontsize=12)
+    ax.legend()
+    plt.tight_layout()
+    return fig
@@ -0,0 +1,295 @@
+"""Cube pra-agregasi untuk filter dan chart dashboard.
+
+Cube adalah DataFrame kecil dengan satu baris per kombinasi unik dimensi
+filter dan ukuran aditif (jumlah order, jumlah dan jumlah kuadrat
+``delivery_time``, jumlah order terlambat, jumlah ``review_score``). Filter
+sidebar diterapkan ke sel cube, lalu metrik dan chart agregat dihitung dari
+sel yang lolos, sehingga biayanya tidak bergantung pada jumlah order.
+
+``delivery_time`` (hari bulat) dan ``review_score`` ikut menjadi dimensi,
+jadi median, kuantil, min/max, dan korelasi juga bisa dihitung tepat dari
+jumlah per nilai.
+
+Status pengiriman disimpan sebagai kolom boolean ``is_late`` (dari skema
+dataset atau ``add_is_late``) agar semua hitungan keterlambatan cukup berupa
+sum/mean bawaan pandas, tanpa lambda per grup; label "Terlambat"/"Tepat
+Waktu" hanya dibuat untuk hasil (``status_labels``).
+
+``month_id`` dan ``weekday`` (``add_time_buckets``) adalah integer kecil yang
+ditentukan oleh ``purchase_date``, jadi tidak menambah jumlah sel, dan label
+bulan/hari hanya dibuat untuk baris hasil.
+
+``distance_bin`` adalah kelas jarak seller-pelanggan terjauh per order
+(``seller_customer_km_max`` dari pipeline); dimensi ini dilewati jika
+dataset tidak memiliki kolom jarak.
+"""
+
+import numpy as np
+import pandas as pd
+
+REVIEW_DIMENSIONS = [
+    "purchase_date",
+    "month_id",
+    "weekday",
+    "review_score",
+    "delivery_time",
+    "is_late",
+]
+GEO_DIMENSIONS = [
+    "customer_state",
+    "distance_bin",
+    "delivery_time",
+    "is_late",
+]
+# Partisi sketch jarak seller-pelanggan: dimensi filter cube geo (``sketch``)
+DISTANCE_SKETCH_DIMENSIONS = ["customer_state", "delivery_time", "is_late"]
+MEASURES = ["count", "delivery_sum", "delivery_sq_sum", "late_count", "score_sum"]
+
+DESCRIBE_INDEX = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+LATE_STATUS = "Terlambat"
+ONTIME_STATUS = "Tepat Waktu"
+# Batas bawah setiap kelas jarak seller-pelanggan (km)
+DISTANCE_BINS_KM = [0, 100, 300, 600, 1000, 2000]
+DISTANCE_LABELS = ["<100", "100-300", "300-600", "600-1000", "1000-2000", ">2000"]
+WEEKDAY_NAMES = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+def add_is_late(df):
+    """Tambahkan kolom boolean ``is_late`` dari ``delivery_status`` (in-place)"""
+    if "delivery_status" in df.columns:
+        df["is_late"] = (df["delivery_status"] == LATE_STATUS).to_numpy(dtype=bool)
+    return df
+
+
+def status_labels(is_late):
+    """Label ``delivery_status`` untuk nilai ``is_late``"""
+    labels = np.where(np.asarray(is_late, dtype=bool), LATE_STATUS, ONTIME_STATUS)
+    return pd.Index(labels, name="delivery_status")
+
+
+def add_distance_bin(df):
+    """Tambahkan ``distance_bin`` (indeks ``DISTANCE_LABELS``, -1 jika kosong)"""
+    if "seller_customer_km_max" in df.columns:
+        km = df["seller_customer_km_max"].to_numpy(dtype=np.float64)
+        bins = np.digitize(km, DISTANCE_BINS_KM[1:])
+        df["distance_bin"] = np.where(np.isnan(km), -1, bins).astype(np.int8)
+    return df
+
+
+def add_time_buckets(df):
+    """Tambahkan ``month_id`` (bulan sejak 1970-01) dan ``weekday`` (Senin=0)"""
+    ts = df["order_purchase_timestamp"].to_numpy(dtype="M8[ns]")
+    df["month_id"] = ts.astype("M8[M]").astype(np.int64).astype(np.int16)
+    # 1970-01-01 adalah hari Kamis (weekday 3)
+    days = ts.astype("M8[D]").astype(np.int64)
+    df["weekday"] = ((days + 3) % 7).astype(np.int8)
+    return df
+
+
+def month_labels(month_ids):
+    """Label ``YYYY-MM`` untuk ``month_id``"""
+    months = np.asarray(month_ids, dtype=np.int64).astype("M8[M]")
+    return pd.Index(np.datetime_as_string(months, unit="M"), name="month")
+
+
+def time_buckets(cells):
+    """Satu rollup per (``month_id``, ``weekday``) untuk semua view tren"""
+    return rollup(cells, ["month_id", "weekday"])
+
+
+def build_cube(df, dims):
+    """Agregasi baris ``df`` menjadi cube dengan dimensi ``dims``"""
+    if "is_late" not in df.columns:
+        df = add_is_late(df.copy())
+    if {"month_id", "weekday"} & set(dims) and "month_id" not in df.columns:
+        df = add_time_buckets(df.copy())
+    if "distance_bin" in dims and "distance_bin" not in df.columns:
+        df = add_distance_bin(df.copy())
+        if "distance_bin" not in df.columns:
+            dims = [dim for dim in dims if dim != "distance_bin"]
+    delivery = df["delivery_time"].to_numpy(dtype=np.int64)
+    cells = {}
+    for dim in dims:
+        if dim == "purchase_date":
+            cells[dim] = df["order_purchase_timestamp"].dt.normalize().to_numpy()
+        else:
+            cells[dim] = df[dim].to_numpy()
+    cells["delivery_sum"] = delivery
+    cells["delivery_sq_sum"] = delivery * delivery
+    cells["late_count"] = df["is_late"].to_numpy(dtype=np.int64)
+    if "review_score" in df.columns:
+        cells["score_sum"] = df["review_score"].to_numpy(dtype=np.int64)
+
+    frame = pd.DataFrame(cells)
+    measures = [m for m in MEASURES if m in frame.columns]
+    cube = frame.groupby(dims, observed=True, sort=True)[measures].sum()
+    cube.insert(0, "count", frame.groupby(dims, observed=True, sort=True).size())
+    return cube.reset_index()
+
+
+def filter_cube(
+    cube,
+    date_range=None,
+    score_range=None,
+    delivery_range=None,
+    status=None,
+    states=None,
+):
+    """Sel cube yang lolos filter sidebar (filter tanpa dimensi diabaikan)"""
+    mask = np.ones(len(cube), dtype=bool)
+    if date_range is not None and "purchase_date" in cube.columns:
+        dates = cube["purchase_date"]
+        mask &= (dates >= pd.Timestamp(date_range[0])).to_numpy()
+        mask &= (dates <= pd.Timestamp(date_range[1])).to_numpy()
+    if score_range is not None and "review_score" in cube.columns:
+        mask &= cube["review_score"].between(*score_range).to_numpy()
+    if delivery_range is not None:
+        mask &= cube["delivery_time"].between(*delivery_range).to_numpy()
+    if status is not None:
+        mask &= (cube["is_late"] == (status == LATE_STATUS)).to_numpy()
+    if states is not None and "customer_state" in cube.columns:
+        mask &= cube["customer_state"].isin(states).to_numpy()
+    return cube[mask]
+
+
+def rollup(cells, by):
+    """Jumlahkan ukuran aditif per ``by``"""
+    measures = [m for m in MEASURES if m in cells.columns]
+    return cells.groupby(by, observed=True, sort=True)[measures].sum()
+
+
+def total(cells):
+    """Jumlah seluruh ukuran aditif sebagai Series"""
+    return cells[[m for m in MEASURES if m in cells.columns]].sum()
+
+
+def weighted_quantiles(values, counts, qs):
+    """Kuantil (interpolasi linear seperti pandas) dari pasangan nilai-jumlah"""
+    order = np.argsort(values, kind="stable")
+    values = np.asarray(values, dtype=np.float64)[order]
+    cum = np.cumsum(np.asarray(counts)[order])
+    n = cum[-1]
+    result = []
+    for q in qs:
+        pos = q * (n - 1)
+        lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+        v_lo = values[np.searchsorted(cum, lo, side="right")]
+        v_hi = values[np.searchsorted(cum, hi, side="right")]
+        result.append(v_lo + (v_hi - v_lo) * (pos - lo))
+    return result
+
+
+def describe(cells, dim):
+    """Setara ``df[dim].describe()`` untuk dimensi numerik cube"""
+    grouped = cells.groupby(dim, observed=True)["count"].sum()
+    values = grouped.index.to_numpy(dtype=np.float64)
+    counts = grouped.to_numpy()
+    n = counts.sum()
+    mean = (values * counts).sum() / n
+    sq_sum = (values * values * counts).sum()
+    std = np.sqrt((sq_sum - n * mean * mean) / (n - 1)) if n > 1 else np.nan
+    q25, q50, q75 = weighted_quantiles(values, counts, [0.25, 0.5, 0.75])
+    return pd.Series(
+        [n, mean, std, values.min(), q25, q50, q75, values.max()],
+        index=DESCRIBE_INDEX,
+        name=dim,
+        dtype=np.float64,
+    )
+
+
+def distance_summary(cells):
+    """Jumlah order, rata-rata pengiriman, dan persen terlambat per kelas jarak"""
+    totals = rollup(cells[cells["distance_bin"] >= 0], "distance_bin")
+    summary = pd.DataFrame(
+        {
+            "Total Order": totals["count"],
+            "Mean Delivery": totals["delivery_sum"] / totals["count"],
+            "Persen Terlambat": totals["late_count"] / totals["count"] * 100,
+        }
+    )
+    summary.index = pd.Index(
+        [DISTANCE_LABELS[i] for i in summary.index], name="Jarak (km)"
+    )
+    return summary
+
+
+def delivery_median(cells):
+    """Median ``delivery_time`` dari sel cube"""
+    return weighted_quantiles(cells["delivery_time"], cells["count"], [0.5])[0]
+
+
+def correlation(cells):
+    """Korelasi Pearson ``delivery_time`` vs ``review_score`` dari sel cube"""
+    n = cells["count"].sum()
+    score = cells["review_score"].to_numpy(dtype=np.float64)
+    sum_x = cells["delivery_sum"].sum()
+    sum_y = cells["score_sum"].sum()
+    sum_xx = cells["delivery_sq_sum"].sum()
+    sum_yy = (score * score * cells["count"]).sum()
+    sum_xy = (score * cells["delivery_sum"]).sum()
+    cov = sum_xy - sum_x * sum_y / n
+    var_x = sum_xx - sum_x * sum_x / n
+    var_y = sum_yy - sum_y * sum_y / n
+    return cov / np.sqrt(var_x * var_y)
+
+
+def _grouped_quantile(values, counts, starts, q):
+    """Kuantil ``q`` per grup untuk pasangan nilai-jumlah yang sudah terurut.
+
+    ``starts`` adalah indeks baris pertama tiap grup pada ``values``.
+    """
+    cum = np.cumsum(counts)
+    ends = np.append(starts[1:], len(values))
+    offset = cum[starts] - counts[starts]
+    n = cum[ends - 1] - offset
+    pos = q * (n - 1)
+    lo, hi = np.floor(pos), np.ceil(pos)
+    v_lo = values[np.searchsorted(cum, offset + lo, side="right")]
+    v_hi = values[np.searchsorted(cum, offset + hi, side="right")]
+    return v_lo + (v_hi - v_lo) * (pos - lo)
+
+
+def delivery_detail(cells, by):
+    """Statistik ``delivery_time`` per grup: jumlah, mean, median, std, min, max"""
+    per_value = (
+        cells.groupby([by, "delivery_time"], observed=True, sort=True)[
+            ["count", "late_count"]
+        ]
+        .sum()
+        .reset_index()
+    )
+    values = per_value["delivery_time"].to_numpy(dtype=np.float64)
+    counts = per_value["count"].to_numpy(dtype=np.int64)
+    per_value["sum"] = values * counts
+    per_value["sq_sum"] = values * values * counts
+
+    grouped = per_value.groupby(by, observed=True, sort=True)
+    totals = grouped[["count", "sum", "sq_sum", "late_count"]].sum()
+    starts = np.flatnonzero(per_value[by].ne(per_value[by].shift()).to_numpy())
+
+    n = totals["count"].to_numpy(dtype=np.float64)
+    mean = totals["sum"].to_numpy() / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (totals["sq_sum"].to_numpy() - n * mean * mean) / (n - 1)
+        std = np.where(n > 1, np.sqrt(var), np.nan)
+    return pd.DataFrame(
+        {
+            "Jumlah": totals["count"].to_numpy(dtype=np.int64),
+            "Mean": mean,
+            "Median": _grouped_quantile(values, counts, starts, 0.5),
+            "Std": std,
+            "Min": grouped["delivery_time"].min().to_numpy(dtype=np.int64),
+            "Max": grouped["delivery_time"].max().to_numpy(dtype=np.int64),
+            "Terlambat": totals["late_count"].to_numpy(dtype=np.int64),
+        },
+        index=totals.index,
+    )
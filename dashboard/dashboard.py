@@ -1,348 +1,237 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 import os
-
-sns.set_theme(style="whitegrid")
+import time
+from contextlib import contextmanager
+
+import charts
+import cube
+import figcache
+import filters
+import profiling
+import schema
+import shared
+import sketch
+import snapshot
+import vegalite
+import views
 
 st.set_page_config(
     page_title="Dashboard E-Commerce Brasil", page_icon=None, layout="wide"
 )
 
+# Nomor rerun sesi ini, untuk menandai waktu bagian yang dihitung sekarang
+st.session_state["rerun"] = st.session_state.get("rerun", 0) + 1
+
 # Path absolut
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Profiling: DASHBOARD_PROFILE=1 untuk semua sesi, atau ?profile=1 per sesi
+PROFILE_ALL = os.environ.get("DASHBOARD_PROFILE", "0") != "0"
+PROFILE_LOG = os.environ.get(
+    "DASHBOARD_PROFILE_LOG", os.path.join(BASE_DIR, "_profile", "runs.jsonl")
+)
 
+if PROFILE_ALL or st.query_params.get("profile") == "1":
+    profiling.start_run(rerun=st.session_state["rerun"])
+else:
+    # Run yang tertinggal (rerun sebelumnya gagal) tidak boleh ikut terisi
+    profiling.cancel_run()
 
-@st.cache_data
-def load_data():
-    """Memuat dataset dashboard"""
-    orders_reviews = pd.read_csv(os.path.join(BASE_DIR, "orders_reviews.csv"))
-    geo_orders = pd.read_csv(os.path.join(BASE_DIR, "geo_orders.csv"))
+# Folder dataset bisa diganti, mis. untuk load test dengan data sintetis
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", BASE_DIR)
+# "0": mode lama, setiap sesi mendapat salinan dataset dari st.cache_data
+SHARED_DATA = os.environ.get("DASHBOARD_SHARED_DATA", "1") != "0"
+# Render chart agregat: "vega" (di browser) atau "matplotlib" (PNG, ekspor statis)
+CHART_BACKENDS = {"Interaktif (Vega-Lite)": "vega", "Statis (PNG)": "matplotlib"}
+DEFAULT_CHART_BACKEND = os.environ.get("DASHBOARD_CHARTS", "vega")
 
-    date_cols = ["order_purchase_timestamp", "order_delivered_customer_date"]
-    for col in date_cols:
-        if col in orders_reviews.columns:
-            orders_reviews[col] = pd.to_datetime(orders_reviews[col])
+# Jarak seller-pelanggan (tahap pipeline); diringkas lewat sketch per partisi
+DISTANCE_COLUMN = "seller_customer_km_max"
 
-    return orders_reviews, geo_orders
+# Rollup kategori produk x bulan (stage ``category_rollup`` pipeline)
+CATEGORY_ROLLUP = "category_rollup"
 
+# Batas baris tabel "Data Order" yang dikirim ke browser
+ORDER_ROWS_SHOWN = 1000
 
-def create_delivery_boxplot(df):
-    """Boxplot waktu pengiriman"""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.boxplot(data=df, x="review_score", y="delivery_time", palette="coolwarm", ax=ax)
-    ax.set_title(
-        "Distribusi Waktu Pengiriman per Skor Review", fontsize=14, fontweight="bold"
-    )
-    ax.set_xlabel("Skor Review (1-5)", fontsize=12)
-    ax.set_ylabel("Waktu Pengiriman (hari)", fontsize=12)
-    ax.grid(axis="y", alpha=0.5)
-    plt.tight_layout()
-    return fig
-
-
-def create_delivery_histogram(df):
-    """Histogram waktu pengiriman"""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.histplot(data=df, x="delivery_time", bins=30, kde=True, color="#3498db", ax=ax)
-    ax.axvline(
-        df["delivery_time"].mean(),
-        color="red",
-        linestyle="--",
-        label=f"Mean: {df['delivery_time'].mean():.1f}",
-    )
-    ax.axvline(
-        df["delivery_time"].median(),
-        color="green",
-        linestyle="--",
-        label=f"Median: {df['delivery_time'].median():.1f}",
-    )
-    ax.set_title("Distribusi Waktu Pengiriman", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Waktu Pengiriman (hari)", fontsize=12)
-    ax.set_ylabel("Jumlah Order", fontsize=12)
-    ax.legend()
-    plt.tight_layout()
-    return fig
-
-
-def create_score_distribution(df):
-    """Distribusi skor review"""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    score_counts = df["review_score"].value_counts().sort_index()
-    colors = ["#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60"]
-    bars = ax.bar(score_counts.index, score_counts.values, color=colors)
-    ax.set_title("Distribusi Skor Review", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Skor Review", fontsize=12)
-    ax.set_ylabel("Jumlah Order", fontsize=12)
-    for bar, val in zip(bars, score_counts.values):
-        ax.text(
-            bar.get_x() + bar.get_width() / 2,
-            bar.get_height() + 100,
-            f"{val:,}",
-            ha="center",
-            fontsize=10,
-        )
-    plt.tight_layout()
-    return fig
-
-
-def create_delivery_status_pie(df):
-    """Pie chart status pengiriman"""
-    fig, ax = plt.subplots(figsize=(8, 8))
-    status_counts = df["delivery_status"].value_counts()
-    colors = ["#27ae60", "#e74c3c"]
-    ax.pie(
-        status_counts.values,
-        labels=status_counts.index,
-        autopct="%1.1f%%",
-        colors=colors,
-        explode=(0.02, 0.02),
-        startangle=90,
-        textprops={"fontsize": 12},
-    )
-    ax.set_title("Proporsi Status Pengiriman", fontsize=14, fontweight="bold")
-    plt.tight_layout()
-    return fig
-
-
-def create_monthly_trend(df):
-    """Tren bulanan order"""
-    df_copy = df.copy()
-    df_copy["month"] = df_copy["order_purchase_timestamp"].dt.to_period("M")
-    monthly = (
-        df_copy.groupby("month")
-        .agg({"order_id": "count", "delivery_time": "mean", "review_score": "mean"})
-        .reset_index()
-    )
-    monthly["month"] = monthly["month"].astype(str)
+# Kolom turunan yang ditambahkan setelah skema diterapkan
+DERIVED_COLUMNS = {
+    "orders_reviews": cube.add_time_buckets,
+    "geo_orders": cube.add_distance_bin,
+}
 
-    fig, ax1 = plt.subplots(figsize=(12, 6))
-    ax2 = ax1.twinx()
 
-    ax1.plot(
-        monthly["month"], monthly["order_id"], "b-o", label="Jumlah Order", linewidth=2
-    )
-    ax2.plot(
-        monthly["month"],
-        monthly["review_score"],
-        "g-s",
-        label="Rata-rata Skor",
-        linewidth=2,
-    )
+def prepare_dataset(base_dir, name):
+    """Dataset ringkas beserta kolom turunan dan total memorinya"""
+    with profiling.stage(f"prepare:{name}") as s:
+        df, memory = schema.load_compact(base_dir, name)
+        DERIVED_COLUMNS[name](df)
+        s["rows_out"] = len(df)
+    return df, memory.loc["Total"].to_dict()
+
 
-    ax1.set_xlabel("Bulan", fontsize=12)
-    ax1.set_ylabel("Jumlah Order", color="blue", fontsize=12)
-    ax2.set_ylabel("Rata-rata Skor Review", color="green", fontsize=12)
-    ax1.tick_params(axis="x", rotation=45)
-
-    lines1, labels1 = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax1.legend(lines1 + lines2, labels1 + labels2, loc="upper left")
-    ax1.set_title("Tren Bulanan: Order dan Skor Review", fontsize=14, fontweight="bold")
-    plt.tight_layout()
-    return fig
-
-
-def create_avg_delivery_by_score(df):
-    """Rata-rata pengiriman per skor"""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    avg_delivery = df.groupby("review_score")["delivery_time"].mean()
-    colors = ["#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60"]
-    bars = ax.bar(avg_delivery.index, avg_delivery.values, color=colors)
-    ax.set_title(
-        "Rata-rata Waktu Pengiriman per Skor Review", fontsize=14, fontweight="bold"
+def build_views(orders_reviews, geo_orders, memories):
+    """Cube, index filter geo, dan sketch jarak untuk kedua dataset.
+
+    Semua chart review dihitung dari cube, jadi hanya baris geo (peta dan top
+    kota) yang perlu index filter. Versi data (sidik kedua cube) dihitung
+    sekali di sini untuk kunci cache chart berbasis baris.
+    """
+    rows = len(orders_reviews) + len(geo_orders)
+    with profiling.stage("build_cube", rows_in=rows) as s:
+        reviews_cube = cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS)
+        geo_cube = cube.build_cube(geo_orders, cube.GEO_DIMENSIONS)
+        s["rows_out"] = len(reviews_cube) + len(geo_cube)
+    with profiling.stage("build_index", rows_in=len(geo_orders)):
+        geo_index = filters.build_index(geo_orders, filters.GEO_INDEX)
+    distance_sketch = None
+    if DISTANCE_COLUMN in geo_orders.columns:
+        with profiling.stage("build_sketch", rows_in=len(geo_orders)):
+            distance_sketch = sketch.build_partitions(
+                geo_orders,
+                cube.DISTANCE_SKETCH_DIMENSIONS,
+                DISTANCE_COLUMN,
+                "delivery_time",
+            )
+    return (
+        orders_reviews,
+        geo_orders,
+        reviews_cube,
+        geo_cube,
+        geo_index,
+        distance_sketch,
+        sum(pd.Series(memory) for memory in memories),
+        figcache.fingerprint(reviews_cube, geo_cube),
     )
-    ax.set_xlabel("Skor Review", fontsize=12)
-    ax.set_ylabel("Rata-rata Waktu Pengiriman (hari)", fontsize=12)
-    for bar, val in zip(bars, avg_delivery.values):
-        ax.text(
-            bar.get_x() + bar.get_width() / 2,
-            bar.get_height() + 0.3,
-            f"{val:.1f}",
-            ha="center",
-            fontsize=10,
+
+
+@st.cache_data
+def load_data():
+    """Memuat dataset dashboard (snapshot/CSV) beserta cube dan index filter"""
+    orders_reviews, reviews_memory = prepare_dataset(DATA_DIR, "orders_reviews")
+    geo_orders, geo_memory = prepare_dataset(DATA_DIR, "geo_orders")
+    return build_views(orders_reviews, geo_orders, [reviews_memory, geo_memory])
+
+
+@st.cache_resource
+def load_shared_data():
+    """Seperti ``load_data``, tetapi satu salinan read-only untuk semua sesi.
+
+    ``None`` jika snapshot bersama tidak bisa ditulis (mis. folder data
+    read-only); dashboard lalu memakai ``load_data``.
+    """
+    try:
+        orders_reviews, reviews_memory = shared.load_shared(
+            DATA_DIR, "orders_reviews", prepare_dataset
         )
-    ax.axhline(
-        df["delivery_time"].mean(),
-        color="red",
-        linestyle="--",
-        label=f"Mean keseluruhan: {df['delivery_time'].mean():.1f}",
-    )
-    ax.legend()
-    plt.tight_layout()
-    return fig
-
-
-def create_state_barplot(df):
-    """Barplot status per state"""
-    fig, ax = plt.subplots(figsize=(14, 6))
-    state_order = df.groupby("customer_state").size().sort_values(ascending=False).index
-    sns.countplot(
-        data=df,
-        x="customer_state",
-        hue="delivery_status",
-        order=state_order,
-        palette={"Terlambat": "#e74c3c", "Tepat Waktu": "#27ae60"},
-        ax=ax,
-    )
-    ax.set_title(
-        "Pengiriman Tepat Waktu vs Terlambat per State", fontsize=14, fontweight="bold"
-    )
-    ax.set_xlabel("Kode State", fontsize=12)
-    ax.set_ylabel("Jumlah Pengiriman", fontsize=12)
-    ax.legend(title="Status")
-    ax.tick_params(axis="x", rotation=45)
-    ax.grid(axis="y", alpha=0.3)
-    plt.tight_layout()
-    return fig
-
-
-def create_late_percentage_by_state(df):
-    """Persentase keterlambatan per state"""
-    state_stats = (
-        df.groupby("customer_state")
-        .apply(lambda x: (x["delivery_status"] == "Terlambat").sum() / len(x) * 100)
-        .sort_values(ascending=False)
+        geo_orders, geo_memory = shared.load_shared(
+            DATA_DIR, "geo_orders", prepare_dataset
+        )
+    except OSError:
+        return None
+    return shared.freeze(
+        build_views(orders_reviews, geo_orders, [reviews_memory, geo_memory])
     )
 
-    fig, ax = plt.subplots(figsize=(14, 6))
-    colors = [
-        "#e74c3c" if val > state_stats.mean() else "#f39c12"
-        for val in state_stats.values
-    ]
-    ax.bar(state_stats.index, state_stats.values, color=colors)
-    ax.axhline(
-        state_stats.mean(),
-        color="blue",
-        linestyle="--",
-        label=f"Rata-rata: {state_stats.mean():.1f}%",
-    )
-    ax.set_title("Persentase Keterlambatan per State", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Kode State", fontsize=12)
-    ax.set_ylabel("Persentase Terlambat (%)", fontsize=12)
-    ax.tick_params(axis="x", rotation=45)
-    ax.legend()
-    plt.tight_layout()
-    return fig
-
-
-def create_geo_scatter(df):
-    """Scatter plot geografis"""
-    fig, ax = plt.subplots(figsize=(10, 10))
-    late = df[df["delivery_status"] == "Terlambat"]
-    ontime = df[df["delivery_status"] == "Tepat Waktu"]
-
-    ax.scatter(
-        ontime["geolocation_lng"],
-        ontime["geolocation_lat"],
-        s=2,
-        alpha=0.3,
-        color="#27ae60",
-        label="Tepat Waktu",
-    )
-    ax.scatter(
-        late["geolocation_lng"],
-        late["geolocation_lat"],
-        s=2,
-        alpha=0.5,
-        color="#e74c3c",
-        label="Terlambat",
-    )
 
-    ax.set_xlim(-74, -34)
-    ax.set_ylim(-34, 6)
-    ax.set_title("Peta Sebaran Pengiriman di Brasil", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Longitude", fontsize=12)
-    ax.set_ylabel("Latitude", fontsize=12)
-    ax.legend(loc="lower left")
-    ax.grid(alpha=0.3)
-    plt.tight_layout()
-    return fig
-
-
-def create_top_cities(df, n=10):
-    """Top kota dengan order terbanyak"""
-    city_counts = df["geolocation_city"].value_counts().head(n)
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars = ax.barh(city_counts.index[::-1], city_counts.values[::-1], color="#3498db")
-    ax.set_title(f"Top {n} Kota dengan Order Terbanyak", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Jumlah Order", fontsize=12)
-    ax.set_ylabel("Kota", fontsize=12)
-    for bar, val in zip(bars, city_counts.values[::-1]):
-        ax.text(
-            val + 50,
-            bar.get_y() + bar.get_height() / 2,
-            f"{val:,}",
-            va="center",
-            fontsize=10,
+@st.cache_data
+def load_category_rollup():
+    """Rollup kategori produk dari pipeline, ``None`` jika belum dibangun"""
+    csv = snapshot.csv_path(DATA_DIR, CATEGORY_ROLLUP)
+    snap = snapshot.snapshot_path(DATA_DIR, CATEGORY_ROLLUP)
+    if not (os.path.exists(csv) or os.path.exists(snap)):
+        return None
+    with profiling.stage(f"prepare:{CATEGORY_ROLLUP}") as s:
+        rollup = snapshot.load_dataset(DATA_DIR, CATEGORY_ROLLUP)
+        s["rows_out"] = len(rollup)
+    return rollup
+
+
+@st.cache_data(max_entries=8)
+def load_order_rows(date_range):
+    """Baris ``orders_reviews`` pada ``date_range`` langsung dari dataset.
+
+    Pada dataset terpartisi hanya partisi bulan yang beririsan dengan rentang
+    yang dibaca, jadi biayanya mengikuti lebar rentang, bukan panjang histori.
+    """
+    with profiling.stage("load_order_rows") as s:
+        df = snapshot.load_dataset(DATA_DIR, "orders_reviews", date_range)
+        s["rows_out"] = len(df)
+    return df
+
+
+@st.cache_resource
+def get_figure_cache():
+    """Cache gambar chart, dipakai bersama oleh semua sesi"""
+    return figcache.new_cache()
+
+
+def show_chart(name, func, *args, deps=None, **kwargs):
+    """Tampilkan chart dari cache gambar, render hanya jika inputnya berubah.
+
+    Chart agregat yang punya spesifikasi di ``vegalite.SPECS`` digambar di
+    browser bila backend Vega-Lite dipilih; server hanya mengirim datanya.
+    """
+    rows = len(args[0]) if args and hasattr(args[0], "__len__") else None
+    with profiling.stage(f"chart:{name}", rows_in=rows):
+        if chart_backend == "vega" and name in vegalite.SPECS:
+            spec = vegalite.SPECS[name](*args, **kwargs)
+            with profiling.stage("st.vega_lite_chart") as s:
+                st.vega_lite_chart(spec, width="stretch")
+                if profiling.enabled():
+                    s["bytes"] = vegalite.payload_bytes(spec)
+            return
+        png = figcache.render(
+            get_figure_cache(), name, func, *args, deps=deps, **kwargs
         )
-    plt.tight_layout()
-    return fig
+        with profiling.stage("st.image") as s:
+            st.image(png, width="stretch")
+            s["bytes"] = len(png)
 
 
-def create_delivery_time_by_state(df, top_n=10):
-    """Waktu pengiriman per state"""
-    state_delivery = df.groupby("customer_state")["delivery_time"].agg(
-        ["mean", "count"]
-    )
-    state_delivery = state_delivery[state_delivery["count"] >= 100].sort_values(
-        "mean", ascending=True
-    )
+def record_time(name, seconds):
+    """Simpan durasi bagian ``name`` beserta nomor rerun ke session state"""
+    times = st.session_state.setdefault("section_times", {})
+    times[name] = (seconds, st.session_state["rerun"])
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-    colors = plt.cm.RdYlGn_r(
-        [i / len(state_delivery) for i in range(len(state_delivery))]
-    )
-    ax.barh(state_delivery.index, state_delivery["mean"], color=colors)
-    ax.axvline(
-        df["delivery_time"].mean(),
-        color="red",
-        linestyle="--",
-        label=f"Rata-rata nasional: {df['delivery_time'].mean():.1f} hari",
-    )
-    ax.set_title("Rata-rata Waktu Pengiriman per State", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Rata-rata Waktu Pengiriman (hari)", fontsize=12)
-    ax.set_ylabel("State", fontsize=12)
-    ax.legend()
-    plt.tight_layout()
-    return fig
-
-
-def create_score_heatmap(df):
-    """Heatmap skor dan waktu pengiriman"""
-    df_copy = df.copy()
-    df_copy["delivery_bin"] = pd.cut(
-        df_copy["delivery_time"],
-        bins=[0, 7, 14, 21, 30, float("inf")],
-        labels=["0-7", "8-14", "15-21", "22-30", ">30"],
-    )
-    heatmap_data = (
-        df_copy.groupby(["delivery_bin", "review_score"]).size().unstack(fill_value=0)
-    )
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(heatmap_data, annot=True, fmt="d", cmap="YlOrRd", ax=ax)
-    ax.set_title(
-        "Distribusi Skor Review berdasarkan Waktu Pengiriman",
-        fontsize=14,
-        fontweight="bold",
-    )
-    ax.set_xlabel("Skor Review", fontsize=12)
-    ax.set_ylabel("Waktu Pengiriman (hari)", fontsize=12)
-    plt.tight_layout()
-    return fig
+@contextmanager
+def timed(name):
+    """Ukur durasi blok ``name`` dengan ``record_time`` (dan profiling)"""
+    start = time.perf_counter()
+    try:
+        with profiling.stage(f"section:{name}"):
+            yield
+    finally:
+        record_time(name, time.perf_counter() - start)
 
 
 # Load data
-orders_reviews, geo_orders = load_data()
+with profiling.stage("load_data") as load_stage:
+    data = load_shared_data() if SHARED_DATA else None
+    shared_data = data is not None
+    (
+        orders_reviews,
+        geo_orders,
+        reviews_cube,
+        geo_cube,
+        geo_index,
+        distance_sketch,
+        data_memory,
+        data_version,
+    ) = (
+        data if shared_data else load_data()
+    )
+    load_stage["rows_out"] = len(orders_reviews) + len(geo_orders)
 
 # Sidebar filters
 st.sidebar.title("Filter Data")
 
+date_range = ()
 if "order_purchase_timestamp" in orders_reviews.columns:
-    min_date = orders_reviews["order_purchase_timestamp"].min().date()
-    max_date = orders_reviews["order_purchase_timestamp"].max().date()
+    min_date = reviews_cube["purchase_date"].min().date()
+    max_date = reviews_cube["purchase_date"].max().date()
     date_range = st.sidebar.date_input(
         "Rentang Tanggal",
         value=(min_date, max_date),
@@ -354,7 +243,7 @@ score_range = st.sidebar.slider(
     "Rentang Skor Review", min_value=1, max_value=5, value=(1, 5)
 )
 
-max_delivery_time = int(orders_reviews["delivery_time"].max())
+max_delivery_time = int(reviews_cube["delivery_time"].max())
 delivery_range = st.sidebar.slider(
     "Rentang Waktu Pengiriman (hari)",
     min_value=0,
@@ -365,41 +254,66 @@ delivery_range = st.sidebar.slider(
 status_options = ["Semua", "Tepat Waktu", "Terlambat"]
 selected_status = st.sidebar.selectbox("Status Pengiriman", status_options)
 
-all_states = sorted(geo_orders["customer_state"].unique())
+all_states = sorted(geo_cube["customer_state"].unique())
 selected_states = st.sidebar.multiselect(
     "Pilih State", options=all_states, default=all_states
 )
 
-# Apply filters
-filtered_reviews = orders_reviews.copy()
+chart_backend = CHART_BACKENDS[
+    st.sidebar.radio(
+        "Render Chart",
+        list(CHART_BACKENDS),
+        index=list(CHART_BACKENDS.values()).index(DEFAULT_CHART_BACKEND),
+        help="Vega-Lite: chart agregat digambar di browser dari data ringkas. "
+        "PNG: render matplotlib di server, untuk ekspor gambar statis.",
+    )
+]
 
-if "order_purchase_timestamp" in filtered_reviews.columns and len(date_range) == 2:
-    filtered_reviews = filtered_reviews[
-        (filtered_reviews["order_purchase_timestamp"].dt.date >= date_range[0])
-        & (filtered_reviews["order_purchase_timestamp"].dt.date <= date_range[1])
-    ]
+# Apply filters: posisi baris dari index, hanya kolom chart yang diambil
+status_filter = None if selected_status == "Semua" else selected_status
 
-filtered_reviews = filtered_reviews[
-    (filtered_reviews["review_score"] >= score_range[0])
-    & (filtered_reviews["review_score"] <= score_range[1])
-    & (filtered_reviews["delivery_time"] >= delivery_range[0])
-    & (filtered_reviews["delivery_time"] <= delivery_range[1])
-]
 
-if selected_status != "Semua":
-    filtered_reviews = filtered_reviews[
-        filtered_reviews["delivery_status"] == selected_status
-    ]
+def select_geo():
+    """Baris geo yang lolos filter, hanya kolom chart (saat dibutuhkan)"""
+    with profiling.stage("select_geo", rows_in=len(geo_orders)) as s:
+        rows = filters.select(
+            geo_index,
+            delivery_range=delivery_range,
+            status=status_filter,
+            states=selected_states,
+        )
+        s["rows_out"] = len(rows)
+        return filters.take(
+            geo_orders,
+            rows,
+            ["is_late", "geolocation_lat", "geolocation_lng", "geolocation_city"],
+        )
 
-filtered_geo = geo_orders[geo_orders["customer_state"].isin(selected_states)].copy()
 
-if selected_status != "Semua":
-    filtered_geo = filtered_geo[filtered_geo["delivery_status"] == selected_status]
+# Kunci cache untuk chart berbasis baris: versi data dan filter yang dipakai
+geo_state = (data_version, delivery_range, status_filter, sorted(selected_states))
 
-filtered_geo = filtered_geo[
-    (filtered_geo["delivery_time"] >= delivery_range[0])
-    & (filtered_geo["delivery_time"] <= delivery_range[1])
-]
+# Filter yang sama pada sel cube untuk metrik dan chart agregat
+filter_start = time.perf_counter()
+with profiling.stage("filter_cube", rows_in=len(reviews_cube) + len(geo_cube)) as s:
+    review_cells = cube.filter_cube(
+        reviews_cube,
+        date_range=date_range if len(date_range) == 2 else None,
+        score_range=score_range,
+        delivery_range=delivery_range,
+        status=status_filter,
+    )
+    geo_cells = cube.filter_cube(
+        geo_cube,
+        delivery_range=delivery_range,
+        status=status_filter,
+        states=selected_states,
+    )
+    s["rows_out"] = len(review_cells) + len(geo_cells)
+review_totals = cube.total(review_cells)
+geo_totals = cube.total(geo_cells)
+n_reviews = int(review_totals["count"])
+n_geo = int(geo_totals["count"])
 
 # Header
 st.title("Dashboard Analisis E-Commerce Brasil")
@@ -412,56 +326,51 @@ st.subheader("Metrik Utama")
 col1, col2, col3, col4, col5, col6 = st.columns(6)
 
 with col1:
-    st.metric("Total Order", f"{len(filtered_reviews):,}")
+    st.metric("Total Order", f"{n_reviews:,}")
 
 with col2:
-    avg_delivery = filtered_reviews["delivery_time"].mean()
+    avg_delivery = review_totals["delivery_sum"] / n_reviews if n_reviews else np.nan
     st.metric("Rata-rata Pengiriman", f"{avg_delivery:.1f} hari")
 
 with col3:
-    median_delivery = filtered_reviews["delivery_time"].median()
+    median_delivery = cube.delivery_median(review_cells) if n_reviews else np.nan
     st.metric("Median Pengiriman", f"{median_delivery:.1f} hari")
 
 with col4:
-    avg_score = filtered_reviews["review_score"].mean()
+    avg_score = review_totals["score_sum"] / n_reviews if n_reviews else np.nan
     st.metric("Rata-rata Skor", f"{avg_score:.2f}")
 
 with col5:
-    if len(filtered_reviews) > 1:
-        correlation = filtered_reviews["delivery_time"].corr(
-            filtered_reviews["review_score"]
-        )
+    if n_reviews > 1:
+        correlation = cube.correlation(review_cells)
         st.metric("Korelasi", f"{correlation:.3f}")
     else:
         st.metric("Korelasi", "N/A")
 
 with col6:
-    if len(filtered_reviews) > 0:
-        late_pct = (
-            (filtered_reviews["delivery_status"] == "Terlambat").sum()
-            / len(filtered_reviews)
-            * 100
-        )
+    if n_reviews > 0:
+        late_pct = review_totals["late_count"] / n_reviews * 100
         st.metric("Keterlambatan", f"{late_pct:.1f}%")
     else:
         st.metric("Keterlambatan", "N/A")
 
-# Tabs
-tab1, tab2, tab3, tab4 = st.tabs(
-    ["Ringkasan", "Analisis Pengiriman", "Analisis Geografis", "Analisis Tren"]
-)
+record_time("Filter dan metrik", time.perf_counter() - filter_start)
+
 
-with tab1:
+def show_summary():
+    """Tab ringkasan: distribusi skor, status, dan statistik deskriptif"""
     st.header("Ringkasan Analisis")
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Distribusi Skor Review")
-        if len(filtered_reviews) > 0:
-            fig_score = create_score_distribution(filtered_reviews)
-            st.pyplot(fig_score)
-            plt.close()
+        if n_reviews > 0:
+            show_chart(
+                "score_distribution",
+                charts.create_score_distribution,
+                views.score_counts(review_cells),
+            )
 
             st.markdown(
                 """
@@ -474,16 +383,14 @@ with tab1:
 
     with col2:
         st.subheader("Status Pengiriman")
-        if len(filtered_reviews) > 0:
-            fig_pie = create_delivery_status_pie(filtered_reviews)
-            st.pyplot(fig_pie)
-            plt.close()
-
-            ontime_pct = (
-                (filtered_reviews["delivery_status"] == "Tepat Waktu").sum()
-                / len(filtered_reviews)
-                * 100
+        if n_reviews > 0:
+            show_chart(
+                "delivery_status_pie",
+                charts.create_delivery_status_pie,
+                views.status_counts(review_cells),
             )
+
+            ontime_pct = (n_reviews - review_totals["late_count"]) / n_reviews * 100
             st.markdown(
                 f"""
             **Insight:**
@@ -498,27 +405,42 @@ with tab1:
 
     with col1:
         st.markdown("**Waktu Pengiriman (hari)**")
-        if len(filtered_reviews) > 0:
-            delivery_stats = filtered_reviews["delivery_time"].describe()
+        if n_reviews > 0:
+            delivery_stats = cube.describe(review_cells, "delivery_time")
             st.dataframe(delivery_stats.to_frame().T.round(2))
 
     with col2:
         st.markdown("**Skor Review**")
-        if len(filtered_reviews) > 0:
-            score_stats = filtered_reviews["review_score"].describe()
+        if n_reviews > 0:
+            score_stats = cube.describe(review_cells, "review_score")
             st.dataframe(score_stats.to_frame().T.round(2))
 
-with tab2:
-    st.header("Analisis Waktu Pengiriman")
+    st.subheader("Data Order")
+    if st.toggle("Tampilkan baris order pada rentang tanggal", key="order_rows"):
+        order_rows = load_order_rows(
+            tuple(date_range) if len(date_range) == 2 else None
+        )
+        st.caption(
+            f"{len(order_rows):,} baris pada rentang tanggal (filter lain tidak "
+            f"berlaku); ditampilkan {min(len(order_rows), ORDER_ROWS_SHOWN):,} "
+            "baris pertama."
+        )
+        st.dataframe(order_rows.head(ORDER_ROWS_SHOWN))
 
+
+def show_delivery():
+    """Tab analisis waktu pengiriman"""
+    st.header("Analisis Waktu Pengiriman")
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Distribusi Waktu Pengiriman")
-        if len(filtered_reviews) > 0:
-            fig_hist = create_delivery_histogram(filtered_reviews)
-            st.pyplot(fig_hist)
-            plt.close()
+        if n_reviews > 0:
+            show_chart(
+                "delivery_histogram",
+                charts.create_delivery_histogram,
+                views.delivery_counts(review_cells),
+            )
 
             st.markdown(
                 """
@@ -531,10 +453,12 @@ with tab2:
 
     with col2:
         st.subheader("Waktu Pengiriman vs Skor Review")
-        if len(filtered_reviews) > 0:
-            fig_box = create_delivery_boxplot(filtered_reviews)
-            st.pyplot(fig_box)
-            plt.close()
+        if n_reviews > 0:
+            show_chart(
+                "delivery_boxplot",
+                charts.create_delivery_boxplot,
+                views.delivery_boxes(review_cells),
+            )
 
             st.markdown(
                 """
@@ -546,16 +470,21 @@ with tab2:
             )
 
     st.subheader("Rata-rata Waktu Pengiriman per Skor")
-    if len(filtered_reviews) > 0:
-        fig_avg = create_avg_delivery_by_score(filtered_reviews)
-        st.pyplot(fig_avg)
-        plt.close()
+    if n_reviews > 0:
+        show_chart(
+            "avg_delivery_by_score",
+            charts.create_avg_delivery_by_score,
+            views.avg_delivery_by_score(review_cells),
+            review_totals["delivery_sum"] / n_reviews,
+        )
 
     st.subheader("Heatmap Skor dan Waktu Pengiriman")
-    if len(filtered_reviews) > 0:
-        fig_heatmap = create_score_heatmap(filtered_reviews)
-        st.pyplot(fig_heatmap)
-        plt.close()
+    if n_reviews > 0:
+        show_chart(
+            "score_heatmap",
+            charts.create_score_heatmap,
+            views.score_heatmap(review_cells),
+        )
 
         st.markdown(
             """
@@ -567,42 +496,23 @@ with tab2:
         )
 
     st.subheader("Detail per Skor Review")
-    if len(filtered_reviews) > 0:
-        score_detail = (
-            filtered_reviews.groupby("review_score")
-            .agg(
-                {
-                    "delivery_time": ["count", "mean", "median", "std", "min", "max"],
-                    "delivery_status": lambda x: (x == "Terlambat").sum(),
-                }
-            )
-            .round(2)
-        )
-        score_detail.columns = [
-            "Jumlah",
-            "Mean",
-            "Median",
-            "Std",
-            "Min",
-            "Max",
-            "Terlambat",
-        ]
-        score_detail["Persen Terlambat"] = (
-            score_detail["Terlambat"] / score_detail["Jumlah"] * 100
-        ).round(1)
-        st.dataframe(score_detail)
+    if n_reviews > 0:
+        st.dataframe(views.score_detail(review_cells))
+
 
-with tab3:
+def show_geography():
+    """Tab analisis geografis"""
     st.header("Analisis Geografis")
+    filtered_geo = select_geo()
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Peta Sebaran Pengiriman")
         if len(filtered_geo) > 0:
-            fig_geo = create_geo_scatter(filtered_geo)
-            st.pyplot(fig_geo)
-            plt.close()
+            show_chart(
+                "geo_scatter", charts.create_geo_scatter, filtered_geo, deps=geo_state
+            )
 
             st.markdown(
                 """
@@ -615,10 +525,12 @@ with tab3:
 
     with col2:
         st.subheader("Persentase Keterlambatan per State")
-        if len(filtered_geo) > 0:
-            fig_late_pct = create_late_percentage_by_state(filtered_geo)
-            st.pyplot(fig_late_pct)
-            plt.close()
+        if n_geo > 0:
+            show_chart(
+                "late_percentage_by_state",
+                charts.create_late_percentage_by_state,
+                views.late_percentage_by_state(geo_cells),
+            )
 
             st.markdown(
                 """
@@ -630,16 +542,21 @@ with tab3:
             )
 
     st.subheader("Distribusi per State")
-    if len(filtered_geo) > 0:
-        fig_state = create_state_barplot(filtered_geo)
-        st.pyplot(fig_state)
-        plt.close()
+    if n_geo > 0:
+        show_chart(
+            "state_barplot",
+            charts.create_state_barplot,
+            views.state_status_counts(geo_cells),
+        )
 
     st.subheader("Rata-rata Waktu Pengiriman per State")
-    if len(filtered_geo) > 0:
-        fig_state_delivery = create_delivery_time_by_state(filtered_geo)
-        st.pyplot(fig_state_delivery)
-        plt.close()
+    if n_geo > 0:
+        show_chart(
+            "delivery_time_by_state",
+            charts.create_delivery_time_by_state,
+            views.state_delivery(geo_cells),
+            geo_totals["delivery_sum"] / n_geo,
+        )
 
         st.markdown(
             """
@@ -650,48 +567,68 @@ with tab3:
         """
         )
 
+    if "distance_bin" in geo_cells.columns and (geo_cells["distance_bin"] >= 0).any():
+        st.subheader("Waktu Pengiriman vs Jarak Seller-Pelanggan")
+        distance_stats = cube.distance_summary(geo_cells)
+        show_chart(
+            "delivery_by_distance", charts.create_delivery_by_distance, distance_stats
+        )
+        st.dataframe(distance_stats.round(2))
+
+        if distance_sketch is not None:
+            st.markdown("**Statistik Jarak Seller-Pelanggan (km)**")
+            distance_parts = cube.filter_cube(
+                distance_sketch["keys"],
+                delivery_range=delivery_range,
+                status=status_filter,
+                states=selected_states,
+            )
+            distance_describe, distance_corr = sketch.describe(
+                distance_sketch, distance_parts.index
+            )
+            st.dataframe(distance_describe.to_frame().T.round(2))
+            st.caption(
+                f"Kuartil dari sketch KLL (galat rank ±"
+                f"{sketch.rank_error(distance_sketch['k']) * 100:.1f}%), statistik "
+                f"lain tepat. Korelasi jarak vs waktu pengiriman: {distance_corr:.3f}"
+            )
+
+        st.markdown(
+            """
+        **Insight:**
+        - Jarak dihitung dari seller terjauh dalam satu order ke lokasi pelanggan
+        - Bandingkan kenaikan waktu pengiriman dan keterlambatan antar kelas jarak
+        """
+        )
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Top Kota dengan Order Terbanyak")
         n_cities = st.slider("Jumlah kota", min_value=5, max_value=20, value=10)
         if len(filtered_geo) > 0:
-            fig_cities = create_top_cities(filtered_geo, n=n_cities)
-            st.pyplot(fig_cities)
-            plt.close()
+            show_chart(
+                "top_cities",
+                charts.create_top_cities,
+                filtered_geo,
+                n=n_cities,
+                deps=(geo_state, n_cities),
+            )
 
     with col2:
         st.subheader("Detail per State")
-        if len(filtered_geo) > 0:
-            state_detail = (
-                filtered_geo.groupby("customer_state")
-                .agg(
-                    {
-                        "order_id": "count",
-                        "delivery_time": "mean",
-                        "delivery_status": lambda x: (x == "Terlambat").sum(),
-                    }
-                )
-                .round(2)
-            )
-            state_detail.columns = ["Total Order", "Mean Delivery", "Total Terlambat"]
-            state_detail["Persen Terlambat"] = (
-                state_detail["Total Terlambat"] / state_detail["Total Order"] * 100
-            ).round(1)
-            state_detail = state_detail.sort_values("Total Order", ascending=False)
-            st.dataframe(state_detail, height=400)
-
-with tab4:
+        if n_geo > 0:
+            st.dataframe(views.state_detail(geo_cells), height=400)
+
+
+def show_trend():
+    """Tab analisis tren bulanan dan per hari"""
     st.header("Analisis Tren")
 
-    if (
-        "order_purchase_timestamp" in filtered_reviews.columns
-        and len(filtered_reviews) > 0
-    ):
+    if "purchase_date" in review_cells.columns and n_reviews > 0:
         st.subheader("Tren Bulanan")
-        fig_trend = create_monthly_trend(filtered_reviews)
-        st.pyplot(fig_trend)
-        plt.close()
+        monthly, monthly_stats, day_counts = views.trend(review_cells)
+        show_chart("monthly_trend", charts.create_monthly_trend, monthly.reset_index())
 
         st.markdown(
             """
@@ -703,57 +640,10 @@ with tab4:
         )
 
         st.subheader("Detail per Bulan")
-        monthly_df = filtered_reviews.copy()
-        monthly_df["month"] = (
-            monthly_df["order_purchase_timestamp"].dt.to_period("M").astype(str)
-        )
-        monthly_stats = (
-            monthly_df.groupby("month")
-            .agg(
-                {
-                    "order_id": "count",
-                    "delivery_time": "mean",
-                    "review_score": "mean",
-                    "delivery_status": lambda x: (x == "Terlambat").sum(),
-                }
-            )
-            .round(2)
-        )
-        monthly_stats.columns = [
-            "Total Order",
-            "Mean Delivery",
-            "Mean Score",
-            "Terlambat",
-        ]
-        monthly_stats["Persen Terlambat"] = (
-            monthly_stats["Terlambat"] / monthly_stats["Total Order"] * 100
-        ).round(1)
         st.dataframe(monthly_stats)
 
         st.subheader("Analisis per Hari dalam Seminggu")
-        daily_df = filtered_reviews.copy()
-        daily_df["day_name"] = daily_df["order_purchase_timestamp"].dt.day_name()
-        day_order = [
-            "Monday",
-            "Tuesday",
-            "Wednesday",
-            "Thursday",
-            "Friday",
-            "Saturday",
-            "Sunday",
-        ]
-
-        fig_day, ax = plt.subplots(figsize=(12, 5))
-        day_counts = daily_df["day_name"].value_counts().reindex(day_order)
-        colors = plt.cm.Blues([0.3 + i * 0.1 for i in range(7)])
-        ax.bar(day_counts.index, day_counts.values, color=colors)
-        ax.set_title("Distribusi Order per Hari", fontsize=14, fontweight="bold")
-        ax.set_xlabel("Hari", fontsize=12)
-        ax.set_ylabel("Jumlah Order", fontsize=12)
-        ax.tick_params(axis="x", rotation=45)
-        plt.tight_layout()
-        st.pyplot(fig_day)
-        plt.close()
+        show_chart("day_distribution", charts.create_day_distribution, day_counts)
 
         st.markdown(
             """
@@ -766,6 +656,67 @@ with tab4:
     else:
         st.warning("Data timestamp tidak tersedia untuk analisis tren")
 
+
+def show_category():
+    """Tab analisis per kategori produk (dari rollup bulanan pipeline)"""
+    st.header("Analisis Kategori Produk")
+    rollup = load_category_rollup()
+    if rollup is None or rollup.empty:
+        st.info(
+            "Rollup kategori belum tersedia. Jalankan `python -m pipeline` untuk "
+            "membangun `category_rollup` dari data produk dan order."
+        )
+        return
+
+    with profiling.stage("category_summary", rows_in=len(rollup)) as s:
+        detail = views.category_summary(
+            rollup, date_range if len(date_range) == 2 else None
+        )
+        s["rows_out"] = len(detail)
+    st.caption(
+        "Dihitung dari rollup per kategori dan bulan; hanya filter rentang "
+        "tanggal (per bulan) yang berlaku. Order dengan beberapa kategori "
+        "dihitung sekali di setiap kategorinya."
+    )
+    if detail.empty:
+        st.warning("Tidak ada order pada rentang tanggal yang dipilih")
+        return
+
+    show_chart(
+        "late_percentage_by_category",
+        charts.create_late_percentage_by_category,
+        detail,
+    )
+
+    st.markdown(
+        """
+    **Insight:**
+    - Kategori di atas persentase keseluruhan perlu evaluasi seller dan logistik
+    - Bandingkan rata-rata skor review dengan waktu pengiriman per kategori
+    - Kategori dengan volume besar paling berpengaruh ke kepuasan keseluruhan
+    """
+    )
+
+    st.subheader("Detail per Kategori")
+    st.dataframe(detail, height=400)
+
+
+# Tabs: dengan on_change="rerun" hanya tab yang sedang dibuka yang dijalankan.
+# Tab lain dihitung saat dibuka; chart-nya tersimpan di cache gambar.
+SECTIONS = {
+    "Ringkasan": show_summary,
+    "Analisis Pengiriman": show_delivery,
+    "Analisis Geografis": show_geography,
+    "Analisis Tren": show_trend,
+    "Analisis Kategori": show_category,
+}
+tabs = st.tabs(list(SECTIONS), key="section", on_change="rerun")
+for tab, (name, show_section) in zip(tabs, SECTIONS.items()):
+    with tab:
+        if tab.open:
+            with timed(name):
+                show_section()
+
 # Kesimpulan
 st.markdown("---")
 st.header("Kesimpulan dan Rekomendasi")
@@ -806,6 +757,43 @@ with col2:
     """
     )
 
+# Statistik cache chart setelah semua chart pada rerun ini ditampilkan
+cache_stats = figcache.stats(get_figure_cache())
+st.sidebar.caption(
+    f"Cache chart: {cache_stats['hits']} hit, {cache_stats['misses']} miss, "
+    f"{cache_stats['entries']} gambar ({cache_stats['bytes'] / 2**20:.1f} MB)"
+)
+st.sidebar.caption(
+    f"Memori data: {data_memory['Sesudah (MB)']:.1f} MB "
+    f"(tanpa skema {data_memory['Sebelum (MB)']:.1f} MB)"
+    + (", dibagi antar sesi" if shared_data else "")
+)
+
+# Waktu per bagian: bagian yang tidak dibuka menampilkan hasil terakhirnya
+with st.sidebar.expander("Waktu per Bagian"):
+    section_times = pd.DataFrame(
+        [
+            {
+                "Bagian": name,
+                "Detik": round(seconds, 3),
+                "Dihitung": (
+                    "rerun ini" if rerun == st.session_state["rerun"] else "sebelumnya"
+                ),
+            }
+            for name, (seconds, rerun) in st.session_state["section_times"].items()
+        ]
+    )
+    st.dataframe(section_times.set_index("Bagian"))
+
+# Panel profiling (opsional): stage rerun ini, juga ditulis ke log JSON lines
+profile = profiling.finish_run(PROFILE_LOG)
+if profile is not None:
+    with st.sidebar.expander("Profiling", expanded=True):
+        st.caption(f"Rerun {profile['seconds'] * 1000:.0f} ms, log: {PROFILE_LOG}")
+        st.dataframe(
+            profiling.stages_frame(profile).round(2), hide_index=True, height=400
+        )
+
 # Footer
 st.markdown("---")
 st.caption("Dashboard Analisis E-Commerce Brasil - Irsan Indra Kusuma")
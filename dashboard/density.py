@@ -0,0 +1,131 @@
+"""Histogram, KDE, dan boxplot waktu pengiriman dari jumlah order per hari.
+
+``delivery_time`` adalah hari bulat (``.dt.days`` di notebook), jadi jumlah
+order per hari (``views.delivery_counts`` dari sel cube) memuat seluruh
+distribusinya. Histogram, KDE, mean, dan median dihitung dari jumlah itu,
+sehingga biayanya bergantung pada rentang hari, bukan jumlah order.
+
+KDE Gaussian memakai bandwidth Scott seperti ``sns.histplot(kde=True)`` dan
+dievaluasi pada grid dengan jarak ``1/step`` hari di antara hari terkecil dan
+terbesar. Setiap hari bulat jatuh tepat pada titik grid, jadi KDE adalah
+konvolusi jumlah per titik grid dengan kernel yang disampel pada grid yang
+sama. Konvolusi dihitung dengan FFT (``np.fft.rfft``); hasilnya sama dengan
+menjumlahkan kernel setiap order.
+
+Statistik boxplot (``box_stats``) mengikuti ``matplotlib.cbook.boxplot_stats``
+(kuartil interpolasi linear, whisker 1.5 IQR) dan langsung bisa digambar
+dengan ``Axes.bxp``. Outlier bernilai hari bulat, jadi cukup satu titik per
+hari berbeda; jumlahnya dibatasi ``MAX_FLIERS`` dengan sampel merata yang
+selalu memuat nilai terkecil dan terbesar.
+"""
+
+import numpy as np
+
+import cube
+
+# Jumlah titik grid KDE minimum, sama dengan ``gridsize`` default seaborn
+GRIDSIZE = 200
+# Batas titik outlier (hari berbeda) per box
+MAX_FLIERS = 200
+
+
+def _days(counts):
+    """(hari, jumlah) sebagai array; hari dengan jumlah nol dibuang"""
+    days = counts.index.to_numpy(dtype=np.int64)
+    weights = counts.to_numpy(dtype=np.float64)
+    keep = weights > 0
+    return days[keep], weights[keep]
+
+
+def histogram(counts, bins=30):
+    """(tinggi, tepi) histogram ``bins`` kelas selebar rentang hari"""
+    days, weights = _days(counts)
+    return np.histogram(
+        days, bins=bins, range=(days.min(), days.max()), weights=weights
+    )
+
+
+def summary(counts):
+    """Jumlah order, mean, dan median dari jumlah per hari"""
+    days, weights = _days(counts)
+    n = weights.sum()
+    return {
+        "n": int(n),
+        "mean": float((days * weights).sum() / n),
+        "median": float(cube.weighted_quantiles(days, weights, [0.5])[0]),
+    }
+
+
+def bandwidth(counts):
+    """Bandwidth Gaussian aturan Scott: ``std * n^(-1/5)`` (std dengan ddof=1)"""
+    days, weights = _days(counts)
+    n = weights.sum()
+    if n < 2:
+        return 0.0
+    mean = (days * weights).sum() / n
+    var = (weights * (days - mean) ** 2).sum() / (n - 1)
+    return float(np.sqrt(var) * n ** (-1 / 5))
+
+
+def kde(counts, gridsize=GRIDSIZE, bw_adjust=1.0):
+    """(grid, densitas) KDE Gaussian, atau ``None`` jika tidak terdefinisi.
+
+    Densitas ternormalisasi (integral 1); kalikan dengan jumlah order dan
+    lebar kelas histogram untuk skala "Jumlah Order".
+    """
+    days, weights = _days(counts)
+    bw = bandwidth(counts) * bw_adjust
+    if bw <= 0:
+        return None
+    lo, span = days.min(), int(days.max() - days.min())
+    step = -(-(gridsize - 1) // span)
+    size = span * step + 1
+    grid = lo + np.arange(size) / step
+
+    mass = np.zeros(size)
+    np.add.at(mass, (days - lo) * step, weights)
+    # Kernel untuk semua selisih titik grid, jadi konvolusi tidak terpotong
+    offsets = np.arange(-(size - 1), size) / step
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    nfft = 1 << int(np.ceil(np.log2(3 * size - 2)))
+    full = np.fft.irfft(np.fft.rfft(mass, nfft) * np.fft.rfft(kernel, nfft), nfft)
+    density = np.maximum(full[size - 1 : 2 * size - 1], 0) / weights.sum()
+    return grid, density
+
+
+def _sample(values, limit):
+    """Paling banyak ``limit`` nilai terurut, diambil merata termasuk ujungnya"""
+    if len(values) <= limit:
+        return values
+    return values[np.unique(np.linspace(0, len(values) - 1, limit).round().astype(int))]
+
+
+def box_stats(counts, whis=1.5, max_fliers=MAX_FLIERS, label=None):
+    """Statistik satu box (format ``cbook.boxplot_stats``) dari jumlah per hari"""
+    days, weights = _days(counts)
+    order = np.argsort(days)
+    days, weights = days[order].astype(np.float64), weights[order]
+    n = weights.sum()
+    q1, med, q3 = cube.weighted_quantiles(days, weights, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    # Whisker: nilai data terjauh yang masih di dalam whis * IQR dari kotak
+    low = days[days >= q1 - whis * iqr]
+    high = days[days <= q3 + whis * iqr]
+    whislo = min(low.min(), q1) if len(low) else q1
+    whishi = max(high.max(), q3) if len(high) else q3
+    fliers = days[(days < whislo) | (days > whishi)]
+    notch = 1.57 * iqr / np.sqrt(n)
+    return {
+        "label": label,
+        "mean": float((days * weights).sum() / n),
+        "iqr": float(iqr),
+        "q1": float(q1),
+        "med": float(med),
+        "q3": float(q3),
+        "cilo": float(med - notch),
+        "cihi": float(med + notch),
+        "whislo": float(whislo),
+        "whishi": float(whishi),
+        "fliers": _sample(fliers, max_fliers),
+        "n": int(n),
+    }
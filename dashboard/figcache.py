@@ -0,0 +1,133 @@
+"""Cache gambar chart matplotlib yang sudah dirender.
+
+Gambar disimpan sebagai bytes PNG/SVG dengan kunci nama chart, format, dan
+hash dari input yang memengaruhi chart tersebut saja. Jika kuncinya sama
+dengan rerun sebelumnya, bytes dikirim langsung tanpa menyentuh matplotlib.
+Ukuran cache dibatasi dalam byte dengan eviksi LRU, dan jumlah hit/miss
+dicatat untuk dipantau. Saat profiling aktif, pembuatan figure dan
+``savefig`` pada cache miss dicatat sebagai stage terpisah.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import profiling
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+# Sama dengan opsi default st.pyplot agar tampilan chart tidak berubah
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+
+def new_cache(max_bytes=DEFAULT_MAX_BYTES):
+    """Cache kosong; aman dipakai bersama oleh beberapa sesi"""
+    return {
+        "entries": OrderedDict(),
+        "bytes": 0,
+        "max_bytes": max_bytes,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "lock": threading.Lock(),
+    }
+
+
+def _update(h, value):
+    """Masukkan satu nilai input ke hash"""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(repr((type(value).__name__, value.shape)).encode())
+        if isinstance(value, pd.DataFrame):
+            h.update(repr(list(value.columns)).encode())
+        else:
+            h.update(repr(value.name).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(repr((type(value).__name__, len(value))).encode())
+        for item in value:
+            _update(h, item)
+    elif isinstance(value, dict):
+        _update(h, list(value.items()))
+    else:
+        h.update(repr(value).encode())
+
+
+def fingerprint(*inputs):
+    """Hash stabil dari input chart (DataFrame, Series, array, atau nilai biasa)"""
+    h = hashlib.blake2b(digest_size=16)
+    for value in inputs:
+        _update(h, value)
+    return h.hexdigest()
+
+
+def figure_bytes(fig, fmt="png"):
+    """Render figure matplotlib menjadi bytes lalu tutup figure-nya"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def render(cache, name, func, *args, deps=None, fmt="png", **kwargs):
+    """Bytes gambar ``func(*args, **kwargs)``, dari cache jika inputnya sama.
+
+    ``deps`` adalah input yang menentukan isi chart; default-nya ``args`` dan
+    ``kwargs``. Isi ``deps`` dengan state filter jika ``args`` besar.
+    """
+    if deps is None:
+        deps = (args, kwargs)
+    key = (name, fmt, fingerprint(deps))
+
+    with cache["lock"]:
+        data = cache["entries"].get(key)
+        if data is not None:
+            cache["entries"].move_to_end(key)
+            cache["hits"] += 1
+            return data
+        cache["misses"] += 1
+
+    with profiling.stage(getattr(func, "__name__", name)):
+        fig = func(*args, **kwargs)
+    with profiling.stage("savefig") as s:
+        data = figure_bytes(fig, fmt)
+        s["bytes"] = len(data)
+
+    with cache["lock"]:
+        if key not in cache["entries"]:
+            cache["entries"][key] = data
+            cache["bytes"] += len(data)
+        while cache["bytes"] > cache["max_bytes"] and len(cache["entries"]) > 1:
+            _, old = cache["entries"].popitem(last=False)
+            cache["bytes"] -= len(old)
+            cache["evictions"] += 1
+    return data
+
+
+def stats(cache):
+    """Ringkasan jumlah hit, miss, eviksi, dan ukuran cache"""
+    with cache["lock"]:
+        requests = cache["hits"] + cache["misses"]
+        return {
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "evictions": cache["evictions"],
+            "entries": len(cache["entries"]),
+            "bytes": cache["bytes"],
+            "hit_rate": cache["hits"] / requests if requests else 0.0,
+        }
+
+
+def clear(cache):
+    """Kosongkan cache dan reset penghitung"""
+    with cache["lock"]:
+        cache["entries"].clear()
+        cache["bytes"] = 0
+        cache["hits"] = cache["misses"] = cache["evictions"] = 0
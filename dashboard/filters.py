@@ -0,0 +1,144 @@
+"""Index filter untuk predikat sidebar dashboard.
+
+Index dibangun sekali per dataset yang dimuat. Kolom rentang (tanggal
+pembelian, ``delivery_time``) memakai sorted index: nilai terurut beserta
+posisi barisnya, sehingga filter rentang cukup dua ``searchsorted``. Kolom
+dengan sedikit nilai unik (``review_score``, ``is_late`` untuk status
+pengiriman, ``customer_state``) memakai bitmap index: satu bitmap
+ter-``packbits`` per nilai. Setiap predikat menghasilkan bitmap baris, lalu
+semua predikat digabung dengan AND bitwise.
+
+Hasil ``select`` adalah posisi baris terurut; DataFrame asli tidak disalin.
+Gunakan ``take`` untuk mengambil hanya kolom yang dibutuhkan chart.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cube import LATE_STATUS
+
+# Nama predikat -> (kolom sumber, jenis index)
+REVIEW_INDEX = {
+    "purchase_date": ("order_purchase_timestamp", "sorted"),
+    "review_score": ("review_score", "bitmap"),
+    "delivery_time": ("delivery_time", "sorted"),
+    "delivery_status": ("is_late", "bitmap"),
+}
+GEO_INDEX = {
+    "customer_state": ("customer_state", "bitmap"),
+    "delivery_time": ("delivery_time", "sorted"),
+    "delivery_status": ("is_late", "bitmap"),
+}
+
+
+def _sort_keys(series):
+    """Nilai kolom sebagai array numerik yang bisa diurutkan"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.as_unit("ns").to_numpy().view("i8")
+    return series.to_numpy()
+
+
+def build_sorted(series):
+    """Sorted index: (nilai terurut, posisi baris)"""
+    keys = _sort_keys(series)
+    order = np.argsort(keys, kind="stable").astype(np.int64)
+    return {"kind": "sorted", "keys": keys[order], "order": order}
+
+
+def build_bitmap(series):
+    """Bitmap index: satu bitmap ter-packbits per nilai unik"""
+    codes, uniques = pd.factorize(series, sort=True)
+    bitmaps = {
+        value: np.packbits(codes == i) for i, value in enumerate(uniques.tolist())
+    }
+    return {"kind": "bitmap", "bitmaps": bitmaps}
+
+
+def build_index(df, spec):
+    """Bangun semua index dalam ``spec`` untuk ``df``"""
+    index = {"rows": len(df), "columns": {}}
+    for name, (column, kind) in spec.items():
+        if column not in df.columns:
+            continue
+        build = build_sorted if kind == "sorted" else build_bitmap
+        index["columns"][name] = build(df[column])
+    return index
+
+
+def _range_bits(entry, n, lo, hi, closed=True):
+    """Bitmap baris dengan ``lo <= nilai <= hi`` (atau ``< hi``)"""
+    keys = entry["keys"]
+    start = np.searchsorted(keys, lo, side="left")
+    stop = np.searchsorted(keys, hi, side="right" if closed else "left")
+    if start == 0 and stop == len(keys):
+        return None
+    mask = np.zeros(n, dtype=bool)
+    mask[entry["order"][start:stop]] = True
+    return np.packbits(mask)
+
+
+def _values_bits(entry, n, values):
+    """Bitmap baris yang nilainya ada di ``values`` (OR antar bitmap)"""
+    bitmaps = entry["bitmaps"]
+    if set(bitmaps) <= set(values):
+        return None
+    bits = np.zeros((n + 7) // 8, dtype=np.uint8)
+    for value in values:
+        if value in bitmaps:
+            np.bitwise_or(bits, bitmaps[value], out=bits)
+    return bits
+
+
+def select(
+    index,
+    date_range=None,
+    score_range=None,
+    delivery_range=None,
+    status=None,
+    states=None,
+):
+    """Posisi baris yang lolos filter sidebar (predikat tanpa index diabaikan)"""
+    n = index["rows"]
+    columns = index["columns"]
+    parts = []
+    if date_range is not None and "purchase_date" in columns:
+        start = pd.Timestamp(date_range[0]).as_unit("ns")
+        end = pd.Timestamp(date_range[1]).as_unit("ns") + pd.Timedelta(days=1)
+        parts.append(
+            _range_bits(
+                columns["purchase_date"], n, start.value, end.value, closed=False
+            )
+        )
+    if score_range is not None and "review_score" in columns:
+        bitmaps = columns["review_score"]["bitmaps"]
+        values = [v for v in bitmaps if score_range[0] <= v <= score_range[1]]
+        parts.append(_values_bits(columns["review_score"], n, values))
+    if delivery_range is not None and "delivery_time" in columns:
+        parts.append(_range_bits(columns["delivery_time"], n, *delivery_range))
+    if status is not None and "delivery_status" in columns:
+        late = status == LATE_STATUS
+        parts.append(_values_bits(columns["delivery_status"], n, [late]))
+    if states is not None and "customer_state" in columns:
+        parts.append(_values_bits(columns["customer_state"], n, states))
+
+    # Bitmap dari _range_bits/_values_bits selalu baru, aman diubah in-place
+    bits = None
+    for part in parts:
+        if part is None:
+            continue
+        if bits is None:
+            bits = part
+        else:
+            np.bitwise_and(bits, part, out=bits)
+    if bits is None:
+        return np.arange(n)
+    return np.flatnonzero(np.unpackbits(bits, count=n))
+
+
+def take(df, rows, columns=None):
+    """Ambil baris ``rows`` hanya untuk ``columns`` (default semua kolom)"""
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    if len(rows) == len(df):
+        return df
+    return df.take(rows)
@@ -0,0 +1,203 @@
+"""Instrumentasi rerun dashboard: durasi, puncak memori, dan jumlah baris.
+
+Satu rerun adalah satu *run* berisi daftar *stage* bernama (``load_data``,
+filter, setiap tab, setiap chart beserta fungsi ``create_*`` dan
+``savefig``-nya). Stage bisa bersarang; setiap stage mencatat durasi, puncak
+memori yang dialokasikan selama stage (``tracemalloc``), serta jumlah baris
+masuk/keluar bila diisi pemanggil::
+
+    with profiling.stage("filter", rows_in=len(df)) as s:
+        out = ...
+        s["rows_out"] = len(out)
+
+Run aktif disimpan per thread (satu thread per rerun Streamlit). Tanpa run
+aktif ``stage`` hanya mengembalikan objek no-op yang sama, jadi biayanya
+dapat diabaikan saat profiling mati. ``tracemalloc`` dinyalakan oleh run
+pertama dan dimatikan lagi saat run aktif terakhir selesai. Puncak memori
+``tracemalloc`` berlaku untuk seluruh proses, jadi run yang pernah berjalan
+bersamaan dengan run lain (sesi lain yang juga diprofil) tidak mencatat
+memori: ``peak_mb`` stage-nya ``None`` sejak saat itu.
+
+Setiap run yang selesai ditambahkan sebagai satu baris JSON ke log. Ringkasan
+per stage dari log:
+
+    python dashboard/profiling.py dashboard/_profile/runs.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+
+import pandas as pd
+
+_log_lock = threading.Lock()
+# Run aktif per thread; thread yang sudah mati dibuang saat start/finish
+_runs = {}
+_runs_lock = threading.Lock()
+# True jika tracemalloc dinyalakan oleh modul ini (boleh dimatikan lagi)
+_owns_tracing = False
+
+
+# Dipakai bersama saat profiling mati; dict-nya boleh diisi dan diabaikan
+_NOOP = contextlib.nullcontext({})
+
+
+@contextlib.contextmanager
+def _stage(run, record):
+    """Catat satu stage pada ``run``"""
+    record["depth"] = len(run["stack"])
+    run["stages"].append(record)
+    current = 0
+    if not run["shared"]:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    run["stack"].append([current, 0])
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        start_mem, child_peak = run["stack"].pop()
+        if run["shared"]:
+            record["peak_mb"] = None
+        else:
+            peak = max(tracemalloc.get_traced_memory()[1], child_peak)
+            record["peak_mb"] = max(peak - start_mem, 0) / 2**20
+            if run["stack"]:
+                # reset_peak di stage anak menghapus puncak milik stage induk
+                run["stack"][-1][1] = max(run["stack"][-1][1], peak)
+
+
+def _prune_runs():
+    """Buang run milik thread yang sudah mati (rerun yang gagal di tengah)"""
+    for thread in [t for t in _runs if not t.is_alive()]:
+        del _runs[thread]
+
+
+def _pop_run():
+    """Lepas run thread ini; matikan ``tracemalloc`` jika tidak ada run lagi"""
+    global _owns_tracing
+    with _runs_lock:
+        run = _runs.pop(threading.current_thread(), None)
+        _prune_runs()
+        if not _runs and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+    return run
+
+
+def enabled():
+    """True jika ada run aktif di thread ini"""
+    return threading.current_thread() in _runs
+
+
+def start_run(**fields):
+    """Mulai run baru di thread ini (menyalakan ``tracemalloc`` bila perlu)"""
+    global _owns_tracing
+    run = {
+        "run_id": uuid.uuid4().hex,
+        "started": time.time(),
+        **fields,
+        "stages": [],
+        "stack": [],
+        "shared": False,
+        "start": time.perf_counter(),
+    }
+    with _runs_lock:
+        _runs.pop(threading.current_thread(), None)
+        _prune_runs()
+        if _runs:
+            # reset_peak bersifat global: run yang tumpang tindih saling merusak
+            run["shared"] = True
+            for other in _runs.values():
+                other["shared"] = True
+        _runs[threading.current_thread()] = run
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_tracing = True
+    return run
+
+
+def cancel_run():
+    """Buang run aktif di thread ini tanpa menulis log"""
+    _pop_run()
+
+
+def stage(name, **fields):
+    """Context manager yang mencatat stage ``name`` pada run aktif"""
+    run = _runs.get(threading.current_thread())
+    if run is None:
+        return _NOOP
+    return _stage(run, {"name": name, **fields})
+
+
+def finish_run(log_path=None):
+    """Tutup run aktif, tambahkan ke ``log_path`` (JSON lines), lalu kembalikan"""
+    run = _pop_run()
+    if run is None:
+        return None
+    run["seconds"] = time.perf_counter() - run.pop("start")
+    run.pop("stack")
+    if log_path:
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        line = json.dumps(run, default=str)
+        with _log_lock, open(log_path, "a") as f:
+            f.write(line + "\n")
+    return run
+
+
+def stages_frame(run):
+    """Stage sebuah run sebagai DataFrame (nama diindentasi sesuai kedalaman)"""
+    rows = [
+        {
+            "Stage": "  " * s["depth"] + s["name"],
+            "ms": s["seconds"] * 1000,
+            "Puncak MB": s["peak_mb"],
+            "Baris masuk": s.get("rows_in"),
+            "Baris keluar": s.get("rows_out"),
+        }
+        for s in run["stages"]
+    ]
+    return pd.DataFrame(
+        rows, columns=["Stage", "ms", "Puncak MB", "Baris masuk", "Baris keluar"]
+    )
+
+
+def read_log(path):
+    """Semua stage dari log JSON lines sebagai satu DataFrame"""
+    rows = []
+    with open(path) as f:
+        for line in f:
+            run = json.loads(line)
+            for s in run["stages"]:
+                rows.append({"run_id": run["run_id"], **s})
+    return pd.DataFrame(rows)
+
+
+def summarize(path):
+    """Jumlah, rata-rata, p50, p95 durasi (ms) dan puncak memori per stage"""
+    stages = read_log(path)
+    stages["ms"] = stages["seconds"] * 1000
+    grouped = stages.groupby("name", sort=False)
+    summary = pd.DataFrame(
+        {
+            "n": grouped.size(),
+            "mean ms": grouped["ms"].mean(),
+            "p50 ms": grouped["ms"].median(),
+            "p95 ms": grouped["ms"].quantile(0.95),
+            "max puncak MB": grouped["peak_mb"].max(),
+        }
+    )
+    return summary.sort_values("mean ms", ascending=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ringkasan log profiling dashboard")
+    parser.add_argument("log")
+    args = parser.parse_args()
+    print(summarize(args.log).round(2).to_string())
@@ -0,0 +1,58 @@
+"""Raster kepadatan untuk peta sebaran pengiriman.
+
+Koordinat order dibinning ke grid tetap di atas wilayah Brasil. Setiap sel
+berisi jumlah order tepat waktu, jumlah order terlambat, dan rasio
+keterlambatan, dihitung dengan ``np.bincount``. Hasilnya digambar sebagai
+satu gambar (``imshow``), jadi waktu render tidak bergantung pada jumlah
+order, hanya binning-nya yang linear.
+"""
+
+import numpy as np
+from matplotlib import colormaps
+
+# (lng_min, lng_max, lat_min, lat_max), sama dengan batas sumbu peta
+GEO_EXTENT = (-74, -34, -34, 6)
+GRID_SHAPE = (400, 400)
+
+# Di atas jumlah baris ini create_geo_scatter memakai mode raster
+RASTER_THRESHOLD = 50_000
+
+
+def bin_geo(lat, lng, late, shape=GRID_SHAPE, extent=GEO_EXTENT):
+    """Jumlah order tepat waktu/terlambat dan rasio terlambat per sel grid.
+
+    Baris 0 grid adalah latitude terkecil (pakai ``origin="lower"``).
+    Koordinat di luar ``extent`` diabaikan.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    late = np.asarray(late, dtype=bool)
+    ny, nx = shape
+    x0, x1, y0, y1 = extent
+
+    ix = np.floor((lng - x0) * (nx / (x1 - x0)))
+    iy = np.floor((lat - y0) * (ny / (y1 - y0)))
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    cell = iy[inside].astype(np.int64) * nx + ix[inside].astype(np.int64)
+
+    total = np.bincount(cell, minlength=ny * nx)
+    late_count = np.bincount(cell[late[inside]], minlength=ny * nx)
+    ontime = total - late_count
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(total > 0, late_count / total, np.nan)
+    return {
+        "ontime": ontime.reshape(shape),
+        "late": late_count.reshape(shape),
+        "ratio": ratio.reshape(shape),
+    }
+
+
+def density_rgba(grid, cmap="RdYlGn_r"):
+    """Gambar RGBA: warna dari rasio terlambat, opasitas dari log kepadatan"""
+    total = grid["ontime"] + grid["late"]
+    rgba = colormaps[cmap](np.nan_to_num(grid["ratio"]))
+    density = np.log1p(total)
+    peak = density.max()
+    alpha = 0.25 + 0.75 * density / peak if peak > 0 else np.zeros_like(density)
+    rgba[..., 3] = np.where(total > 0, alpha, 0.0)
+    return rgba
@@ -0,0 +1,120 @@
+"""Skema dtype ringkas untuk dataset dashboard.
+
+CSV hasil notebook dimuat pandas sebagai string object dan int64/float64.
+Skema di sini menentukan tipe yang lebih hemat untuk setiap kolom:
+
+- ``category``: kolom dengan sedikit nilai unik (state, kota, status order),
+  disimpan sebagai kode integer kecil sehingga ``isin`` dan groupby cepat
+- ``string``: id hex (``order_id``, ``customer_id``) sebagai string Arrow
+- ``int8``/``int16``/``int32``/``float32``: kolom numerik yang dipersempit
+- ``late_flag``: ``delivery_status`` diganti kolom boolean ``is_late``
+
+Kolom yang tidak ada di skema dibiarkan apa adanya. Laporan memori sebelum
+dan sesudah skema (``--csv`` untuk membandingkan dengan CSV mentah):
+
+    python dashboard/schema.py --csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from cube import LATE_STATUS
+from snapshot import BASE_DIR, DATASETS, csv_path, load_dataset, read_csv_dataset
+
+SCHEMAS = {
+    "orders_reviews": {
+        "order_id": "string",
+        "customer_id": "string",
+        "order_status": "category",
+        "delivery_time": "int16",
+        "delivery_diff": "int16",
+        "delivery_status": "late_flag",
+        "review_score": "int8",
+    },
+    "geo_orders": {
+        "order_id": "string",
+        "customer_id": "string",
+        "delivery_time": "int16",
+        "delivery_status": "late_flag",
+        "customer_zip_code_prefix": "int32",
+        "customer_state": "category",
+        "geolocation_zip_code_prefix": "float32",
+        "geolocation_lat": "float32",
+        "geolocation_lng": "float32",
+        "geolocation_city": "category",
+        "geolocation_state": "category",
+        "seller_customer_km_max": "float32",
+        "seller_customer_km_mean": "float32",
+    },
+}
+
+
+def _convert(series, kind):
+    """Satu kolom dalam tipe ``kind`` (tanpa salinan jika sudah sesuai)"""
+    if kind == "category":
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        return series.astype("category")
+    if kind == "string":
+        return series.astype(pd.StringDtype("pyarrow"))
+    if series.dtype == kind:
+        return series
+    if kind.startswith("int") and series.isna().any():
+        # Integer tidak punya NaN: pakai float32 agar nilai kosong tetap ada
+        return series.astype(np.float32)
+    return series.astype(kind)
+
+
+def apply_schema(df, name):
+    """Salinan ringkas ``df`` sesuai ``SCHEMAS[name]``"""
+    schema = SCHEMAS[name]
+    data = {}
+    for col in df.columns:
+        kind = schema.get(col)
+        if kind is None:
+            data[col] = df[col]
+        elif kind == "late_flag":
+            data["is_late"] = (df[col] == LATE_STATUS).to_numpy(dtype=bool)
+        else:
+            data[col] = _convert(df[col], kind)
+    return pd.DataFrame(data, copy=False)
+
+
+def memory_report(before, after):
+    """Memori per kolom (MB) sebelum dan sesudah skema, plus baris Total"""
+    columns = before.columns.union(after.columns, sort=False)
+    report = pd.DataFrame(
+        {
+            "Sebelum (MB)": before.memory_usage(deep=True, index=False),
+            "Sesudah (MB)": after.memory_usage(deep=True, index=False),
+        }
+    )
+    report = report.reindex(columns).fillna(0) / 1e6
+    report.loc["Total"] = report.sum()
+    return report
+
+
+def load_compact(base_dir, name):
+    """Muat dataset lalu terapkan skema; kembalikan (DataFrame, laporan memori)"""
+    raw = load_dataset(base_dir, name)
+    compact = apply_schema(raw, name)
+    return compact, memory_report(raw, compact)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Laporan memori skema dataset")
+    parser.add_argument("--base-dir", default=BASE_DIR)
+    parser.add_argument(
+        "--csv", action="store_true", help="bandingkan dengan CSV, bukan snapshot"
+    )
+    args = parser.parse_args()
+    for name in DATASETS:
+        if args.csv:
+            raw = read_csv_dataset(csv_path(args.base_dir, name))
+            report = memory_report(raw, apply_schema(raw, name))
+        else:
+            _, report = load_compact(args.base_dir, name)
+        print(f"\n{name}")
+        print(report.round(3).to_string())
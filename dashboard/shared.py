@@ -0,0 +1,126 @@
+"""Dataset dashboard bersama untuk semua sesi Streamlit.
+
+``st.cache_data`` mengembalikan salinan hasil (hasil unpickle) ke setiap sesi,
+sehingga memori tumbuh linear dengan jumlah sesi yang berjalan bersamaan.
+Pada mode bersama, dataset yang sudah melalui skema dan kolom turunan ditulis
+sekali sebagai snapshot di ``<base_dir>/_shared/`` lalu dibaca dengan
+memory-map. Semua sesi memakai DataFrame yang sama (``st.cache_resource``)
+dan semua proses server berbagi page cache file yang sama. Array kolom
+numerik, kategori, dan datetime read-only, jadi filter tidak bisa mengubah
+buffer bersama; kolom string (id hex) di-decode sekali per proses.
+
+Nama snapshot memuat sidik data sumber (ukuran dan mtime partisi, snapshot,
+dan CSV) serta skema, sehingga data atau skema baru otomatis dipublikasikan
+ulang dan versi lama dihapus.
+"""
+
+import hashlib
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import schema
+import snapshot
+
+SHARED_DIR = "_shared"
+
+
+def source_key(base_dir, name):
+    """Sidik data sumber dan skema untuk dataset ``name``"""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(repr(schema.SCHEMAS.get(name)).encode())
+    markers = [
+        os.path.join(snapshot.partitions_path(base_dir, name), snapshot.MANIFEST_FILE),
+        os.path.join(snapshot.snapshot_path(base_dir, name), "meta.json"),
+        snapshot.csv_path(base_dir, name),
+    ]
+    for path in markers:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            h.update(
+                repr((os.path.basename(path), stat.st_size, stat.st_mtime_ns)).encode()
+            )
+    return h.hexdigest()
+
+
+def shared_path(base_dir, name, key):
+    """Path snapshot bersama untuk versi ``key`` dataset ``name``"""
+    entry = f"{name}-{key}{snapshot.SNAPSHOT_SUFFIX}"
+    return os.path.join(base_dir, SHARED_DIR, entry)
+
+
+def publish(df, path, extra=None):
+    """Tulis ``df`` sebagai snapshot bersama lalu hapus versi lama dataset itu"""
+    snapshot.write_snapshot(df, path, extra=extra)
+    folder, entry = os.path.split(path)
+    prefix = entry.rsplit("-", 1)[0] + "-"
+    for old in os.listdir(folder):
+        if old.startswith(prefix) and old != entry and not old.endswith(".tmp"):
+            # Proses lain yang masih me-memory-map versi lama tidak terganggu
+            shutil.rmtree(os.path.join(folder, old), ignore_errors=True)
+
+
+def attach(path):
+    """DataFrame read-only (memory-map) dan ``extra`` dari snapshot bersama"""
+    meta = snapshot.read_meta(path)
+    return snapshot.read_snapshot(path, mmap=True), meta.get("extra", {})
+
+
+def load_shared(base_dir, name, prepare):
+    """Snapshot bersama dataset ``name``, dibuat dengan ``prepare`` bila perlu.
+
+    ``prepare(base_dir, name)`` mengembalikan ``(DataFrame, extra)``.
+    """
+    path = shared_path(base_dir, name, source_key(base_dir, name))
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        df, extra = prepare(base_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        publish(df, path, extra)
+    return attach(path)
+
+
+def _read_only(values):
+    """View read-only dari kolom ``values`` tanpa menyalin buffer"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy(copy=False).view()
+        codes.flags.writeable = False
+        return pd.Categorical.from_codes(codes, dtype=values.dtype)
+    if isinstance(values.dtype, np.dtype):
+        # Numerik, bool, dan datetime/timedelta tanpa zona waktu
+        array = values.to_numpy(copy=False).view()
+        array.flags.writeable = False
+        return array
+    # ArrowStringArray dan array extension lain dibiarkan apa adanya
+    return values.array
+
+
+def freeze(obj):
+    """Salinan ringan ``obj`` dengan semua array numpy read-only.
+
+    DataFrame dan Series dibangun ulang dari view read-only kolomnya
+    (termasuk kode kategori dan nilai datetime) tanpa menyalin data,
+    sehingga penulisan lewat ``.loc``/``.iloc`` atau ``to_numpy()`` pada
+    hasilnya gagal dengan ``ValueError``. Objek asli tidak diubah tetapi
+    berbagi buffer dengan hasil, jadi hanya hasil ``freeze`` yang boleh
+    disimpan; dict, list, dan tuple dikembalikan sebagai wadah baru.
+    Menambah kolom baru tetap mengubah frame, jadi pemanggil tetap tidak
+    boleh memodifikasi hasil bersama.
+    """
+    if isinstance(obj, np.ndarray):
+        obj = obj.view()
+        obj.flags.writeable = False
+        return obj
+    if isinstance(obj, pd.Series):
+        return pd.Series(_read_only(obj), index=obj.index, name=obj.name, copy=False)
+    if isinstance(obj, pd.DataFrame):
+        columns = {i: _read_only(obj.iloc[:, i]) for i in range(obj.shape[1])}
+        frozen = pd.DataFrame(columns, index=obj.index, copy=False)
+        frozen.columns = obj.columns
+        return frozen
+    if isinstance(obj, dict):
+        return {key: freeze(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(freeze(value) for value in obj)
+    return obj
@@ -0,0 +1,217 @@
+"""Sketch statistik yang bisa digabung: kuantil KLL dan momen/ko-momen.
+
+Cube menghitung median, kuantil, dan korelasi secara tepat karena
+``delivery_time`` dan ``review_score`` bernilai bulat kecil (jumlah per
+nilai). Untuk kolom kontinu seperti jarak seller-pelanggan (km), setiap
+partisi filter menyimpan:
+
+- momen dua-lintasan (n, mean, M2) dan ko-momen terhadap kolom kedua, lalu
+  digabung dengan rumus Chan et al.: count, mean, std, min, max, dan korelasi
+  hasil gabungan tepat (hanya galat pembulatan float)
+- sketch kuantil KLL (Karnin, Lang, Liberty 2016) dengan parameter ``k``.
+  Item di level ``h`` mewakili ``2**h`` nilai asli; partisi dengan paling
+  banyak ``k`` nilai disimpan utuh sehingga kuantilnya tepat
+
+Galat kuantil dinyatakan sebagai galat rank ternormalisasi: kuantil ``q``
+yang dikembalikan memiliki rank sebenarnya di ``q ± eps``, dengan ``eps``
+dari ``rank_error(k)`` (rumus Apache DataSketches untuk KLL, keyakinan 99%;
+k=200 memberi sekitar 1,3%). Menggabungkan partisi tidak menambah ``eps``
+karena galat setiap partisi sebanding dengan jumlah nilainya.
+``tests/test_sketch.py`` dan ``benchmarks/bench_sketch.py`` memeriksa batas ini
+terhadap nilai pandas.
+
+Sketch sekumpulan partisi disimpan rata dan terurut menurut nilai (``items``,
+``heights``, ``part``), sehingga kuantil partisi yang lolos filter cukup
+dihitung dari satu mask tanpa loop per partisi.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cube import DESCRIBE_INDEX, weighted_quantiles
+
+DEFAULT_K = 200
+# Kapasitas level turun geometris dari level teratas (konstanta c di KLL)
+LEVEL_RATIO = 2 / 3
+MIN_LEVEL_WIDTH = 2
+
+
+def rank_error(k=DEFAULT_K):
+    """Galat rank ternormalisasi satu kuantil KLL (keyakinan 99%)"""
+    return 2.296 / k**0.9723
+
+
+def _capacity(k, height, num_levels):
+    """Kapasitas level ``height`` pada sketch dengan ``num_levels`` level"""
+    depth = num_levels - 1 - height
+    return max(MIN_LEVEL_WIDTH, int(np.ceil(k * LEVEL_RATIO**depth)))
+
+
+def _compress(levels, k, rng):
+    """Kompaksi level sampai total item muat dalam kapasitas (in-place)"""
+    while True:
+        num_levels = len(levels)
+        caps = [_capacity(k, h, num_levels) for h in range(num_levels)]
+        if sum(len(level) for level in levels) <= sum(caps):
+            return levels
+        h = next(h for h in range(num_levels) if len(levels[h]) > caps[h])
+        level = np.sort(levels[h])
+        # Jumlah ganjil: satu item tetap di level ini agar bobot total terjaga
+        keep, level = level[: len(level) % 2], level[len(level) % 2 :]
+        promoted = level[rng.integers(2) :: 2]
+        if h + 1 == num_levels:
+            levels.append(promoted)
+        else:
+            levels[h + 1] = np.concatenate([levels[h + 1], promoted])
+        levels[h] = keep
+
+
+def kll_sketch(values, k=DEFAULT_K, seed=0):
+    """Sketch KLL dari array ``values`` (NaN diabaikan)"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    levels = _compress([values], k, np.random.default_rng(seed))
+    return {"k": k, "n": len(values), "levels": levels}
+
+
+def kll_merge(sketches, seed=0):
+    """Gabungkan beberapa sketch KLL (``k`` terkecil yang dipakai)"""
+    k = min(s["k"] for s in sketches)
+    height = max(len(s["levels"]) for s in sketches)
+    levels = [
+        np.concatenate(
+            [s["levels"][h] for s in sketches if h < len(s["levels"])] or [np.empty(0)]
+        )
+        for h in range(height)
+    ]
+    levels = _compress(levels, k, np.random.default_rng(seed))
+    return {"k": k, "n": sum(s["n"] for s in sketches), "levels": levels}
+
+
+def kll_quantiles(sketch, qs):
+    """Kuantil ``qs`` dari sketch (tepat seperti pandas jika belum dikompaksi)"""
+    items = np.concatenate(sketch["levels"])
+    weights = np.concatenate(
+        [np.full(len(level), 2**h) for h, level in enumerate(sketch["levels"])]
+    )
+    return weighted_quantiles(items, weights, qs)
+
+
+def build_partitions(df, dims, value, other, k=DEFAULT_K, seed=0):
+    """Momen dan sketch KLL kolom ``value`` per kombinasi ``dims``.
+
+    ``other`` adalah kolom kedua untuk ko-momen (korelasi). Baris dengan
+    ``value`` kosong dilewati. Kolom ``keys`` berisi dimensi per partisi dan
+    bisa difilter dengan ``cube.filter_cube``.
+    """
+    x = df[value].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(x)
+    frame = df.loc[valid, dims]
+    x = x[valid]
+    y = df[other].to_numpy(dtype=np.float64)[valid]
+
+    grouped = frame.groupby(dims, observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    keys = grouped.size().rename("count").reset_index()
+    n_parts = len(keys)
+
+    # Momen dua-lintasan per partisi
+    n = np.bincount(codes, minlength=n_parts).astype(np.float64)
+    mean_x = np.bincount(codes, x, n_parts) / n
+    mean_y = np.bincount(codes, y, n_parts) / n
+    dx = x - mean_x[codes]
+    dy = y - mean_y[codes]
+    moments = pd.DataFrame(
+        {
+            "n": n,
+            "mean_x": mean_x,
+            "m2_x": np.bincount(codes, dx * dx, n_parts),
+            "mean_y": mean_y,
+            "m2_y": np.bincount(codes, dy * dy, n_parts),
+            "c_xy": np.bincount(codes, dx * dy, n_parts),
+            "min": pd.Series(x).groupby(codes).min().to_numpy(),
+            "max": pd.Series(x).groupby(codes).max().to_numpy(),
+        }
+    )
+
+    # Sketch per partisi; partisi kecil (<= k nilai) disimpan utuh
+    order = np.argsort(codes, kind="stable")
+    sorted_x = x[order]
+    starts = np.searchsorted(codes[order], np.arange(n_parts + 1))
+    items, heights, part = [sorted_x], [np.zeros(len(x), np.int8)], [codes[order]]
+    large = np.flatnonzero(np.diff(starts) > k)
+    keep = np.ones(len(x), dtype=bool)
+    rng = np.random.default_rng(seed)
+    for p in large:
+        lo, hi = starts[p], starts[p + 1]
+        keep[lo:hi] = False
+        levels = _compress([sorted_x[lo:hi]], k, rng)
+        for h, level in enumerate(levels):
+            items.append(level)
+            heights.append(np.full(len(level), h, np.int8))
+            part.append(np.full(len(level), p))
+    items[0], heights[0], part[0] = items[0][keep], heights[0][keep], part[0][keep]
+
+    # Item diurutkan sekali di sini, jadi sort saat query hanya melewati data urut
+    items = np.concatenate(items)
+    order = np.argsort(items, kind="stable")
+    return {
+        "k": k,
+        "value": value,
+        "other": other,
+        "keys": keys,
+        "moments": moments,
+        "items": items[order],
+        "heights": np.concatenate(heights)[order],
+        "part": np.concatenate(part).astype(np.int32)[order],
+    }
+
+
+def merge_moments(moments):
+    """Gabungkan momen beberapa partisi (rumus paralel Chan et al.)"""
+    n = moments["n"].to_numpy()
+    total = n.sum()
+    mean_x = (n * moments["mean_x"]).sum() / total
+    mean_y = (n * moments["mean_y"]).sum() / total
+    dx = moments["mean_x"].to_numpy() - mean_x
+    dy = moments["mean_y"].to_numpy() - mean_y
+    return {
+        "n": total,
+        "mean_x": mean_x,
+        "m2_x": (moments["m2_x"] + n * dx * dx).sum(),
+        "mean_y": mean_y,
+        "m2_y": (moments["m2_y"] + n * dy * dy).sum(),
+        "c_xy": (moments["c_xy"] + n * dx * dy).sum(),
+        "min": moments["min"].min(),
+        "max": moments["max"].max(),
+    }
+
+
+def describe(parts, selected):
+    """Setara ``describe()`` kolom ``value`` untuk partisi ``selected``.
+
+    ``selected`` adalah label index ``parts["keys"]`` (mis. hasil
+    ``cube.filter_cube``). Kuartil berasal dari sketch (galat rank
+    ``rank_error(k)``), kolom lain tepat. Mengembalikan ``(Series, korelasi)``.
+    """
+    selected = np.asarray(selected)
+    if len(selected) == 0:
+        return pd.Series(np.nan, index=DESCRIBE_INDEX, name=parts["value"]), np.nan
+    m = merge_moments(parts["moments"].iloc[selected])
+    n = m["n"]
+    std = np.sqrt(m["m2_x"] / (n - 1)) if n > 1 else np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = m["c_xy"] / np.sqrt(m["m2_x"] * m["m2_y"])
+
+    mask = np.zeros(len(parts["keys"]), dtype=bool)
+    mask[selected] = True
+    rows = mask[parts["part"]]
+    weights = np.left_shift(1, parts["heights"][rows].astype(np.int64))
+    q25, q50, q75 = weighted_quantiles(parts["items"][rows], weights, [0.25, 0.5, 0.75])
+    summary = pd.Series(
+        [n, m["mean_x"], std, m["min"], q25, q50, q75, m["max"]],
+        index=DESCRIBE_INDEX,
+        name=parts["value"],
+        dtype=np.float64,
+    )
+    return summary, corr
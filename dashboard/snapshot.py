@@ -0,0 +1,434 @@
+"""Format snapshot kolumnar untuk dataset dashboard.
+
+Satu snapshot adalah folder ``<nama>.snap`` berisi ``meta.json`` dan satu file
+``.npy`` per kolom. Kolom numerik disimpan apa adanya, kolom kategori sebagai
+kode integer, datetime sebagai int64 (nanodetik), dan string lain sebagai
+bytes lebar tetap. Semua kolom dibaca dengan ``np.load(mmap_mode="r")``
+sehingga tidak ada parsing teks saat dashboard dimuat.
+
+Dataset juga bisa dipartisi per bulan pembelian oleh ``python -m pipeline``:
+folder ``<nama>.parts`` berisi satu snapshot per partisi (``2018-01.snap``)
+dan ``_manifest.json`` dengan jumlah baris serta statistik min/max setiap
+partisi. ``meta.json`` mencatat min, max, dan jumlah nilai kosong setiap kolom
+numerik dan datetime; dengan statistik itu pembacaan dengan ``date_range``
+hanya membuka partisi yang rentang tanggalnya beririsan, dan filter baris
+hanya dijalankan pada partisi di tepi rentang.
+
+Ekspor ulang snapshot dari CSV hasil notebook:
+
+    python dashboard/snapshot.py
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DATASETS = ["orders_reviews", "geo_orders"]
+SNAPSHOT_SUFFIX = ".snap"
+PARTITIONS_SUFFIX = ".parts"
+MANIFEST_FILE = "_manifest.json"
+FORMAT_VERSION = 1
+# Kolom kunci partisi bulan dan filter "Rentang Tanggal"
+PARTITION_COLUMN = "order_purchase_timestamp"
+NAT = np.iinfo(np.int64).min
+
+DATE_COLUMNS = [
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+]
+CATEGORICAL_COLUMNS = [
+    "order_status",
+    "delivery_status",
+    "customer_state",
+    "geolocation_city",
+    "geolocation_state",
+]
+
+
+def snapshot_path(base_dir, name):
+    """Path folder snapshot untuk dataset ``name``"""
+    return os.path.join(base_dir, name + SNAPSHOT_SUFFIX)
+
+
+def partitions_path(base_dir, name):
+    """Path folder dataset terpartisi untuk dataset ``name``"""
+    return os.path.join(base_dir, name + PARTITIONS_SUFFIX)
+
+
+def partition_path(path, key):
+    """Path snapshot satu partisi di dalam folder dataset terpartisi"""
+    return os.path.join(path, key + SNAPSHOT_SUFFIX)
+
+
+def csv_path(base_dir, name):
+    """Path CSV untuk dataset ``name``"""
+    return os.path.join(base_dir, name + ".csv")
+
+
+def read_csv_dataset(path):
+    """Membaca CSV dashboard dan mengonversi kolom tanggal"""
+    df = pd.read_csv(path)
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+    return df
+
+
+def _encode_column(series, categorical):
+    """Mengubah satu kolom menjadi (array, metadata)"""
+    meta = {"name": series.name}
+    if series.name in categorical or isinstance(series.dtype, pd.CategoricalDtype):
+        cat = pd.Categorical(series).remove_unused_categories()
+        meta["kind"] = "category"
+        meta["categories"] = cat.categories.tolist()
+        values = cat.codes
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        meta["kind"] = "datetime"
+        values = series.dt.tz_localize(None).dt.as_unit("ns").to_numpy().view("i8")
+    elif pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        meta["kind"] = "numeric"
+        values = series.to_numpy()
+    elif getattr(series.dtype, "storage", None) == "pyarrow":
+        meta["kind"] = "bytes"
+        values, meta["encoding"] = _arrow_bytes(series)
+    else:
+        meta["kind"] = "bytes"
+        text = series.fillna("").to_numpy(dtype=str)
+        try:
+            values = text.astype("S")
+            meta["encoding"] = "ascii"
+        except UnicodeEncodeError:
+            values = np.char.encode(text, "utf-8")
+            meta["encoding"] = "utf-8"
+    meta["dtype"] = values.dtype.str
+    return np.ascontiguousarray(values), meta
+
+
+def _arrow_bytes(series):
+    """(array ``S`` lebar tetap, encoding) dari buffer UTF-8 kolom string Arrow.
+
+    Byte setiap string disalin per kelompok panjang yang sama, tanpa membuat
+    objek string Python per baris. Nilai kosong menjadi ``b""``.
+    """
+    array = series.array.__arrow_array__().combine_chunks()
+    offset_dtype = np.int64 if str(array.type) == "large_string" else np.int32
+    _, offsets, data = array.buffers()
+    offsets = np.frombuffer(offsets, offset_dtype)
+    offsets = offsets[array.offset : array.offset + len(array) + 1]
+    data = np.zeros(0, np.uint8) if data is None else np.frombuffer(data, np.uint8)
+    lengths = np.where(series.isna().to_numpy(), 0, np.diff(offsets))
+
+    width = max(int(lengths.max(initial=0)), 1)
+    out = np.zeros((len(lengths), width), np.uint8)
+    rows = np.argsort(lengths, kind="stable")
+    bounds = np.flatnonzero(np.diff(lengths[rows])) + 1
+    for group in np.split(rows, bounds):
+        length = lengths[group[0]] if len(group) else 0
+        if length:
+            windows = np.lib.stride_tricks.sliding_window_view(data, length)
+            out[group, :length] = windows[offsets[group]]
+    encoding = "utf-8" if (data[offsets[0] : offsets[-1]] >= 0x80).any() else "ascii"
+    return out.view(f"S{width}").ravel(), encoding
+
+
+def _column_stats(values, kind):
+    """Min, max, dan jumlah nilai kosong kolom numerik/datetime (``None`` lainnya)"""
+    if kind == "datetime":
+        valid = values != NAT
+    elif kind == "numeric" and values.dtype.kind == "f":
+        valid = ~np.isnan(values)
+    elif kind == "numeric":
+        valid = np.ones(len(values), dtype=bool)
+    else:
+        return None
+    stats = {"nulls": int(len(values) - valid.sum())}
+    if valid.any():
+        stats["min"] = values[valid].min().item()
+        stats["max"] = values[valid].max().item()
+    return stats
+
+
+def _decode_column(values, meta):
+    """Kebalikan dari ``_encode_column``"""
+    kind = meta["kind"]
+    if kind == "category":
+        return pd.Categorical.from_codes(values, categories=meta["categories"])
+    if kind == "datetime":
+        return values.view("M8[ns]")
+    if kind == "bytes":
+        # Cast numpy S -> U jauh lebih cepat daripada decode, aman untuk ASCII
+        if meta["encoding"] == "ascii":
+            return values.astype(f"U{values.dtype.itemsize}")
+        return np.char.decode(values, "utf-8")
+    return values
+
+
+def write_snapshot(df, path, categorical=CATEGORICAL_COLUMNS, extra=None):
+    """Menulis DataFrame sebagai snapshot kolumnar di folder ``path``.
+
+    ``extra`` (dict yang bisa di-JSON-kan) ikut disimpan di ``meta.json``.
+    Snapshot ditulis ke folder sementara unik di samping ``path`` lalu
+    di-rename, jadi beberapa proses boleh menulis snapshot yang sama
+    bersamaan.
+    """
+    parent, entry = os.path.split(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=entry + ".", suffix=".tmp", dir=parent)
+    # mkdtemp membuat folder 0700; snapshot harus bisa dibaca proses lain
+    os.chmod(tmp_path, 0o755)
+
+    try:
+        columns = []
+        for i, col in enumerate(df.columns):
+            values, meta = _encode_column(df[col], categorical)
+            meta["file"] = f"{i:03d}.npy"
+            stats = _column_stats(values, meta["kind"])
+            if stats is not None:
+                meta["stats"] = stats
+            np.save(os.path.join(tmp_path, meta["file"]), values)
+            columns.append(meta)
+
+        meta = {"version": FORMAT_VERSION, "rows": len(df), "columns": columns}
+        if extra is not None:
+            meta["extra"] = extra
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    # Ganti snapshot lama hanya setelah snapshot baru lengkap
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # Proses lain sudah me-rename snapshotnya ke ``path`` lebih dulu
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            raise
+
+
+def read_meta(path):
+    """Membaca ``meta.json`` snapshot"""
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"Versi snapshot tidak didukung: {meta['version']}")
+    return meta
+
+
+def read_snapshot(path, columns=None, mmap=True):
+    """Membaca snapshot kolumnar menjadi DataFrame"""
+    meta = read_meta(path)
+
+    data = {}
+    for col in meta["columns"]:
+        if columns is not None and col["name"] not in columns:
+            continue
+        values = np.load(
+            os.path.join(path, col["file"]), mmap_mode="r" if mmap else None
+        )
+        data[col["name"]] = _decode_column(values, col)
+    return pd.DataFrame(data, copy=False)
+
+
+def concat_frames(frames):
+    """``pd.concat`` yang menyatukan kategori agar kolom tetap categorical"""
+    frames = [df for df in frames if len(df)] or list(frames[:1])
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    for col in frames[0].columns:
+        dtypes = [df[col].dtype for df in frames]
+        if not any(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            continue
+        values = [
+            (
+                df[col].cat.categories
+                if isinstance(df[col].dtype, pd.CategoricalDtype)
+                else df[col].dropna().unique()
+            )
+            for df in frames
+        ]
+        dtype = pd.CategoricalDtype(
+            pd.Index(np.concatenate(values)).unique().sort_values()
+        )
+        frames = [df.assign(**{col: df[col].astype(dtype)}) for df in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_manifest(path):
+    """Tulis ulang ``_manifest.json`` dari meta.json setiap partisi.
+
+    Setiap partisi dicatat dengan jumlah baris dan statistik kolomnya
+    (``{"min", "max", "nulls"}``, datetime dalam nanodetik).
+    """
+    partitions = {}
+    for entry in sorted(os.listdir(path)):
+        if not entry.endswith(SNAPSHOT_SUFFIX):
+            continue
+        with open(os.path.join(path, entry, "meta.json")) as f:
+            meta = json.load(f)
+        partitions[entry[: -len(SNAPSHOT_SUFFIX)]] = {
+            "rows": meta["rows"],
+            "stats": {
+                col["name"]: col["stats"] for col in meta["columns"] if "stats" in col
+            },
+        }
+
+    manifest = {"version": FORMAT_VERSION, "partitions": partitions}
+    tmp_file = os.path.join(path, MANIFEST_FILE + ".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_file, os.path.join(path, MANIFEST_FILE))
+    return manifest
+
+
+def read_manifest(path):
+    """Membaca ``_manifest.json`` dataset terpartisi"""
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def partition_layout(manifest):
+    """Partisi manifest terurut beserta rentang barisnya setelah digabung.
+
+    Setiap entri berisi ``key``, ``rows``, ``stats``, serta ``start`` dan
+    ``stop``: posisi baris partisi itu di DataFrame hasil ``read_partitioned``.
+    """
+    layout = []
+    start = 0
+    for key, entry in sorted(manifest["partitions"].items()):
+        stop = start + entry["rows"]
+        layout.append(
+            {
+                "key": key,
+                "rows": entry["rows"],
+                "start": start,
+                "stop": stop,
+                "stats": entry.get("stats", {}),
+            }
+        )
+        start = stop
+    return layout
+
+
+def date_bounds(date_range):
+    """(awal, akhir) nanodetik dari rentang tanggal inklusif; akhir eksklusif"""
+    start = pd.Timestamp(date_range[0]).as_unit("ns")
+    end = pd.Timestamp(date_range[1]).as_unit("ns") + pd.Timedelta(days=1)
+    return start.value, end.value
+
+
+def prune_partitions(layout, column, start, end):
+    """Partisi yang mungkin berisi baris ``start <= column < end``.
+
+    Mengembalikan list ``(partisi, contained)``; ``contained`` True jika semua
+    baris partisi pasti lolos sehingga filter baris bisa dilewati. Partisi
+    tanpa statistik ``column`` (manifest lama) selalu ikut dan difilter.
+    """
+    selected = []
+    for part in layout:
+        stats = part["stats"].get(column)
+        if stats is None:
+            selected.append((part, False))
+        elif "min" in stats and stats["min"] < end and stats["max"] >= start:
+            contained = (
+                stats["nulls"] == 0 and stats["min"] >= start and stats["max"] < end
+            )
+            selected.append((part, contained))
+    return selected
+
+
+def filter_dates(df, date_range, column=PARTITION_COLUMN):
+    """Baris ``df`` dengan tanggal ``column`` di dalam ``date_range`` (inklusif)"""
+    start, end = date_bounds(date_range)
+    keys = df[column].to_numpy(dtype="M8[ns]").view("i8")
+    return df[(keys >= start) & (keys < end)].reset_index(drop=True)
+
+
+def read_partitioned(path, partitions=None, columns=None, date_range=None):
+    """Membaca partisi (semua atau sebagian) menjadi satu DataFrame.
+
+    Dengan ``date_range`` hanya partisi yang beririsan yang dibaca; hasilnya
+    sama dengan ``filter_dates`` atas seluruh dataset.
+    """
+    layout = partition_layout(read_manifest(path))
+    if partitions is not None:
+        layout = [part for part in layout if part["key"] in partitions]
+    if date_range is None:
+        return concat_frames(
+            [read_snapshot(partition_path(path, p["key"]), columns) for p in layout]
+        )
+
+    start, end = date_bounds(date_range)
+    read_columns = columns
+    if columns is not None and PARTITION_COLUMN not in columns:
+        read_columns = list(columns) + [PARTITION_COLUMN]
+    frames = []
+    for part, contained in prune_partitions(layout, PARTITION_COLUMN, start, end):
+        df = read_snapshot(partition_path(path, part["key"]), read_columns)
+        frames.append(df if contained else filter_dates(df, date_range))
+    if not frames and layout:
+        # Tidak ada partisi yang beririsan: frame kosong dengan kolom yang sama
+        first = read_snapshot(partition_path(path, layout[0]["key"]), read_columns)
+        frames = [first.iloc[:0]]
+    df = concat_frames(frames)
+    if read_columns is not columns:
+        df = df.drop(columns=PARTITION_COLUMN)
+    return df
+
+
+def is_fresh(marker, csv):
+    """True jika file penanda snapshot ada dan tidak lebih lama dari CSV"""
+    if not os.path.exists(marker):
+        return False
+    if not os.path.exists(csv):
+        return True
+    return os.path.getmtime(marker) >= os.path.getmtime(csv)
+
+
+def load_dataset(base_dir, name, date_range=None):
+    """Memuat dataset: partisi, snapshot tunggal, lalu CSV sebagai fallback.
+
+    ``date_range`` membatasi baris ke rentang tanggal pembelian; pada dataset
+    terpartisi hanya partisi yang beririsan yang dibaca.
+    """
+    parts = partitions_path(base_dir, name)
+    snap = snapshot_path(base_dir, name)
+    csv = csv_path(base_dir, name)
+    if is_fresh(os.path.join(parts, MANIFEST_FILE), csv):
+        return read_partitioned(parts, date_range=date_range)
+    if is_fresh(os.path.join(snap, "meta.json"), csv):
+        df = read_snapshot(snap)
+    else:
+        df = read_csv_dataset(csv)
+    return df if date_range is None else filter_dates(df, date_range)
+
+
+def export_snapshots(base_dir):
+    """Mengekspor semua CSV dashboard di ``base_dir`` menjadi snapshot"""
+    for name in DATASETS:
+        df = read_csv_dataset(csv_path(base_dir, name))
+        write_snapshot(df, snapshot_path(base_dir, name))
+        print(f"- {snapshot_path(base_dir, name)}: {len(df)} baris")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ekspor snapshot dataset dashboard")
+    parser.add_argument("--base-dir", default=BASE_DIR)
+    args = parser.parse_args()
+    export_snapshots(args.base_dir)
@@ -0,0 +1,648 @@
+"""Spesifikasi Vega-Lite untuk chart agregat dashboard.
+
+Padanan interaktif dari fungsi ``charts.create_*`` yang inputnya sudah
+diagregasi (hasil ``views``). Server hanya mengirim spesifikasi JSON berisi
+beberapa puluh baris data; chart digambar di browser oleh komponen
+``st.vega_lite_chart``, jadi tidak ada render matplotlib dan transfer PNG
+per rerun. Chart berbasis baris (peta, top kota) tetap lewat matplotlib.
+
+Setiap fungsi menerima argumen yang sama dengan ``create_*`` padanannya dan
+terdaftar di ``SPECS`` dengan nama chart di dashboard.
+"""
+
+import json
+
+import pandas as pd
+
+import density
+from cube import LATE_STATUS, ONTIME_STATUS
+
+SCORE_COLORS = ["#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60"]
+STATUS_SCALE = {
+    "domain": [ONTIME_STATUS, LATE_STATUS],
+    "range": ["#27ae60", "#e74c3c"],
+}
+
+
+def _values(frame):
+    """Baris ``frame`` sebagai list dict yang aman untuk JSON (NaN -> null)"""
+    return json.loads(frame.to_json(orient="records"))
+
+
+def _spec(title, frame, **spec):
+    """Spesifikasi dasar dengan judul dan data inline"""
+    return {
+        "title": title,
+        "data": {"values": _values(frame)},
+        **spec,
+    }
+
+
+def _tooltip(channel, fmt=None):
+    """Tooltip dari definisi channel (tanpa ``sort``/``axis``)"""
+    tip = {k: v for k, v in channel.items() if k in ("field", "type", "title")}
+    if fmt:
+        tip["format"] = fmt
+    return tip
+
+
+def _mean_rule(value, axis, color, label):
+    """Layer garis rata-rata (``axis`` "y" untuk garis horizontal)"""
+    return {
+        "mark": {"type": "rule", "color": color, "strokeDash": [6, 4]},
+        "encoding": {
+            axis: {"datum": value},
+            "tooltip": {"value": label},
+        },
+    }
+
+
+def score_distribution(score_counts):
+    """Distribusi skor review"""
+    frame = pd.DataFrame(
+        {"review_score": score_counts.index.astype(int), "count": score_counts.values}
+    )
+    x = {"field": "review_score", "type": "ordinal", "title": "Skor Review"}
+    y = {"field": "count", "type": "quantitative", "title": "Jumlah Order"}
+    return _spec(
+        "Distribusi Skor Review",
+        frame,
+        encoding={"x": {**x, "axis": {"labelAngle": 0}}, "y": y},
+        layer=[
+            {
+                "mark": "bar",
+                "encoding": {
+                    "color": {
+                        "field": "review_score",
+                        "type": "ordinal",
+                        "scale": {"domain": [1, 2, 3, 4, 5], "range": SCORE_COLORS},
+                        "legend": None,
+                    },
+                    "tooltip": [_tooltip(x), _tooltip(y, ",")],
+                },
+            },
+            {
+                "mark": {"type": "text", "dy": -8},
+                "encoding": {"text": {"field": "count", "format": ","}},
+            },
+        ],
+    )
+
+
+def delivery_status_pie(status_counts):
+    """Proporsi status pengiriman"""
+    frame = pd.DataFrame(
+        {
+            "delivery_status": status_counts.index.astype(str),
+            "count": status_counts.values,
+            "share": status_counts.values / status_counts.sum(),
+        }
+    )
+    return _spec(
+        "Proporsi Status Pengiriman",
+        frame,
+        mark={"type": "arc", "innerRadius": 0},
+        encoding={
+            "theta": {"field": "count", "type": "quantitative"},
+            "color": {
+                "field": "delivery_status",
+                "type": "nominal",
+                "scale": STATUS_SCALE,
+                "title": "Status",
+            },
+            "tooltip": [
+                {"field": "delivery_status", "title": "Status"},
+                {"field": "count", "title": "Jumlah Order", "format": ","},
+                {"field": "share", "title": "Persentase", "format": ".1%"},
+            ],
+        },
+    )
+
+
+def delivery_histogram(delivery_counts):
+    """Histogram waktu pengiriman beserta KDE, mean, dan median"""
+    heights, edges = density.histogram(delivery_counts)
+    frame = pd.DataFrame({"start": edges[:-1], "end": edges[1:], "count": heights})
+    x = {"field": "start", "type": "quantitative", "title": "Waktu Pengiriman (hari)"}
+    y = {"field": "count", "type": "quantitative", "title": "Jumlah Order"}
+    stats = density.summary(delivery_counts)
+    layer = [
+        {
+            "mark": {"type": "bar", "color": "#3498db", "opacity": 0.5},
+            "encoding": {
+                "x": x,
+                "x2": {"field": "end"},
+                "y": y,
+                "tooltip": [
+                    {"field": "start", "title": "Dari (hari)", "format": ".1f"},
+                    {"field": "end", "title": "Sampai (hari)", "format": ".1f"},
+                    _tooltip(y, ","),
+                ],
+            },
+        }
+    ]
+    curve = density.kde(delivery_counts)
+    if curve is not None:
+        grid, values = curve
+        scale = stats["n"] * (edges[1] - edges[0])
+        kde = pd.DataFrame({"start": grid, "count": values * scale}).round(2)
+        layer.append(
+            {
+                "data": {"values": _values(kde)},
+                "mark": {"type": "line", "color": "#3498db", "strokeWidth": 2},
+                "encoding": {"x": x, "y": y},
+            }
+        )
+    layer += [
+        _mean_rule(stats["mean"], "x", "red", f"Mean: {stats['mean']:.1f}"),
+        _mean_rule(stats["median"], "x", "green", f"Median: {stats['median']:.1f}"),
+    ]
+    return _spec("Distribusi Waktu Pengiriman", frame, layer=layer)
+
+
+def delivery_boxplot(boxes):
+    """Boxplot waktu pengiriman per skor dari statistik ringkas"""
+    frame = pd.DataFrame(
+        [
+            {
+                "review_score": box["label"],
+                **{k: box[k] for k in ["whislo", "q1", "med", "q3", "whishi", "n"]},
+            }
+            for box in boxes
+        ]
+    )
+    fliers = pd.DataFrame(
+        [
+            {"review_score": box["label"], "delivery_time": value}
+            for box in boxes
+            for value in box["fliers"]
+        ],
+        columns=["review_score", "delivery_time"],
+    )
+    x = {
+        "field": "review_score",
+        "type": "ordinal",
+        "title": "Skor Review (1-5)",
+        "axis": {"labelAngle": 0},
+    }
+    y = {"type": "quantitative", "title": "Waktu Pengiriman (hari)"}
+    color = {
+        "field": "review_score",
+        "type": "ordinal",
+        "scale": {"scheme": "redblue", "reverse": True},
+        "legend": None,
+    }
+    tooltip = [
+        {"field": "review_score", "title": "Skor Review"},
+        {"field": "n", "title": "Jumlah Order", "format": ","},
+        {"field": "q1", "title": "Q1"},
+        {"field": "med", "title": "Median"},
+        {"field": "q3", "title": "Q3"},
+    ]
+    return _spec(
+        "Distribusi Waktu Pengiriman per Skor Review",
+        frame,
+        encoding={"x": x},
+        layer=[
+            {
+                "mark": {"type": "rule", "color": "#555"},
+                "encoding": {"y": {**y, "field": "whislo"}, "y2": {"field": "whishi"}},
+            },
+            {
+                "mark": {"type": "bar", "size": 40, "stroke": "#555"},
+                "encoding": {
+                    "y": {**y, "field": "q1"},
+                    "y2": {"field": "q3"},
+                    "color": color,
+                    "tooltip": tooltip,
+                },
+            },
+            {
+                "mark": {"type": "tick", "color": "#555", "size": 40},
+                "encoding": {"y": {**y, "field": "med"}},
+            },
+            {
+                "data": {"values": _values(fliers)},
+                "mark": {"type": "point", "color": "#555"},
+                "encoding": {"y": {**y, "field": "delivery_time"}},
+            },
+        ],
+    )
+
+
+def avg_delivery_by_score(avg_delivery, overall_mean):
+    """Rata-rata waktu pengiriman per skor review"""
+    frame = pd.DataFrame(
+        {"review_score": avg_delivery.index.astype(int), "mean": avg_delivery.values}
+    )
+    x = {"field": "review_score", "type": "ordinal", "title": "Skor Review"}
+    y = {
+        "field": "mean",
+        "type": "quantitative",
+        "title": "Rata-rata Waktu Pengiriman (hari)",
+    }
+    return _spec(
+        "Rata-rata Waktu Pengiriman per Skor Review",
+        frame,
+        layer=[
+            {
+                "mark": "bar",
+                "encoding": {
+                    "x": {**x, "axis": {"labelAngle": 0}},
+                    "y": y,
+                    "color": {
+                        "field": "review_score",
+                        "type": "ordinal",
+                        "scale": {"domain": [1, 2, 3, 4, 5], "range": SCORE_COLORS},
+                        "legend": None,
+                    },
+                    "tooltip": [_tooltip(x), _tooltip(y, ".1f")],
+                },
+            },
+            _mean_rule(
+                float(overall_mean),
+                "y",
+                "red",
+                f"Mean keseluruhan: {overall_mean:.1f}",
+            ),
+        ],
+    )
+
+
+def score_heatmap(heatmap_data):
+    """Jumlah order per kelas waktu pengiriman dan skor review"""
+    frame = heatmap_data.stack().rename("count").reset_index()
+    frame["delivery_bin"] = frame["delivery_bin"].astype(str)
+    frame["review_score"] = frame["review_score"].astype(int)
+    x = {"field": "review_score", "type": "ordinal", "title": "Skor Review"}
+    y = {
+        "field": "delivery_bin",
+        "type": "ordinal",
+        "title": "Waktu Pengiriman (hari)",
+        "sort": [str(label) for label in heatmap_data.index],
+    }
+    return _spec(
+        "Distribusi Skor Review berdasarkan Waktu Pengiriman",
+        frame,
+        encoding={"x": {**x, "axis": {"labelAngle": 0}}, "y": y},
+        layer=[
+            {
+                "mark": "rect",
+                "encoding": {
+                    "color": {
+                        "field": "count",
+                        "type": "quantitative",
+                        "scale": {"scheme": "yelloworangered"},
+                        "title": "Jumlah",
+                    },
+                    "tooltip": [
+                        _tooltip(x),
+                        {"field": "delivery_bin", "title": "Waktu Pengiriman"},
+                        {"field": "count", "title": "Jumlah Order", "format": ","},
+                    ],
+                },
+            },
+            {
+                "mark": "text",
+                "encoding": {"text": {"field": "count", "format": "d"}},
+            },
+        ],
+    )
+
+
+def late_percentage_by_state(state_stats):
+    """Persentase keterlambatan per state"""
+    state_stats = state_stats.sort_values(ascending=False)
+    mean = float(state_stats.mean())
+    frame = pd.DataFrame(
+        {
+            "customer_state": state_stats.index.astype(str),
+            "late_pct": state_stats.values,
+            "above_mean": state_stats.values > mean,
+        }
+    )
+    x = {
+        "field": "customer_state",
+        "type": "nominal",
+        "title": "Kode State",
+        "sort": None,
+    }
+    y = {
+        "field": "late_pct",
+        "type": "quantitative",
+        "title": "Persentase Terlambat (%)",
+    }
+    return _spec(
+        "Persentase Keterlambatan per State",
+        frame,
+        layer=[
+            {
+                "mark": "bar",
+                "encoding": {
+                    "x": x,
+                    "y": y,
+                    "color": {
+                        "condition": {"test": "datum.above_mean", "value": "#e74c3c"},
+                        "value": "#f39c12",
+                    },
+                    "tooltip": [_tooltip(x), _tooltip(y, ".1f")],
+                },
+            },
+            _mean_rule(mean, "y", "blue", f"Rata-rata: {mean:.1f}%"),
+        ],
+    )
+
+
+def state_barplot(state_counts):
+    """Pengiriman tepat waktu vs terlambat per state"""
+    frame = state_counts[["customer_state", "delivery_status", "count"]].copy()
+    frame["customer_state"] = frame["customer_state"].astype(str)
+    state_order = (
+        frame.groupby("customer_state")["count"].sum().sort_values(ascending=False)
+    )
+    return _spec(
+        "Pengiriman Tepat Waktu vs Terlambat per State",
+        frame,
+        mark="bar",
+        encoding={
+            "x": {
+                "field": "customer_state",
+                "type": "nominal",
+                "title": "Kode State",
+                "sort": list(state_order.index),
+            },
+            "xOffset": {"field": "delivery_status", "sort": STATUS_SCALE["domain"]},
+            "y": {
+                "field": "count",
+                "type": "quantitative",
+                "title": "Jumlah Pengiriman",
+            },
+            "color": {
+                "field": "delivery_status",
+                "type": "nominal",
+                "scale": STATUS_SCALE,
+                "title": "Status",
+            },
+            "tooltip": [
+                {"field": "customer_state", "title": "State"},
+                {"field": "delivery_status", "title": "Status"},
+                {"field": "count", "title": "Jumlah", "format": ","},
+            ],
+        },
+    )
+
+
+def delivery_time_by_state(state_delivery, overall_mean, top_n=10):
+    """Rata-rata waktu pengiriman per state (state dengan >= 100 order)"""
+    state_delivery = state_delivery[state_delivery["count"] >= 100].sort_values(
+        "mean", ascending=True
+    )
+    frame = pd.DataFrame(
+        {
+            "customer_state": state_delivery.index.astype(str),
+            "mean": state_delivery["mean"].to_numpy(),
+            "count": state_delivery["count"].to_numpy(),
+        }
+    )
+    x = {
+        "field": "mean",
+        "type": "quantitative",
+        "title": "Rata-rata Waktu Pengiriman (hari)",
+    }
+    return _spec(
+        "Rata-rata Waktu Pengiriman per State",
+        frame,
+        layer=[
+            {
+                "mark": "bar",
+                "encoding": {
+                    "x": x,
+                    "y": {
+                        "field": "customer_state",
+                        "type": "nominal",
+                        "title": "State",
+                        "sort": None,
+                    },
+                    "color": {
+                        "field": "mean",
+                        "type": "quantitative",
+                        "scale": {"scheme": "redyellowgreen", "reverse": True},
+                        "legend": None,
+                    },
+                    "tooltip": [
+                        {"field": "customer_state", "title": "State"},
+                        _tooltip(x, ".1f"),
+                        {"field": "count", "title": "Jumlah Order", "format": ","},
+                    ],
+                },
+            },
+            _mean_rule(
+                float(overall_mean),
+                "x",
+                "red",
+                f"Rata-rata nasional: {overall_mean:.1f} hari",
+            ),
+        ],
+    )
+
+
+def monthly_trend(monthly):
+    """Tren bulanan jumlah order dan rata-rata skor (dua sumbu y)"""
+    frame = monthly[["month", "order_id", "review_score"]]
+    x = {"field": "month", "type": "ordinal", "title": "Bulan"}
+    return _spec(
+        "Tren Bulanan: Order dan Skor Review",
+        frame,
+        encoding={"x": x},
+        layer=[
+            {
+                "mark": {"type": "line", "point": True, "color": "blue"},
+                "encoding": {
+                    "y": {
+                        "field": "order_id",
+                        "type": "quantitative",
+                        "title": "Jumlah Order",
+                        "axis": {"titleColor": "blue"},
+                    },
+                    "tooltip": [
+                        _tooltip(x),
+                        {"field": "order_id", "title": "Jumlah Order", "format": ","},
+                    ],
+                },
+            },
+            {
+                "mark": {
+                    "type": "line",
+                    "point": {"shape": "square"},
+                    "color": "green",
+                },
+                "encoding": {
+                    "y": {
+                        "field": "review_score",
+                        "type": "quantitative",
+                        "title": "Rata-rata Skor Review",
+                        "scale": {"zero": False},
+                        "axis": {"titleColor": "green"},
+                    },
+                    "tooltip": [
+                        _tooltip(x),
+                        {
+                            "field": "review_score",
+                            "title": "Rata-rata Skor",
+                            "format": ".2f",
+                        },
+                    ],
+                },
+            },
+        ],
+        resolve={"scale": {"y": "independent"}},
+    )
+
+
+def day_distribution(day_counts):
+    """Jumlah order per hari dalam seminggu"""
+    frame = pd.DataFrame({"day": day_counts.index, "count": day_counts.values})
+    x = {
+        "field": "day",
+        "type": "ordinal",
+        "title": "Hari",
+        "sort": list(day_counts.index),
+    }
+    y = {"field": "count", "type": "quantitative", "title": "Jumlah Order"}
+    return _spec(
+        "Distribusi Order per Hari",
+        frame,
+        mark={"type": "bar", "color": "#4a90c2"},
+        encoding={"x": x, "y": y, "tooltip": [_tooltip(x), _tooltip(y, ",")]},
+    )
+
+
+def delivery_by_distance(distance_stats):
+    """Rata-rata pengiriman dan persen terlambat per kelas jarak seller"""
+    frame = distance_stats.reset_index()
+    frame.columns = ["distance", "count", "mean", "late_pct"]
+    x = {
+        "field": "distance",
+        "type": "ordinal",
+        "title": "Jarak Seller-Pelanggan (km)",
+        "sort": list(distance_stats.index),
+    }
+    return _spec(
+        "Waktu Pengiriman vs Jarak Seller-Pelanggan",
+        frame,
+        encoding={"x": x},
+        layer=[
+            {
+                "mark": {"type": "bar", "color": "#3498db", "opacity": 0.8},
+                "encoding": {
+                    "y": {
+                        "field": "mean",
+                        "type": "quantitative",
+                        "title": "Rata-rata Waktu Pengiriman (hari)",
+                        "axis": {"titleColor": "#3498db"},
+                    },
+                    "tooltip": [
+                        _tooltip(x),
+                        {"field": "mean", "title": "Rata-rata (hari)", "format": ".1f"},
+                        {"field": "count", "title": "Jumlah Order", "format": ","},
+                    ],
+                },
+            },
+            {
+                "mark": {"type": "line", "point": True, "color": "#e74c3c"},
+                "encoding": {
+                    "y": {
+                        "field": "late_pct",
+                        "type": "quantitative",
+                        "title": "Persentase Terlambat (%)",
+                        "axis": {"titleColor": "#e74c3c"},
+                    },
+                    "tooltip": [
+                        _tooltip(x),
+                        {
+                            "field": "late_pct",
+                            "title": "Terlambat (%)",
+                            "format": ".1f",
+                        },
+                    ],
+                },
+            },
+        ],
+        resolve={"scale": {"y": "independent"}},
+    )
+
+
+def late_percentage_by_category(category_detail, top_n=15):
+    """Persentase keterlambatan kategori dengan order terbanyak"""
+    overall = float(
+        category_detail["Total Terlambat"].sum()
+        / category_detail["Total Order"].sum()
+        * 100
+    )
+    top = category_detail.nlargest(top_n, "Total Order")
+    frame = pd.DataFrame(
+        {
+            "category": top.index.astype(str),
+            "late_pct": top["Persen Terlambat"].to_numpy(),
+            "orders": top["Total Order"].to_numpy(),
+            "score": top["Mean Score"].to_numpy(),
+            "above_mean": top["Persen Terlambat"].to_numpy() > overall,
+        }
+    )
+    x = {
+        "field": "late_pct",
+        "type": "quantitative",
+        "title": "Persentase Terlambat (%)",
+    }
+    y = {
+        "field": "category",
+        "type": "nominal",
+        "title": "Kategori Produk",
+        "sort": "x",
+    }
+    return _spec(
+        f"Persentase Keterlambatan {top_n} Kategori Teratas",
+        frame,
+        layer=[
+            {
+                "mark": "bar",
+                "encoding": {
+                    "x": x,
+                    "y": y,
+                    "color": {
+                        "condition": {"test": "datum.above_mean", "value": "#e74c3c"},
+                        "value": "#f39c12",
+                    },
+                    "tooltip": [
+                        _tooltip(y),
+                        _tooltip(x, ".1f"),
+                        {"field": "orders", "title": "Total Order", "format": ","},
+                        {"field": "score", "title": "Mean Score", "format": ".2f"},
+                    ],
+                },
+            },
+            _mean_rule(overall, "x", "blue", f"Keseluruhan: {overall:.1f}%"),
+        ],
+    )
+
+
+SPECS = {
+    "score_distribution": score_distribution,
+    "delivery_status_pie": delivery_status_pie,
+    "delivery_histogram": delivery_histogram,
+    "delivery_boxplot": delivery_boxplot,
+    "avg_delivery_by_score": avg_delivery_by_score,
+    "score_heatmap": score_heatmap,
+    "late_percentage_by_state": late_percentage_by_state,
+    "state_barplot": state_barplot,
+    "delivery_time_by_state": delivery_time_by_state,
+    "monthly_trend": monthly_trend,
+    "day_distribution": day_distribution,
+    "delivery_by_distance": delivery_by_distance,
+    "late_percentage_by_category": late_percentage_by_category,
+}
+
+
+def payload_bytes(spec):
+    """Ukuran spesifikasi sebagai JSON (yang dikirim ke browser)"""
+    return len(json.dumps(spec, separators=(",", ":")))
@@ -0,0 +1,172 @@
+"""Data siap-chart dari sel cube yang sudah difilter.
+
+Setiap fungsi menghasilkan input satu chart atau tabel dashboard dari sel
+cube (``cube.filter_cube``), sehingga dashboard dan benchmark memakai
+agregasi yang sama persis. View kategori produk dibaca dari rollup bulanan
+yang dibangun pipeline.
+"""
+
+import pandas as pd
+
+import cube
+import density
+
+DELIVERY_BINS = [0, 7, 14, 21, 30, float("inf")]
+DELIVERY_BIN_LABELS = ["0-7", "8-14", "15-21", "22-30", ">30"]
+# Kolom aditif rollup kategori (stage ``category_rollup`` pipeline)
+CATEGORY_MEASURES = [
+    "orders",
+    "late_orders",
+    "delivery_sum",
+    "review_count",
+    "review_sum",
+    "items",
+    "price_sum",
+]
+
+
+def score_counts(cells):
+    """Jumlah order per skor review"""
+    return cube.rollup(cells, "review_score")["count"]
+
+
+def status_counts(cells):
+    """Jumlah order per status pengiriman, terbanyak dulu"""
+    counts = cube.rollup(cells, "is_late")["count"]
+    counts.index = cube.status_labels(counts.index)
+    return counts.sort_values(ascending=False)
+
+
+def avg_delivery_by_score(cells):
+    """Rata-rata waktu pengiriman per skor review"""
+    totals = cube.rollup(cells, "review_score")
+    return totals["delivery_sum"] / totals["count"]
+
+
+def delivery_counts(cells):
+    """Jumlah order per hari waktu pengiriman (input ``density``)"""
+    return cube.rollup(cells, "delivery_time")["count"]
+
+
+def delivery_boxes(cells):
+    """Statistik boxplot waktu pengiriman per skor review (``density.box_stats``)"""
+    counts = cube.rollup(cells, ["review_score", "delivery_time"])["count"]
+    return [
+        density.box_stats(group.droplevel(0), label=int(score))
+        for score, group in counts.groupby(level=0)
+    ]
+
+
+def score_heatmap(cells):
+    """Jumlah order per kelas waktu pengiriman (baris) dan skor (kolom)"""
+    delivery_bin = pd.cut(
+        cells["delivery_time"], bins=DELIVERY_BINS, labels=DELIVERY_BIN_LABELS
+    ).rename("delivery_bin")
+    return (
+        cells.groupby([delivery_bin, "review_score"], observed=True)["count"]
+        .sum()
+        .unstack(fill_value=0)
+    )
+
+
+def score_detail(cells):
+    """Tabel "Detail per Skor Review" """
+    detail = cube.delivery_detail(cells, "review_score").round(2)
+    detail["Persen Terlambat"] = (detail["Terlambat"] / detail["Jumlah"] * 100).round(1)
+    return detail
+
+
+def late_percentage_by_state(cells):
+    """Persentase order terlambat per state"""
+    totals = cube.rollup(cells, "customer_state")
+    return totals["late_count"] / totals["count"] * 100
+
+
+def state_status_counts(cells):
+    """Jumlah order per (state, status pengiriman) dalam format long"""
+    counts = cube.rollup(cells, ["customer_state", "is_late"]).reset_index()
+    counts["delivery_status"] = cube.status_labels(counts.pop("is_late"))
+    return counts
+
+
+def state_delivery(cells):
+    """Rata-rata waktu pengiriman dan jumlah order per state"""
+    totals = cube.rollup(cells, "customer_state")
+    return pd.DataFrame(
+        {
+            "mean": totals["delivery_sum"] / totals["count"],
+            "count": totals["count"],
+        }
+    )
+
+
+def state_detail(cells):
+    """Tabel "Detail per State", order terbanyak dulu"""
+    totals = cube.rollup(cells, "customer_state")
+    detail = pd.DataFrame(
+        {
+            "Total Order": totals["count"],
+            "Mean Delivery": totals["delivery_sum"] / totals["count"],
+            "Total Terlambat": totals["late_count"],
+        }
+    ).round(2)
+    detail["Persen Terlambat"] = (
+        detail["Total Terlambat"] / detail["Total Order"] * 100
+    ).round(1)
+    return detail.sort_values("Total Order", ascending=False)
+
+
+def trend(cells):
+    """Tren bulanan, tabel "Detail per Bulan", dan jumlah order per hari.
+
+    Ketiganya diturunkan dari satu rollup (bulan, hari).
+    """
+    buckets = cube.time_buckets(cells)
+    month_totals = buckets.groupby(level="month_id").sum()
+    month_totals.index = cube.month_labels(month_totals.index)
+    monthly = pd.DataFrame(
+        {
+            "order_id": month_totals["count"],
+            "delivery_time": month_totals["delivery_sum"] / month_totals["count"],
+            "review_score": month_totals["score_sum"] / month_totals["count"],
+        }
+    )
+
+    monthly_stats = monthly.assign(Terlambat=month_totals["late_count"]).round(2)
+    monthly_stats.columns = ["Total Order", "Mean Delivery", "Mean Score", "Terlambat"]
+    monthly_stats["Persen Terlambat"] = (
+        monthly_stats["Terlambat"] / monthly_stats["Total Order"] * 100
+    ).round(1)
+
+    day_counts = buckets.groupby(level="weekday")["count"].sum().reindex(range(7))
+    day_counts.index = cube.WEEKDAY_NAMES
+    return monthly, monthly_stats, day_counts
+
+
+def category_summary(rollup, date_range=None):
+    """Tabel "Detail per Kategori" dari rollup bulanan, order terbanyak dulu.
+
+    ``rollup`` adalah hasil stage ``category_rollup`` pipeline (satu baris per
+    kategori dan bulan ``YYYY-MM``). ``date_range`` memilih bulan yang
+    beririsan dengan rentang tanggal.
+    """
+    if date_range is not None:
+        start, end = (pd.Timestamp(d).strftime("%Y-%m") for d in date_range)
+        rollup = rollup[rollup["month"].between(start, end)]
+    totals = rollup.groupby("product_category", observed=True)[CATEGORY_MEASURES].sum()
+    totals = totals[totals["orders"] > 0]
+    detail = pd.DataFrame(
+        {
+            "Total Order": totals["orders"],
+            "Mean Delivery": totals["delivery_sum"] / totals["orders"],
+            "Mean Score": totals["review_sum"] / totals["review_count"],
+            "Total Item": totals["items"],
+            "Mean Harga": totals["price_sum"] / totals["items"],
+            "Total Terlambat": totals["late_orders"],
+        }
+    ).round(2)
+    detail["Persen Terlambat"] = (
+        detail["Total Terlambat"] / detail["Total Order"] * 100
+    ).round(1)
+    detail.index = detail.index.astype(str).rename("Kategori")
+    return detail.sort_values("Total Order", ascending=False)
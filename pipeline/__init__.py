@@ -0,0 +1,21 @@
+"""Pipeline ETL headless untuk dataset dashboard.
+
+Menggantikan cell cleaning, merge, dan export di ``notebook.ipynb`` sehingga
+``dashboard/orders_reviews.csv`` dan ``dashboard/geo_orders.csv`` bisa dibangun
+ulang terjadwal tanpa kernel Jupyter::
+
+    python -m pipeline --data-dir data --out-dir dashboard
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+DASHBOARD_DIR = os.path.join(ROOT_DIR, "dashboard")
+
+# Format snapshot dipakai bersama dengan dashboard (modul datar di dashboard/)
+if DASHBOARD_DIR not in sys.path:
+    sys.path.append(DASHBOARD_DIR)
+
+from pipeline.build import run_pipeline  # noqa: E402
@@ -0,0 +1,68 @@
+"""Entry point command-line: ``python -m pipeline``"""
+
+import argparse
+import json
+
+from pipeline import DASHBOARD_DIR, DATA_DIR, ingest
+from pipeline.build import DEFAULT_LOOKBACK_DAYS, run_pipeline
+from pipeline.etl import format_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pipeline",
+        description="Bangun ulang dataset dashboard dari CSV Olist mentah",
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR, help="folder CSV Olist")
+    parser.add_argument("--out-dir", default=DASHBOARD_DIR, help="folder output")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="proses hanya order baru/berubah sejak build terakhir",
+    )
+    parser.add_argument(
+        "--lookback-days",
+        type=int,
+        default=DEFAULT_LOOKBACK_DAYS,
+        help="jendela order yang diproses ulang sebelum high-water mark",
+    )
+    parser.add_argument(
+        "--no-csv",
+        action="store_true",
+        help="jangan tulis CSV dashboard (mode incremental tidak pernah menulis CSV)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="jumlah worker ingestion paralel (full build)"
+    )
+    parser.add_argument(
+        "--executor",
+        choices=sorted(ingest.EXECUTORS),
+        default=ingest.DEFAULT_EXECUTOR,
+        help="pool ingestion paralel: thread atau process",
+    )
+    parser.add_argument("--report-json", help="simpan laporan per stage ke file JSON")
+    args = parser.parse_args(argv)
+
+    report = []
+    orders_reviews, geo_orders = run_pipeline(
+        args.data_dir,
+        args.out_dir,
+        incremental=args.incremental,
+        lookback_days=args.lookback_days,
+        csv=not args.no_csv,
+        report=report,
+        workers=args.workers,
+        executor=args.executor,
+    )
+
+    print(format_report(report))
+    print(f"\n- orders_reviews: {len(orders_reviews)} baris diproses")
+    print(f"- geo_orders: {len(geo_orders)} baris diproses")
+
+    if args.report_json:
+        with open(args.report_json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
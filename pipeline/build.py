@@ -0,0 +1,507 @@
+"""Build dataset dashboard: full rebuild atau incremental.
+
+Output ditulis sebagai dataset terpartisi per bulan pembelian
+(``<out_dir>/<nama>.parts/<YYYY-MM>.snap``). Mode full membangun semua
+partisi dari nol. Mode incremental memakai high-water mark
+(``order_purchase_timestamp``, ``order_id``) dan tanggal review terakhir yang
+disimpan di ``<out_dir>/_pipeline/state.json``, lalu hanya memproses order di
+jendela ``lookback_days`` sebelum high-water mark (order baru dan order yang
+statusnya mungkin berubah) ditambah order yang mendapat review baru. Baris
+order tersebut di-upsert ke partisi bulannya. Star schema diperbarui dari
+order yang sama (baris lain diambil dari build sebelumnya, lihat
+``pipeline/star.py``) dan ``category_rollup`` hanya dihitung ulang untuk bulan
+pembelian order tersebut.
+
+Setiap partisi diurutkan secara kanonik dan baris sebuah order hanya
+bergantung pada order itu sendiri, reviewnya, pelanggannya, itemnya, dan
+``geo_agg``, sehingga hasil incremental identik dengan full rebuild selama
+perubahan data sumber berada di dalam jendela lookback. Jika
+``geolocation_dataset.csv`` atau ``sellers_dataset.csv`` berubah, semua baris
+geo bisa berubah sehingga build otomatis menjadi full.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import snapshot
+from pipeline import geocode, ingest, rollup, star
+from pipeline.etl import (
+    BUILD_TABLES,
+    CUSTOMERS_COLUMNS,
+    ORDER_ITEMS_COLUMNS,
+    REVIEWS_COLUMNS,
+    SELLERS_COLUMNS,
+    add_seller_distances,
+    aggregate_geolocation,
+    derive_delivery,
+    export_csv,
+    filter_reviews,
+    merge_geo_orders,
+    merge_orders_reviews,
+    read_orders,
+    seller_distances,
+    track_stage,
+)
+
+STATE_DIR = "_pipeline"
+DEFAULT_LOOKBACK_DAYS = 30
+CHUNKSIZE = 500_000
+
+# Urutan kanonik baris di dalam setiap partisi
+SORT_KEYS = {
+    "orders_reviews": ["order_purchase_timestamp", "order_id", "review_score"],
+    "geo_orders": ["order_id"],
+}
+# Kolom hasil merge left bisa int atau float tergantung data; dibakukan
+PARTITION_DTYPES = {"geo_orders": {"geolocation_zip_code_prefix": "float64"}}
+
+
+def state_path(out_dir):
+    """Path ``state.json`` pipeline di folder output"""
+    return os.path.join(out_dir, STATE_DIR, "state.json")
+
+
+def read_state(out_dir):
+    """Membaca state build terakhir, ``None`` jika belum pernah build"""
+    path = state_path(out_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_state(out_dir, state):
+    """Menyimpan state build secara atomik"""
+    path = state_path(out_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def file_signature(path):
+    """Ukuran dan mtime file, untuk mendeteksi perubahan data sumber"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def purchase_months(timestamps):
+    """Kunci partisi ``YYYY-MM`` dari timestamp pembelian (NaT menjadi NaN).
+
+    Bulan dihitung dengan ``astype("M8[M]")``; hanya bulan unik yang
+    diformat menjadi string.
+    """
+    months = timestamps.to_numpy(dtype="M8[ns]").astype("M8[M]")
+    unique, inverse = np.unique(months, return_inverse=True)
+    labels = np.datetime_as_string(unique, unit="M").astype(object)
+    labels[np.isnat(unique)] = np.nan
+    return pd.Series(labels[inverse], index=timestamps.index)
+
+
+def orders_high_water_mark(orders):
+    """(timestamp, order_id) terbesar dari frame orders mentah"""
+    orders = orders.dropna(subset=["order_purchase_timestamp"])
+    last = orders.sort_values(["order_purchase_timestamp", "order_id"]).iloc[-1]
+    return {
+        "order_purchase_timestamp": last["order_purchase_timestamp"].isoformat(),
+        "order_id": last["order_id"],
+    }
+
+
+def canonical(df, name):
+    """Bakukan dtype dan urutan baris sebelum ditulis ke partisi"""
+    df = df.astype(PARTITION_DTYPES.get(name, {}))
+    return df.sort_values(SORT_KEYS[name], kind="stable").reset_index(drop=True)
+
+
+def write_partitions(df, months, path):
+    """Tulis ulang seluruh dataset terpartisi dari nol"""
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    for month, part in df.groupby(months.to_numpy(), sort=True):
+        snapshot.write_snapshot(
+            canonical(part, _dataset_name(path)), snapshot.partition_path(path, month)
+        )
+    return snapshot.write_manifest(path)
+
+
+def upsert_partitions(rows, months, path, order_ids, touched_months):
+    """Ganti baris ``order_ids`` di partisi ``touched_months`` dengan ``rows``"""
+    name = _dataset_name(path)
+    os.makedirs(path, exist_ok=True)
+    for month in sorted(touched_months):
+        part_path = snapshot.partition_path(path, month)
+        frames = []
+        if os.path.exists(part_path):
+            old = snapshot.read_snapshot(part_path, mmap=False)
+            frames.append(old[~old["order_id"].isin(order_ids)])
+        frames.append(rows[months.to_numpy() == month])
+        part = snapshot.concat_frames(frames)
+
+        if len(part):
+            snapshot.write_snapshot(canonical(part, name), part_path)
+        elif os.path.exists(part_path):
+            shutil.rmtree(part_path)
+    return snapshot.write_manifest(path)
+
+
+def _dataset_name(path):
+    return os.path.basename(path)[: -len(snapshot.PARTITIONS_SUFFIX)]
+
+
+def _order_months(orders_clean, df):
+    """Bulan pembelian setiap baris ``df`` berdasarkan ``order_id``"""
+    month_by_order = pd.Series(
+        purchase_months(orders_clean["order_purchase_timestamp"]).to_numpy(),
+        index=orders_clean["order_id"].to_numpy(),
+    )
+    month_by_order = month_by_order[~month_by_order.index.duplicated()]
+    return pd.Series(month_by_order.reindex(df["order_id"].to_numpy()).to_numpy())
+
+
+def build_full(
+    data_dir,
+    out_dir,
+    csv=True,
+    report=None,
+    workers=None,
+    executor=ingest.DEFAULT_EXECUTOR,
+):
+    """Full rebuild: semua stage, semua partisi, lalu catat high-water mark.
+
+    Tabel ``BUILD_TABLES`` dan kolom star schema dibaca paralel di stage
+    ``ingest``; geolokasi tetap di-stream per chunk di stage ``geo_agg``.
+    """
+    report = [] if report is None else report
+
+    with track_stage(report, "ingest") as stage:
+        stage["tables"] = []
+        tables = ingest.read_tables(
+            data_dir,
+            _ingest_columns(),
+            workers=workers,
+            executor=executor,
+            report=stage["tables"],
+        )
+        stage["rows"] = sum(t["rows"] for t in stage["tables"])
+
+    with track_stage(report, "orders") as stage:
+        orders = tables["orders"]
+        orders_clean = derive_delivery(orders)
+        stage["rows"] = len(orders_clean)
+
+    with track_stage(report, "reviews") as stage:
+        reviews = filter_reviews(tables["order_reviews"])
+        stage["rows"] = len(reviews)
+
+    with track_stage(report, "orders_reviews") as stage:
+        orders_reviews = merge_orders_reviews(orders_clean, reviews)
+        stage["rows"] = len(orders_reviews)
+
+    customers = tables["customers"]
+
+    with track_stage(report, "geo_agg") as stage:
+        geo_agg = aggregate_geolocation(data_dir)
+        snapshot.write_snapshot(geo_agg, _geo_agg_path(out_dir))
+        index = geocode.build_index(geo_agg)
+        geocode.write_index(index, geocode_path(out_dir))
+        stage["rows"] = len(geo_agg)
+
+    with track_stage(report, "geo_orders") as stage:
+        geo_orders = merge_geo_orders(orders_clean, customers, geo_agg)
+        stage["rows"] = len(geo_orders)
+
+    with track_stage(report, "seller_distance") as stage:
+        items = tables["order_items"][ORDER_ITEMS_COLUMNS]
+        distances = seller_distances(
+            items, tables["sellers"][SELLERS_COLUMNS], geo_orders, index
+        )
+        geo_orders = add_seller_distances(geo_orders, distances)
+        stage["rows"] = len(items)
+
+    build_star_rollup(tables, reviews, index, out_dir, csv=csv, report=report)
+
+    datasets = {"orders_reviews": orders_reviews, "geo_orders": geo_orders}
+    with track_stage(report, "export") as stage:
+        if csv:
+            export_csv(datasets, out_dir)
+        for name, df in datasets.items():
+            write_partitions(
+                df,
+                _order_months(orders_clean, df),
+                snapshot.partitions_path(out_dir, name),
+            )
+        stage["rows"] = len(orders_reviews) + len(geo_orders)
+
+    write_state(
+        out_dir,
+        {
+            "mode": "full",
+            "orders_hwm": orders_high_water_mark(orders),
+            "reviews_hwm": reviews["review_creation_date"].max().isoformat(),
+            "geolocation": file_signature(
+                os.path.join(data_dir, "geolocation_dataset.csv")
+            ),
+            "sellers": file_signature(os.path.join(data_dir, "sellers_dataset.csv")),
+        },
+    )
+    return orders_reviews, geo_orders
+
+
+def build_star_rollup(
+    tables, reviews, index, out_dir, csv=True, report=None, months=None
+):
+    """Stage ``star`` dan ``category_rollup``.
+
+    Baris star schema untuk id di ``tables`` dibangun ulang; id lain
+    mempertahankan key dan barisnya dari build sebelumnya di ``out_dir``.
+    ``months`` (``YYYY-MM``) membatasi rollup yang dihitung ulang ke bulan
+    tersebut; baris bulan lain diambil dari rollup sebelumnya.
+    """
+    report = [] if report is None else report
+    with track_stage(report, "star") as stage:
+        star_tables = star.build_star(
+            tables, reviews, index, star.read_previous(out_dir)
+        )
+        star.write_star(star_tables, out_dir)
+        stage["rows"] = len(tables["orders"])
+
+    with track_stage(report, "category_rollup") as stage:
+        category_rollup = rollup.build_category_rollup(star_tables, months)
+        path = snapshot.snapshot_path(out_dir, rollup.CATEGORY_ROLLUP)
+        if months is not None:
+            category_rollup = rollup.upsert_category_rollup(
+                snapshot.read_snapshot(path, mmap=False), category_rollup, months
+            )
+        if csv:
+            export_csv({rollup.CATEGORY_ROLLUP: category_rollup}, out_dir)
+        snapshot.write_snapshot(category_rollup, path)
+        stage["rows"] = len(category_rollup)
+    return star_tables, category_rollup
+
+
+def _ingest_columns():
+    """Proyeksi kolom ingest full build: ``BUILD_TABLES`` + kolom star schema"""
+    columns = {name: list(cols) for name, cols in BUILD_TABLES.items()}
+    for name, cols in star.STAR_TABLES.items():
+        columns[name] = list(dict.fromkeys([*columns.get(name, []), *cols]))
+    return columns
+
+
+def _read_matching(data_dir, name, column, values, columns):
+    """Baris tabel ``name`` dengan ``column`` di ``values``, dibaca per chunk"""
+    chunks = ingest.iter_table(data_dir, name, columns, CHUNKSIZE)
+    df = ingest.concat_chunks(chunk[chunk[column].isin(values)] for chunk in chunks)
+    return df.reset_index(drop=True)
+
+
+def _read_reviews_since(data_dir, since):
+    """Review skor 1-5 dengan ``review_creation_date >= since``, dibaca per chunk"""
+    chunks = ingest.iter_table(data_dir, "order_reviews", REVIEWS_COLUMNS, CHUNKSIZE)
+    df = ingest.concat_chunks(
+        filter_reviews(chunk[chunk["review_creation_date"] >= since])
+        for chunk in chunks
+    )
+    return df.reset_index(drop=True)
+
+
+def build_incremental(
+    data_dir, out_dir, lookback_days=DEFAULT_LOOKBACK_DAYS, report=None
+):
+    """Incremental: proses ulang hanya order baru/berubah lalu upsert partisi.
+
+    Star schema diperbarui untuk order tersebut dan ``category_rollup`` untuk
+    bulan pembeliannya; tabel sumber lain hanya dibaca baris yang dirujuk.
+    """
+    report = [] if report is None else report
+    state = read_state(out_dir)
+    geolocation_file = os.path.join(data_dir, "geolocation_dataset.csv")
+    sellers_file = os.path.join(data_dir, "sellers_dataset.csv")
+    if (
+        state is None
+        or state["geolocation"] != file_signature(geolocation_file)
+        or state.get("sellers") != file_signature(sellers_file)
+        or not os.path.exists(_geo_agg_path(out_dir))
+        or not os.path.exists(geocode_path(out_dir))
+    ):
+        # Belum ada basis, atau geo_agg/lokasi seller berubah: semua baris
+        # geo bisa berubah
+        return build_full(data_dir, out_dir, csv=False, report=report)
+
+    lookback = pd.Timedelta(days=lookback_days)
+    orders_cutoff = pd.Timestamp(state["orders_hwm"]["order_purchase_timestamp"])
+    reviews_cutoff = pd.Timestamp(state["reviews_hwm"]) - lookback
+    window_start = orders_cutoff - lookback
+    # Review dibuat setelah pembelian, jadi review order di jendela lookback
+    # tidak lebih lama dari awal jendela
+    reviews_since = min(reviews_cutoff, window_start)
+
+    with track_stage(report, "reviews") as stage:
+        reviews = _read_reviews_since(data_dir, reviews_since)
+        review_orders = reviews.loc[
+            reviews["review_creation_date"] >= reviews_cutoff, "order_id"
+        ].unique()
+        stage["rows"] = len(reviews)
+
+    with track_stage(report, "orders") as stage:
+        chunks = []
+        for chunk in read_orders(data_dir, chunksize=CHUNKSIZE):
+            recent = chunk["order_purchase_timestamp"] >= window_start
+            selected = recent | chunk["order_id"].isin(review_orders)
+            chunks.append(chunk[selected])
+        orders = pd.concat(chunks, ignore_index=True)
+        orders_clean = derive_delivery(orders)
+        order_ids = orders["order_id"].unique()
+        stage["rows"] = len(orders)
+
+    with track_stage(report, "reviews_history") as stage:
+        # Order lama yang mendapat review baru bisa punya review sebelum
+        # ``reviews_since``; hanya review order tersebut yang dibaca ulang
+        older = orders.loc[
+            ~(orders["order_purchase_timestamp"] >= window_start), "order_id"
+        ].unique()
+        earlier = reviews.iloc[:0]
+        if len(older):
+            earlier = filter_reviews(
+                _read_matching(
+                    data_dir, "order_reviews", "order_id", older, REVIEWS_COLUMNS
+                )
+            )
+            earlier = earlier[earlier["review_creation_date"] < reviews_since]
+            reviews = pd.concat([reviews, earlier], ignore_index=True)
+        stage["rows"] = len(earlier)
+
+    with track_stage(report, "orders_reviews") as stage:
+        orders_reviews = merge_orders_reviews(
+            orders_clean, reviews[reviews["order_id"].isin(order_ids)]
+        )
+        stage["rows"] = len(orders_reviews)
+
+    with track_stage(report, "customers") as stage:
+        customers = _read_matching(
+            data_dir,
+            "customers",
+            "customer_id",
+            orders["customer_id"].unique(),
+            CUSTOMERS_COLUMNS,
+        )
+        stage["rows"] = len(customers)
+
+    with track_stage(report, "geo_orders") as stage:
+        geo_agg = snapshot.read_snapshot(_geo_agg_path(out_dir))
+        geo_orders = merge_geo_orders(orders_clean, customers, geo_agg)
+        stage["rows"] = len(geo_orders)
+
+    columns = _ingest_columns()
+    with track_stage(report, "seller_distance") as stage:
+        items = _read_matching(
+            data_dir, "order_items", "order_id", order_ids, columns["order_items"]
+        )
+        sellers = ingest.read_table(data_dir, "sellers", columns["sellers"])
+        index = geocode.read_index(geocode_path(out_dir))
+        distances = seller_distances(
+            items[ORDER_ITEMS_COLUMNS], sellers[SELLERS_COLUMNS], geo_orders, index
+        )
+        geo_orders = add_seller_distances(geo_orders, distances)
+        stage["rows"] = len(items)
+
+    with track_stage(report, "upsert") as stage:
+        touched_months = set(
+            purchase_months(orders["order_purchase_timestamp"].dropna())
+        )
+        for name, df in (
+            ("orders_reviews", orders_reviews),
+            ("geo_orders", geo_orders),
+        ):
+            upsert_partitions(
+                df,
+                _order_months(orders_clean, df),
+                snapshot.partitions_path(out_dir, name),
+                order_ids,
+                touched_months,
+            )
+        stage["rows"] = len(orders_reviews) + len(geo_orders)
+
+    with track_stage(report, "star_ingest") as stage:
+        # Hanya baris yang dirujuk order berubah; sisanya dari build sebelumnya
+        tables = {
+            "orders": orders,
+            "customers": customers,
+            "order_items": items,
+            "order_payments": _read_matching(
+                data_dir,
+                "order_payments",
+                "order_id",
+                order_ids,
+                columns["order_payments"],
+            ),
+            "products": _read_matching(
+                data_dir,
+                "products",
+                "product_id",
+                items["product_id"].unique(),
+                columns["products"],
+            ),
+            "sellers": sellers[sellers["seller_id"].isin(items["seller_id"])],
+            "product_category_name_translation": ingest.read_table(
+                data_dir,
+                "product_category_name_translation",
+                columns["product_category_name_translation"],
+            ),
+        }
+        stage["rows"] = sum(len(df) for df in tables.values())
+
+    build_star_rollup(
+        tables,
+        reviews[reviews["order_id"].isin(order_ids)],
+        index,
+        out_dir,
+        csv=False,
+        report=report,
+        months=touched_months,
+    )
+
+    hwm = orders_high_water_mark(orders)
+    if (hwm["order_purchase_timestamp"], hwm["order_id"]) < (
+        state["orders_hwm"]["order_purchase_timestamp"],
+        state["orders_hwm"]["order_id"],
+    ):
+        hwm = state["orders_hwm"]
+    last_review = reviews["review_creation_date"].max()
+    if pd.notna(last_review):
+        state["reviews_hwm"] = max(state["reviews_hwm"], last_review.isoformat())
+    state.update({"mode": "incremental", "orders_hwm": hwm})
+    write_state(out_dir, state)
+    return orders_reviews, geo_orders
+
+
+def _geo_agg_path(out_dir):
+    return os.path.join(out_dir, STATE_DIR, "geo_agg" + snapshot.SNAPSHOT_SUFFIX)
+
+
+def geocode_path(out_dir):
+    """Path index geocoding prefix kode pos hasil build terakhir"""
+    return os.path.join(out_dir, STATE_DIR, "geocode" + snapshot.SNAPSHOT_SUFFIX)
+
+
+def run_pipeline(
+    data_dir,
+    out_dir,
+    incremental=False,
+    lookback_days=DEFAULT_LOOKBACK_DAYS,
+    csv=True,
+    report=None,
+    workers=None,
+    executor=ingest.DEFAULT_EXECUTOR,
+):
+    """Jalankan build full atau incremental, kembalikan baris yang diproses"""
+    if incremental:
+        return build_incremental(data_dir, out_dir, lookback_days, report=report)
+    return build_full(
+        data_dir, out_dir, csv=csv, report=report, workers=workers, executor=executor
+    )
@@ -0,0 +1,341 @@
+"""Stage ETL: cleaning orders/reviews, agregasi geolokasi, merge, dan export CSV.
+
+Setiap stage hanya membaca kolom yang dibutuhkan; dtype dan kolom tanggal
+setiap tabel dideklarasikan di ``pipeline.ingest.TABLES``. Logika
+transformasinya sama dengan cell di ``notebook.ipynb``.
+"""
+
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import snapshot
+from pipeline import geocode, ingest
+
+ORDERS_COLUMNS = ["order_id", "customer_id", "order_status", *snapshot.DATE_COLUMNS]
+REVIEWS_COLUMNS = ["order_id", "review_score", "review_creation_date"]
+CUSTOMERS_COLUMNS = ["customer_id", "customer_zip_code_prefix", "customer_state"]
+ORDER_ITEMS_COLUMNS = ["order_id", "seller_id"]
+SELLERS_COLUMNS = ["seller_id", "seller_zip_code_prefix"]
+GEOLOCATION_COLUMNS = [
+    "geolocation_zip_code_prefix",
+    "geolocation_lat",
+    "geolocation_lng",
+    "geolocation_city",
+    "geolocation_state",
+]
+
+# Tabel dan proyeksi kolom yang dibaca paralel di awal full build
+BUILD_TABLES = {
+    "orders": ORDERS_COLUMNS,
+    "order_reviews": REVIEWS_COLUMNS,
+    "customers": CUSTOMERS_COLUMNS,
+    "order_items": ORDER_ITEMS_COLUMNS,
+    "sellers": SELLERS_COLUMNS,
+}
+
+# Batas koordinat wilayah Brasil (sama seperti cleaning di notebook)
+LNG_BOUNDS = (-74, -34)
+LAT_BOUNDS = (-34, 6)
+
+GEOLOCATION_CHUNKSIZE = 200_000
+
+# Radius rata-rata bumi (IUGG), untuk jarak haversine
+EARTH_RADIUS_KM = 6371.0088
+
+
+@contextmanager
+def track_stage(report, name):
+    """Mencatat durasi dan puncak memori satu stage ke ``report``"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    stats = {"stage": name, "rows": None}
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["seconds"] = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        stats["peak_mb"] = max(peak - base, 0) / 2**20
+        report.append(stats)
+
+
+def format_report(report):
+    """Tabel teks dari hasil ``track_stage`` (plus baris per tabel ingest)"""
+    tables = [t["table"] for s in report for t in s.get("tables", [])]
+    width = max([22] + [len(name) + 3 for name in tables])
+    lines = [f"{'stage':<{width}}{'baris':>12}{'detik':>10}{'peak MB':>10}"]
+    for s in report:
+        rows = "" if s["rows"] is None else f"{s['rows']:,}"
+        lines.append(
+            f"{s['stage']:<{width}}{rows:>12}{s['seconds']:>10.2f}"
+            f"{s['peak_mb']:>10.1f}"
+        )
+        for t in s.get("tables", []):
+            name = "  " + t["table"]
+            lines.append(f"{name:<{width}}{t['rows']:>12,}{t['seconds']:>10.2f}")
+    total = sum(s["seconds"] for s in report)
+    lines.append(f"{'total':<{width}}{'':>12}{total:>10.2f}")
+    return "\n".join(lines)
+
+
+def derive_delivery(orders):
+    """Filter order delivered lalu hitung metrik pengiriman"""
+    orders_clean = orders[orders["order_status"] == "delivered"]
+    orders_clean = orders_clean.dropna(
+        subset=[
+            "order_purchase_timestamp",
+            "order_delivered_customer_date",
+            "order_estimated_delivery_date",
+        ]
+    ).copy()
+
+    orders_clean["delivery_time"] = (
+        orders_clean["order_delivered_customer_date"]
+        - orders_clean["order_purchase_timestamp"]
+    ).dt.days
+    orders_clean["delivery_diff"] = (
+        orders_clean["order_estimated_delivery_date"]
+        - orders_clean["order_delivered_customer_date"]
+    ).dt.days
+    orders_clean["delivery_status"] = np.where(
+        orders_clean["delivery_diff"] < 0, "Terlambat", "Tepat Waktu"
+    )
+    return orders_clean
+
+
+def read_orders(data_dir, chunksize=None):
+    """Baca orders_dataset.csv (atau iterator chunk jika ``chunksize`` diisi)"""
+    if chunksize is not None:
+        return ingest.iter_table(data_dir, "orders", ORDERS_COLUMNS, chunksize)
+    return ingest.read_table(data_dir, "orders", ORDERS_COLUMNS)
+
+
+def clean_orders(data_dir):
+    """Stage orders: baca orders_dataset.csv dan turunkan metrik pengiriman"""
+    return derive_delivery(read_orders(data_dir))
+
+
+def filter_reviews(reviews):
+    """Hanya review dengan skor 1-5"""
+    return reviews[reviews["review_score"].between(1, 5)][REVIEWS_COLUMNS]
+
+
+def load_customers(data_dir):
+    """Stage customers: kode pos dan state pelanggan"""
+    return ingest.read_table(data_dir, "customers", CUSTOMERS_COLUMNS)
+
+
+def filter_bounds(geolocation):
+    """Buang koordinat di luar wilayah Brasil"""
+    return geolocation[
+        geolocation["geolocation_lng"].between(*LNG_BOUNDS)
+        & geolocation["geolocation_lat"].between(*LAT_BOUNDS)
+    ]
+
+
+def _first_valid(current, chunk_first):
+    """Nilai pertama per prefix: pertahankan yang sudah ada, isi yang kosong"""
+    if current is None:
+        return chunk_first
+    return current.combine_first(chunk_first)
+
+
+def _sorted_contains(sorted_values, values):
+    """Mask ``values`` yang ada di array terurut ``sorted_values``"""
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    pos = np.searchsorted(sorted_values, values)
+    pos[pos == len(sorted_values)] = 0
+    return sorted_values[pos] == values
+
+
+def aggregate_geolocation(data_dir, chunksize=GEOLOCATION_CHUNKSIZE):
+    """Stage geo_agg: rata-rata koordinat per prefix kode pos (streaming).
+
+    Setara dengan ``drop_duplicates`` + ``filter_bounds`` + groupby
+    mean/first di notebook, tetapi CSV dibaca per chunk. Yang disimpan antar
+    chunk hanya jumlah lat/lng, jumlah baris, dan kota/state pertama per
+    prefix, ditambah hash 64-bit baris unik (dan prefix-nya) untuk
+    deduplikasi lintas chunk.
+
+    Baris duplikat selalu punya prefix yang sama. Selama CSV terurut menurut
+    prefix, hash prefix yang sudah lewat tidak dibutuhkan lagi dan dibuang
+    setiap chunk, sehingga memori sebanding dengan jumlah prefix. Untuk CSV
+    yang tidak terurut (seperti file Olist asli) hash setiap baris unik harus
+    diingat: 16 byte per baris unik di dalam batas koordinat (~12 MB untuk
+    1 juta baris). Jika prefix yang hash-nya sudah dibuang muncul lagi,
+    agregasi diulang dari awal tanpa membuang hash.
+    """
+    geo_agg = _aggregate_geolocation(data_dir, chunksize, evict=True)
+    if geo_agg is None:
+        geo_agg = _aggregate_geolocation(data_dir, chunksize, evict=False)
+    return geo_agg
+
+
+def _aggregate_geolocation(data_dir, chunksize, evict):
+    """Isi ``aggregate_geolocation``; ``None`` bila prefix terbuang muncul lagi.
+
+    Hash baris baru setiap chunk diurutkan lalu disisipkan ke array terurut
+    dengan ``searchsorted``/``np.insert``: satu salinan linear per chunk,
+    tanpa mengurutkan ulang seluruh hash.
+    """
+    seen = np.empty(0, dtype=np.uint64)
+    seen_prefix = np.empty(0, dtype=np.int64)
+    # Prefix yang hash-nya sudah dibuang (terurut)
+    evicted = np.empty(0, dtype=np.int64)
+    last_prefix = None
+    sums = None
+    city = state = None
+    for chunk in ingest.iter_table(
+        data_dir, "geolocation", GEOLOCATION_COLUMNS, chunksize
+    ):
+        # Filter koordinat dulu: duplikat persis selalu lolos/gagal bersama
+        chunk = filter_bounds(chunk)
+        prefixes = chunk["geolocation_zip_code_prefix"].to_numpy(np.int64)
+        if _sorted_contains(evicted, prefixes).any():
+            return None
+        hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        new = ~pd.Series(hashes).duplicated().to_numpy() & ~_sorted_contains(
+            seen, hashes
+        )
+        chunk = chunk[new]
+        order = np.argsort(hashes[new])
+        fresh = hashes[new][order]
+        at = np.searchsorted(seen, fresh)
+        seen = np.insert(seen, at, fresh)
+        seen_prefix = np.insert(seen_prefix, at, prefixes[new][order])
+
+        # Input masih terurut: prefix sebelum prefix terakhir sudah selesai
+        if len(prefixes):
+            evict = evict and bool(
+                np.all(np.diff(prefixes) >= 0)
+                and (last_prefix is None or prefixes[0] >= last_prefix)
+            )
+            last_prefix = prefixes[-1]
+        if evict and last_prefix is not None:
+            done = seen_prefix < last_prefix
+            evicted = np.union1d(evicted, seen_prefix[done])
+            seen, seen_prefix = seen[~done], seen_prefix[~done]
+
+        grouped = chunk.groupby("geolocation_zip_code_prefix", sort=False)
+        chunk_sums = grouped.agg(
+            lat=("geolocation_lat", "sum"),
+            lng=("geolocation_lng", "sum"),
+            count=("geolocation_lat", "size"),
+        )
+        sums = chunk_sums if sums is None else sums.add(chunk_sums, fill_value=0)
+        firsts = grouped[["geolocation_city", "geolocation_state"]].first()
+        city = _first_valid(city, firsts["geolocation_city"].astype(object))
+        state = _first_valid(state, firsts["geolocation_state"].astype(object))
+
+    sums = sums.sort_index()
+    geo_agg = pd.DataFrame(
+        {
+            "geolocation_lat": sums["lat"] / sums["count"],
+            "geolocation_lng": sums["lng"] / sums["count"],
+            "geolocation_city": city.reindex(sums.index).astype("category"),
+            "geolocation_state": state.reindex(sums.index).astype("category"),
+        }
+    )
+    geo_agg.index = geo_agg.index.astype(np.int32)
+    return geo_agg.rename_axis("geolocation_zip_code_prefix").reset_index()
+
+
+def merge_orders_reviews(orders_clean, reviews_clean):
+    """Gabungkan order dengan skor review"""
+    return pd.merge(
+        orders_clean,
+        reviews_clean[["order_id", "review_score"]],
+        on="order_id",
+        how="inner",
+    )
+
+
+def merge_geo_orders(orders_clean, customers, geo_agg):
+    """Gabungkan order dengan lokasi pelanggan"""
+    orders_customers = pd.merge(
+        orders_clean[["order_id", "customer_id", "delivery_time", "delivery_status"]],
+        customers,
+        on="customer_id",
+        how="inner",
+    )
+    geo_orders = pd.merge(
+        orders_customers,
+        geo_agg,
+        left_on="customer_zip_code_prefix",
+        right_on="geolocation_zip_code_prefix",
+        how="left",
+    )
+    return geo_orders.dropna(subset=["geolocation_lat", "geolocation_lng"])
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Jarak lingkaran besar (km) antar pasangan koordinat, tervektorisasi"""
+    lat1, lng1, lat2, lng2 = (
+        np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lng1, lat2, lng2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def seller_distances(items, sellers, geo_orders, index):
+    """Jarak seller-pelanggan per order: maksimum dan rata-rata antar item.
+
+    Koordinat seller diambil dari index geocoding (prefix terdekat jika kode
+    pos tidak ada), koordinat pelanggan dari ``geo_orders``.
+    """
+    seller_zip = pd.Series(
+        sellers["seller_zip_code_prefix"].to_numpy(),
+        index=sellers["seller_id"].to_numpy(),
+    )
+    seller_zip = seller_zip[~seller_zip.index.duplicated()]
+    zips = seller_zip.reindex(items["seller_id"].to_numpy()).to_numpy()
+    seller_lat, seller_lng, _ = geocode.lookup(index, zips, nearest=True)
+
+    customers = geo_orders.drop_duplicates("order_id").set_index("order_id")
+    rows = customers.index.get_indexer(items["order_id"])
+    found = rows >= 0
+    customer_lat = np.where(
+        found, customers["geolocation_lat"].to_numpy(dtype=np.float64)[rows], np.nan
+    )
+    customer_lng = np.where(
+        found, customers["geolocation_lng"].to_numpy(dtype=np.float64)[rows], np.nan
+    )
+
+    km = pd.Series(
+        haversine_km(seller_lat, seller_lng, customer_lat, customer_lng),
+        name="km",
+    )
+    grouped = km.groupby(items["order_id"].to_numpy(), sort=False)
+    return (
+        pd.DataFrame(
+            {
+                "seller_customer_km_max": grouped.max(),
+                "seller_customer_km_mean": grouped.mean(),
+            }
+        )
+        .rename_axis("order_id")
+        .reset_index()
+    )
+
+
+def add_seller_distances(geo_orders, distances):
+    """Tambahkan kolom jarak seller-pelanggan ke ``geo_orders``"""
+    return pd.merge(geo_orders, distances, on="order_id", how="left")
+
+
+def export_csv(datasets, out_dir):
+    """Tulis dataset dashboard sebagai CSV (format hasil notebook)"""
+    os.makedirs(out_dir, exist_ok=True)
+    for name, df in datasets.items():
+        df.to_csv(snapshot.csv_path(out_dir, name), index=False)
@@ -0,0 +1,97 @@
+"""Index geocoding prefix kode pos -> koordinat.
+
+Index berupa tiga array paralel: prefix kode pos terurut (int32) serta
+latitude dan longitude (float32). Lookup memakai binary search
+(``np.searchsorted``) sehingga jutaan kunci bisa dicari sekaligus. Prefix
+yang tidak ada di index bisa diisi dengan prefix terdekat secara numerik
+(prefix yang berdekatan umumnya berada di wilayah yang sama).
+
+Index disimpan sebagai snapshot kolumnar (lihat ``dashboard/snapshot.py``)
+sehingga cukup dibangun sekali lalu di-memory-map saat dipakai.
+"""
+
+import numpy as np
+import pandas as pd
+
+import snapshot
+
+INDEX_COLUMNS = ["zip", "lat", "lng"]
+
+
+def build_index(geo_agg):
+    """Index dari ``geo_agg`` (satu baris per prefix kode pos)"""
+    zips = geo_agg["geolocation_zip_code_prefix"].to_numpy(dtype=np.int32)
+    order = np.argsort(zips, kind="stable")
+    return {
+        "zip": zips[order],
+        "lat": geo_agg["geolocation_lat"].to_numpy(dtype=np.float32)[order],
+        "lng": geo_agg["geolocation_lng"].to_numpy(dtype=np.float32)[order],
+    }
+
+
+def write_index(index, path):
+    """Simpan index sebagai snapshot di folder ``path``"""
+    snapshot.write_snapshot(pd.DataFrame(index, columns=INDEX_COLUMNS), path)
+
+
+def read_index(path, mmap=True):
+    """Baca index dari snapshot (default memory-map)"""
+    df = snapshot.read_snapshot(path, mmap=mmap)
+    return {col: df[col].to_numpy() for col in INDEX_COLUMNS}
+
+
+def lookup(index, zips, nearest=False, max_gap=None):
+    """Koordinat untuk setiap prefix di ``zips``.
+
+    Mengembalikan ``(lat, lng, exact)``. ``exact`` menandai prefix yang ada
+    di index. Prefix lain bernilai NaN, kecuali ``nearest=True``: koordinat
+    diambil dari prefix terdekat jika selisihnya tidak lebih dari
+    ``max_gap`` (tanpa batas jika ``None``). Kunci NaN tidak pernah cocok.
+    """
+    keys = np.asarray(zips)
+    if keys.dtype.kind not in "iu":
+        keys = pd.to_numeric(pd.Series(keys), errors="coerce").to_numpy(np.float64)
+        valid = ~np.isnan(keys)
+        keys = np.where(valid, keys, -1).astype(np.int64)
+    else:
+        valid = None
+    table = index["zip"]
+    if not len(table):
+        nan = np.full(len(keys), np.nan, dtype=np.float32)
+        return nan, nan.copy(), np.zeros(len(keys), dtype=bool)
+
+    pos = np.searchsorted(table, keys)
+    right = np.minimum(pos, len(table) - 1)
+    found = table[right] == keys
+    if valid is not None:
+        found &= valid
+    source = np.where(found, right, -1)
+
+    if nearest:
+        left = np.maximum(pos - 1, 0)
+        gap_left = np.abs(keys - table[left])
+        gap_right = np.abs(table[right] - keys)
+        closest = np.where(gap_left <= gap_right, left, right)
+        use = ~found
+        if max_gap is not None:
+            use &= np.minimum(gap_left, gap_right) <= max_gap
+        if valid is not None:
+            use &= valid
+        source = np.where(use, closest, source)
+
+    # -1 mengambil baris terakhir; ditimpa NaN di bawah
+    lat = index["lat"][source]
+    lng = index["lng"][source]
+    miss = source < 0
+    if miss.any():
+        lat[miss] = np.nan
+        lng[miss] = np.nan
+    return lat, lng, found
+
+
+def geocode(df, zip_column, index, prefix, nearest=True, max_gap=None):
+    """Salinan ``df`` dengan kolom ``<prefix>_lat``/``_lng``/``_exact``"""
+    lat, lng, exact = lookup(index, df[zip_column], nearest=nearest, max_gap=max_gap)
+    return df.assign(
+        **{f"{prefix}_lat": lat, f"{prefix}_lng": lng, f"{prefix}_exact": exact}
+    )
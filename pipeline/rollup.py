@@ -0,0 +1,140 @@
+"""Rollup per kategori produk dan bulan pembelian untuk dashboard.
+
+Kategori sudah di-dictionary-encode oleh star schema: ``fact_items``
+menyimpan ``category_key`` (int32) setiap item dan ``dim_category`` nama
+Portugis serta terjemahan Inggrisnya. Label setiap key diambil dari array
+lookup kecil (satu entri per kategori, ditambah satu entri untuk produk tanpa
+kategori), sehingga tidak ada merge string per baris.
+
+Setiap order delivered dihitung sekali untuk setiap kategori berbeda di
+item-itemnya, lalu dijumlahkan per (kategori, bulan): jumlah order, order
+terlambat, total hari pengiriman, jumlah dan total skor review, jumlah item,
+dan total harga. Semua kolom aditif, jadi view dashboard cukup menjumlahkan
+baris bulan yang dipilih lalu membagi (rata-rata, persen terlambat).
+
+Sel sebuah bulan hanya bergantung pada order yang dibeli di bulan itu, jadi
+build incremental menghitung ulang bulan yang disentuh order berubah saja
+(``months``) lalu mengganti baris bulan itu dengan ``upsert_category_rollup``.
+"""
+
+import numpy as np
+import pandas as pd
+
+import snapshot
+from pipeline import star
+
+CATEGORY_ROLLUP = "category_rollup"
+# Label untuk produk tanpa kategori atau tanpa baris di products_dataset.csv
+UNKNOWN_CATEGORY = "(tanpa kategori)"
+ROLLUP_COLUMNS = [
+    "product_category",
+    "month",
+    "orders",
+    "late_orders",
+    "delivery_sum",
+    "review_count",
+    "review_sum",
+    "items",
+    "price_sum",
+]
+
+
+def category_labels(dim_category):
+    """Array label per ``category_key``; entri terakhir untuk key ``-1``.
+
+    Terjemahan Inggris dipakai bila ada, selain itu nama Portugisnya.
+    """
+    english = dim_category["product_category_name_english"].astype(object)
+    labels = english.fillna(dim_category["product_category_name"].astype(object))
+    return np.append(labels.to_numpy(dtype=object), UNKNOWN_CATEGORY)
+
+
+def build_category_rollup(star_tables, months=None):
+    """Rollup aditif per (kategori, bulan) dari tabel star schema.
+
+    ``months`` (kumpulan ``YYYY-MM``) membatasi rollup ke bulan tersebut.
+    Baris diurutkan menurut label kategori lalu bulan.
+    """
+    fact = star_tables[star.FACT_TABLE]
+    items = star_tables[star.ITEMS_TABLE]
+    labels = category_labels(star_tables["dim_category"])
+
+    order_key = items["order_key"].to_numpy()
+    # Key -1 (tanpa kategori/produk) menunjuk entri terakhir array label
+    category_key = items["category_key"].to_numpy()
+    category_key = np.where(category_key < 0, len(labels) - 1, category_key)
+
+    timestamps = fact["order_purchase_timestamp"].to_numpy(dtype="M8[ns]")
+    delivered = (
+        (fact["order_status"] == "delivered").to_numpy()
+        & ~np.isnan(fact["delivery_time"].to_numpy())
+        & ~np.isnat(timestamps)
+    )
+    if months is not None:
+        selected = np.array(sorted(months), dtype="M8[M]")
+        delivered &= np.isin(timestamps.astype("M8[M]"), selected)
+    keep = delivered[order_key]
+    order_key, category_key = order_key[keep], category_key[keep]
+    price = items["price"].to_numpy(np.float64)[keep]
+
+    if not delivered.any():
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    month_id = timestamps.astype("M8[M]").astype(np.int64)
+    first_month = month_id[delivered].min()
+    n_months = int(month_id[delivered].max() - first_month + 1)
+    item_month = month_id[order_key] - first_month
+    n_cells = len(labels) * n_months
+
+    # Metrik item per sel (kategori, bulan)
+    item_cell = category_key.astype(np.int64) * n_months + item_month
+    item_count = np.bincount(item_cell, minlength=n_cells)
+    price_sum = np.bincount(item_cell, price, n_cells)
+
+    # Metrik order: satu kali per pasangan (order, kategori) unik
+    pairs = np.unique(order_key.astype(np.int64) * len(labels) + category_key)
+    pair_order = pairs // len(labels)
+    pair_cell = (pairs % len(labels)) * n_months + (month_id[pair_order] - first_month)
+    review_count = fact["review_count"].to_numpy(np.int64)[pair_order]
+    review_score = np.nan_to_num(fact["review_score"].to_numpy(np.float64))[pair_order]
+    sums = {
+        "orders": np.bincount(pair_cell, minlength=n_cells),
+        "late_orders": np.bincount(
+            pair_cell, fact["is_late"].to_numpy(np.float64)[pair_order], n_cells
+        ),
+        "delivery_sum": np.bincount(
+            pair_cell, fact["delivery_time"].to_numpy(np.float64)[pair_order], n_cells
+        ),
+        "review_count": np.bincount(pair_cell, review_count, n_cells),
+        "review_sum": np.bincount(pair_cell, review_score * review_count, n_cells),
+        "items": item_count,
+        "price_sum": price_sum,
+    }
+
+    cells = np.flatnonzero(sums["orders"])
+    cell_months = (first_month + cells % n_months).astype("M8[M]")
+    rollup = pd.DataFrame(
+        {
+            "product_category": pd.Categorical(labels[cells // n_months]),
+            "month": np.datetime_as_string(cell_months, unit="M"),
+            **{name: values[cells] for name, values in sums.items()},
+        }
+    )
+    # Semua kolom kecuali harga adalah jumlah bilangan bulat
+    integer = ROLLUP_COLUMNS[2:-1]
+    rollup[integer] = rollup[integer].round().astype(np.int64)
+    rollup["price_sum"] = rollup["price_sum"].round(2)
+    return _sorted(rollup[ROLLUP_COLUMNS])
+
+
+def _sorted(rollup):
+    """Urutan kanonik rollup: label kategori lalu bulan"""
+    rollup = rollup.sort_values(["product_category", "month"], ignore_index=True)
+    category = rollup["product_category"].cat.remove_unused_categories()
+    return rollup.assign(product_category=category)
+
+
+def upsert_category_rollup(previous, rollup, months):
+    """``previous`` dengan baris ``months`` diganti ``rollup`` bulan tersebut"""
+    previous = previous[~previous["month"].isin(list(months))]
+    rollup = snapshot.concat_frames([previous, rollup])[ROLLUP_COLUMNS]
+    return _sorted(rollup) if len(rollup) else rollup
@@ -0,0 +1,445 @@
+"""Star schema level order dengan surrogate key integer.
+
+Notebook menggabungkan tabel lewat ``pd.merge`` berulang pada id hex 32
+karakter (``order_id``, ``customer_id``), sedangkan order_items,
+order_payments, products, dan sellers tidak pernah ikut. Stage ``star``
+memetakan setiap id hex ke surrogate key ``int32`` yang rapat sekali saja,
+lalu membangun:
+
+- ``fact_orders``: satu baris per order dengan key customer, seller utama,
+  dan kategori produk utama (item pertama), metrik pengiriman, rata-rata skor
+  review, jumlah item/seller, total harga, ongkir, dan pembayaran
+- ``fact_items``: satu baris per item order dengan key order, produk,
+  seller, dan kategori beserta harga dan ongkirnya, untuk rollup level item
+  tanpa lookup id string lagi
+- dimensi kecil ``dim_order``, ``dim_customer``, ``dim_seller``,
+  ``dim_product``, dan ``dim_category``; key dimensi sama dengan posisi
+  barisnya sehingga join cukup ``dim.iloc[fact[key]]`` atau indexing array
+
+Key stabil antar build: kolom id dimensi yang sudah ditulis (urut menurut key)
+adalah map id -> key. Build berikutnya membaca star schema sebelumnya dengan
+``read_previous``; id lama mempertahankan key-nya dan id baru ditambahkan
+terurut di belakang, sehingga key yang sudah dipakai di luar pipeline tidak
+bergeser. Hanya baris id yang ada di tabel masukan yang dibangun ulang; baris
+lain (id yang hilang dari data sumber) diambil dari build sebelumnya. Build
+incremental memakai ini untuk memperbarui star schema hanya dari order yang
+berubah beserta item, pembayaran, customer, seller, dan produknya.
+
+Semua agregasi per order memakai ``np.bincount`` pada key integer, bukan
+groupby string. Key ``-1`` berarti tidak ada (mis. order tanpa item).
+Tabel ditulis sebagai snapshot kolumnar di ``<out_dir>/star/``.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import snapshot
+from pipeline import geocode
+
+STAR_DIR = "star"
+FACT_TABLE = "fact_orders"
+ITEMS_TABLE = "fact_items"
+DIMENSIONS = ["dim_order", "dim_customer", "dim_seller", "dim_product", "dim_category"]
+# Kolom id setiap dimensi; urut menurut key, kolom ini adalah map id -> key
+KEY_COLUMNS = {
+    "dim_order": "order_id",
+    "dim_customer": "customer_id",
+    "dim_seller": "seller_id",
+    "dim_product": "product_id",
+    "dim_category": "product_category_name",
+}
+KEY_COLUMN_BY_DIMENSION = {
+    "dim_order": "order_key",
+    "dim_customer": "customer_key",
+    "dim_seller": "seller_key",
+    "dim_product": "product_key",
+    "dim_category": "category_key",
+}
+
+# Kolom tambahan yang dibaca stage ingest untuk star schema
+STAR_TABLES = {
+    "order_items": [
+        "order_id",
+        "order_item_id",
+        "product_id",
+        "seller_id",
+        "price",
+        "freight_value",
+    ],
+    "order_payments": [
+        "order_id",
+        "payment_sequential",
+        "payment_type",
+        "payment_installments",
+        "payment_value",
+    ],
+    "products": ["product_id", "product_category_name", "product_weight_g"],
+    "sellers": ["seller_id", "seller_zip_code_prefix", "seller_state"],
+    "product_category_name_translation": [
+        "product_category_name",
+        "product_category_name_english",
+    ],
+}
+
+
+def id_index(ids):
+    """``pd.Index`` object untuk id string.
+
+    Hash table object jauh lebih cepat untuk ``get_indexer`` dan cek unik
+    daripada Index string Arrow.
+    """
+    return pd.Index(np.asarray(ids, dtype=object))
+
+
+def build_keys(ids, known=None):
+    """Dictionary id unik; key sebuah id adalah posisinya.
+
+    Id di ``known`` (dictionary build sebelumnya) mempertahankan posisinya;
+    id baru ditambahkan terurut di belakang.
+    """
+    ids = id_index(pd.Series(ids).dropna().unique())
+    if known is None or len(known) == 0:
+        return ids.sort_values()
+    known = id_index(known)
+    return known.append(ids[known.get_indexer(ids) < 0].sort_values())
+
+
+def lookup_keys(keys, ids):
+    """Surrogate key ``int32`` untuk ``ids`` (``-1`` jika tidak ada)"""
+    return keys.get_indexer(ids).astype(np.int32)
+
+
+def _first_per_key(keys, order, n):
+    """Posisi baris pertama per key menurut urutan ``order`` (-1 jika kosong)"""
+    first = np.full(n, -1, dtype=np.int64)
+    sorted_keys = keys[order]
+    valid = sorted_keys >= 0
+    uniq, pos = np.unique(sorted_keys[valid], return_index=True)
+    first[uniq] = order[valid][pos]
+    return first
+
+
+def _take(values, rows, fill):
+    """``values[rows]`` dengan ``fill`` untuk baris ``-1``"""
+    out = np.asarray(values)[np.maximum(rows, 0)]
+    return np.where(rows >= 0, out, fill)
+
+
+def _rows_by_key(df, column, keys):
+    """Baris unik ``df`` per ``column`` urut key global, beserta key-nya"""
+    df = df.drop_duplicates(column)
+    key = lookup_keys(keys, df[column])
+    order = np.argsort(key, kind="stable")
+    order = order[key[order] >= 0]
+    return df.iloc[order].reset_index(drop=True), key[order]
+
+
+def _with_previous(df, key, previous):
+    """``df`` dilengkapi baris ``previous`` untuk key yang tidak dibangun ulang.
+
+    ``df`` hanya berisi baris id yang ada di data sumber build ini; baris lain
+    diambil dari tabel build sebelumnya, lalu semuanya diurutkan menurut
+    ``key`` sehingga key kembali sama dengan posisi baris.
+    """
+    if previous is None or not len(previous):
+        return df
+    keep = np.ones(len(previous), dtype=bool)
+    rebuilt = df[key].to_numpy()
+    keep[rebuilt[rebuilt < len(previous)]] = False
+    df = snapshot.concat_frames([previous[keep], df])
+    return df.sort_values(key, kind="stable", ignore_index=True)
+
+
+def known_keys(previous):
+    """Map id -> key per dimensi dari star schema sebelumnya (``pd.Index`` id)"""
+    return {
+        name: id_index(previous[name][column])
+        for name, column in KEY_COLUMNS.items()
+        if name in previous
+    }
+
+
+def build_dimensions(tables, index, keys=None):
+    """Dimensi customer, seller, product, dan category dengan key int32.
+
+    Hanya id yang ada di ``tables`` yang mendapat baris; ``keys`` (hasil
+    ``known_keys``) menentukan key id yang sudah pernah dibangun.
+    """
+    keys = {} if keys is None else keys
+    customers = tables["customers"]
+    customers, customer_key = _rows_by_key(
+        customers,
+        "customer_id",
+        build_keys(customers["customer_id"], keys.get("dim_customer")),
+    )
+    lat, lng, _ = geocode.lookup(index, customers["customer_zip_code_prefix"])
+    dim_customer = pd.DataFrame(
+        {
+            "customer_key": customer_key,
+            "customer_id": customers["customer_id"],
+            "customer_zip_code_prefix": customers["customer_zip_code_prefix"],
+            "customer_state": customers["customer_state"],
+            "lat": lat,
+            "lng": lng,
+        }
+    )
+
+    sellers = tables["sellers"]
+    sellers, seller_key = _rows_by_key(
+        sellers, "seller_id", build_keys(sellers["seller_id"], keys.get("dim_seller"))
+    )
+    lat, lng, _ = geocode.lookup(index, sellers["seller_zip_code_prefix"], nearest=True)
+    dim_seller = pd.DataFrame(
+        {
+            "seller_key": seller_key,
+            "seller_id": sellers["seller_id"],
+            "seller_zip_code_prefix": sellers["seller_zip_code_prefix"],
+            "seller_state": sellers["seller_state"],
+            "lat": lat,
+            "lng": lng,
+        }
+    )
+
+    translation = tables["product_category_name_translation"]
+    products = tables["products"]
+    products, product_key = _rows_by_key(
+        products,
+        "product_id",
+        build_keys(products["product_id"], keys.get("dim_product")),
+    )
+    names = pd.concat(
+        [
+            translation["product_category_name"].astype(object),
+            products["product_category_name"].astype(object),
+        ]
+    )
+    categories = build_keys(names, keys.get("dim_category"))
+    names, category_key = _rows_by_key(
+        pd.DataFrame({"name": names}), "name", categories
+    )
+    english = pd.Series(
+        translation["product_category_name_english"].astype(object).to_numpy(),
+        index=translation["product_category_name"].astype(object).to_numpy(),
+    )
+    english = english[~english.index.duplicated()]
+    dim_category = pd.DataFrame(
+        {
+            "category_key": category_key,
+            "product_category_name": names["name"].to_numpy(),
+            "product_category_name_english": english.reindex(names["name"]).to_numpy(),
+        }
+    )
+    dim_product = pd.DataFrame(
+        {
+            "product_key": product_key,
+            "product_id": products["product_id"],
+            "category_key": lookup_keys(categories, products["product_category_name"]),
+            "product_weight_g": products["product_weight_g"],
+        }
+    )
+    return {
+        "dim_customer": dim_customer,
+        "dim_seller": dim_seller,
+        "dim_product": dim_product,
+        "dim_category": dim_category,
+    }
+
+
+def build_fact(orders, reviews, items, payments, dims, order_keys=None):
+    """Tabel fakta satu baris per order di ``orders``, urut ``order_key``.
+
+    ``order_keys`` adalah dictionary order build sebelumnya (lihat
+    ``build_keys``); ``dims`` dimensi lengkap (key = posisi baris).
+    """
+    orders, global_key = _rows_by_key(
+        orders, "order_id", build_keys(orders["order_id"], order_keys)
+    )
+    # Agregasi memakai posisi lokal; key global dipasang di tabel hasil
+    order_ids = id_index(orders["order_id"])
+    n = len(order_ids)
+
+    delivery_time = (
+        orders["order_delivered_customer_date"] - orders["order_purchase_timestamp"]
+    ).dt.days
+    delivery_diff = (
+        orders["order_estimated_delivery_date"]
+        - orders["order_delivered_customer_date"]
+    ).dt.days
+
+    # Review: rata-rata skor per order (bisa lebih dari satu review)
+    review_key = lookup_keys(order_ids, reviews["order_id"])
+    review_valid = review_key >= 0
+    review_key = review_key[review_valid]
+    review_count = np.bincount(review_key, minlength=n)
+    review_sum = np.bincount(
+        review_key, reviews["review_score"].to_numpy(np.float64)[review_valid], n
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        review_score = review_sum / review_count
+
+    # Item: jumlah, total harga/ongkir, seller dan kategori item pertama
+    item_key = lookup_keys(order_ids, items["order_id"])
+    valid = item_key >= 0
+    item_key = item_key[valid]
+    seller_key = lookup_keys(
+        id_index(dims["dim_seller"]["seller_id"]), items["seller_id"]
+    )[valid]
+    product_key = lookup_keys(
+        id_index(dims["dim_product"]["product_id"]), items["product_id"]
+    )[valid]
+    category_key = _take(dims["dim_product"]["category_key"], product_key, -1)
+    first = _first_per_key(
+        item_key,
+        np.lexsort((items["order_item_id"].to_numpy()[valid], item_key)),
+        n,
+    )
+    # Jumlah seller berbeda per order dari pasangan (order, seller) unik
+    width = len(dims["dim_seller"])
+    has_seller = seller_key >= 0
+    pairs = np.unique(
+        item_key[has_seller].astype(np.int64) * width + seller_key[has_seller]
+    )
+    seller_count = np.bincount(pairs // width, minlength=n)
+
+    # Pembayaran: total, jumlah baris, cicilan terbanyak, tipe pembayaran pertama
+    pay_key = lookup_keys(order_ids, payments["order_id"])
+    pay_valid = pay_key >= 0
+    pay_key = pay_key[pay_valid]
+    installments = np.zeros(n, dtype=np.int64)
+    np.maximum.at(
+        installments,
+        pay_key,
+        payments["payment_installments"].to_numpy(np.int64)[pay_valid],
+    )
+    first_payment = _first_per_key(
+        pay_key,
+        np.lexsort((payments["payment_sequential"].to_numpy()[pay_valid], pay_key)),
+        n,
+    )
+    payment_type = payments["payment_type"][pay_valid].reset_index(drop=True)
+
+    fact = pd.DataFrame(
+        {
+            "order_key": global_key,
+            "customer_key": lookup_keys(
+                id_index(dims["dim_customer"]["customer_id"]), orders["customer_id"]
+            ),
+            "order_status": orders["order_status"],
+            "order_purchase_timestamp": orders["order_purchase_timestamp"],
+            "order_delivered_customer_date": orders["order_delivered_customer_date"],
+            "order_estimated_delivery_date": orders["order_estimated_delivery_date"],
+            "delivery_time": delivery_time.to_numpy(np.float32),
+            "delivery_diff": delivery_diff.to_numpy(np.float32),
+            "is_late": (delivery_diff < 0).to_numpy(),
+            "review_score": review_score.astype(np.float32),
+            "review_count": review_count.astype(np.int8),
+            "item_count": np.bincount(item_key, minlength=n).astype(np.int16),
+            "seller_count": seller_count.astype(np.int8),
+            "seller_key": _take(seller_key, first, -1).astype(np.int32),
+            "category_key": _take(category_key, first, -1).astype(np.int32),
+            "price_total": np.bincount(
+                item_key, items["price"].to_numpy(np.float64)[valid], n
+            ),
+            "freight_total": np.bincount(
+                item_key, items["freight_value"].to_numpy(np.float64)[valid], n
+            ),
+            "payment_total": np.bincount(
+                pay_key, payments["payment_value"].to_numpy(np.float64)[pay_valid], n
+            ),
+            "payment_count": np.bincount(pay_key, minlength=n).astype(np.int8),
+            "payment_installments": installments.astype(np.int8),
+            "payment_type": pd.Categorical.from_codes(
+                _take(payment_type.cat.codes, first_payment, -1),
+                dtype=payment_type.dtype,
+            ),
+        }
+    )
+    dim_order = pd.DataFrame({"order_key": global_key, "order_id": orders["order_id"]})
+    fact_items = pd.DataFrame(
+        {
+            "order_key": global_key[item_key],
+            "order_item_id": items["order_item_id"].to_numpy()[valid],
+            "product_key": product_key,
+            "seller_key": seller_key,
+            "category_key": category_key.astype(np.int32),
+            "price": items["price"].to_numpy(np.float64)[valid],
+            "freight_value": items["freight_value"].to_numpy(np.float64)[valid],
+        }
+    )
+    return fact, dim_order, fact_items
+
+
+def _items_with_previous(items, orders, previous):
+    """Item order yang dibangun ulang ditambah item order lain dari ``previous``"""
+    if previous is not None and len(previous):
+        keep = ~np.isin(previous["order_key"].to_numpy(), orders["order_key"])
+        items = snapshot.concat_frames([previous[keep], items])
+    order = np.lexsort((items["order_item_id"].to_numpy(), items["order_key"]))
+    return items.iloc[order].reset_index(drop=True)
+
+
+def build_star(tables, reviews, index, previous=None):
+    """Star schema dari frame hasil ``ingest.read_tables``.
+
+    ``reviews`` adalah review yang sudah difilter (skor 1-5), ``index``
+    index geocoding untuk koordinat customer dan seller. ``previous`` (hasil
+    ``read_previous``) adalah star schema build sebelumnya: id lama
+    mempertahankan key-nya, dan baris id yang tidak ada di ``tables`` diambil
+    dari sana. Build incremental memakai ini dengan ``tables`` yang hanya
+    berisi order yang berubah beserta baris yang dirujuknya.
+    """
+    previous = {} if previous is None else previous
+    keys = known_keys(previous)
+    dims = build_dimensions(tables, index, keys)
+    for name, df in dims.items():
+        dims[name] = _with_previous(
+            df, KEY_COLUMN_BY_DIMENSION[name], previous.get(name)
+        )
+    fact, dim_order, fact_items = build_fact(
+        tables["orders"],
+        reviews,
+        tables["order_items"],
+        tables["order_payments"],
+        dims,
+        keys.get("dim_order"),
+    )
+    dims["dim_order"] = _with_previous(
+        dim_order, "order_key", previous.get("dim_order")
+    )
+    return {
+        FACT_TABLE: _with_previous(fact, "order_key", previous.get(FACT_TABLE)),
+        ITEMS_TABLE: _items_with_previous(fact_items, fact, previous.get(ITEMS_TABLE)),
+        **{name: dims[name] for name in DIMENSIONS},
+    }
+
+
+def star_path(out_dir, name):
+    """Path snapshot tabel star schema ``name``"""
+    return os.path.join(out_dir, STAR_DIR, name + snapshot.SNAPSHOT_SUFFIX)
+
+
+def write_star(star, out_dir):
+    """Tulis fakta dan dimensi sebagai snapshot kolumnar"""
+    os.makedirs(os.path.join(out_dir, STAR_DIR), exist_ok=True)
+    for name, df in star.items():
+        snapshot.write_snapshot(df, star_path(out_dir, name))
+
+
+def read_star(out_dir, name, columns=None, mmap=True):
+    """Baca satu tabel star schema (default memory-map)"""
+    return snapshot.read_snapshot(star_path(out_dir, name), columns, mmap=mmap)
+
+
+def read_previous(out_dir):
+    """Semua tabel star schema build sebelumnya, ``{}`` jika belum lengkap.
+
+    Dibaca ke memori (bukan memory-map) karena build berikutnya menulis ulang
+    snapshot yang sama.
+    """
+    names = [FACT_TABLE, ITEMS_TABLE, *DIMENSIONS]
+    for name in names:
+        if not os.path.exists(os.path.join(star_path(out_dir, name), "meta.json")):
+            return {}
+    return {name: read_star(out_dir, name, mmap=False) for name in names}
@@ -0,0 +1,16 @@
+"""Test jalur data dashboard dan pipeline.
+
+Jalankan dari root repository::
+
+    python -m pytest
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(ROOT_DIR, "dashboard")
+
+# Modul dashboard ditulis sebagai modul datar (dijalankan oleh streamlit)
+if DASHBOARD_DIR not in sys.path:
+    sys.path.append(DASHBOARD_DIR)
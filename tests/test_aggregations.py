@@ -0,0 +1,92 @@
+"""Agregasi ``is_late`` sama dengan groupby-lambda dashboard lama"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_geo_orders, make_orders_reviews
+
+import cube
+import views
+
+
+@pytest.fixture(scope="module")
+def datasets():
+    orders_reviews = make_orders_reviews(20_000, seed=9)
+    geo_orders = make_geo_orders(orders_reviews, seed=9)
+    return orders_reviews, geo_orders
+
+
+def _is_late(status):
+    return lambda x: (x == status).sum()
+
+
+def test_add_is_late(datasets):
+    orders_reviews, _ = datasets
+    df = cube.add_is_late(orders_reviews.copy())
+    np.testing.assert_array_equal(
+        df["is_late"], orders_reviews["delivery_status"] == cube.LATE_STATUS
+    )
+    assert df["is_late"].dtype == bool
+
+
+def test_late_percentage_by_state(datasets):
+    _, geo_orders = datasets
+    expected = geo_orders.groupby("customer_state").apply(
+        lambda x: (x["delivery_status"] == cube.LATE_STATUS).sum() / len(x) * 100
+    )
+    cells = cube.build_cube(geo_orders, cube.GEO_DIMENSIONS)
+    pd.testing.assert_series_equal(
+        views.late_percentage_by_state(cells), expected, check_names=False
+    )
+
+
+def test_score_detail(datasets):
+    orders_reviews, _ = datasets
+    expected = (
+        orders_reviews.groupby("review_score")
+        .agg(
+            {
+                "delivery_time": ["count", "mean", "median", "std", "min", "max"],
+                "delivery_status": _is_late(cube.LATE_STATUS),
+            }
+        )
+        .round(2)
+    )
+    expected.columns = ["Jumlah", "Mean", "Median", "Std", "Min", "Max", "Terlambat"]
+    expected["Persen Terlambat"] = (
+        expected["Terlambat"] / expected["Jumlah"] * 100
+    ).round(1)
+
+    cells = cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS)
+    pd.testing.assert_frame_equal(
+        views.score_detail(cells), expected, check_dtype=False
+    )
+
+
+def test_state_detail(datasets):
+    _, geo_orders = datasets
+    expected = (
+        geo_orders.groupby("customer_state")
+        .agg(
+            {
+                "order_id": "count",
+                "delivery_time": "mean",
+                "delivery_status": _is_late(cube.LATE_STATUS),
+            }
+        )
+        .round(2)
+    )
+    expected.columns = ["Total Order", "Mean Delivery", "Total Terlambat"]
+    expected["Persen Terlambat"] = (
+        expected["Total Terlambat"] / expected["Total Order"] * 100
+    ).round(1)
+    expected = expected.sort_values("Total Order", ascending=False)
+
+    cells = cube.build_cube(geo_orders, cube.GEO_DIMENSIONS)
+    detail = views.state_detail(cells)
+    # Urutan state dengan jumlah order sama tidak ditentukan
+    pd.testing.assert_frame_equal(
+        detail.sort_index(), expected.sort_index(), check_dtype=False
+    )
+    assert detail["Total Order"].is_monotonic_decreasing
@@ -0,0 +1,57 @@
+"""Statistik boxplot dari jumlah per hari sama dengan ``cbook.boxplot_stats``"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib import cbook
+
+from benchmarks.synthetic import make_orders_reviews
+
+import cube
+import density
+import views
+
+KEYS = ["mean", "iqr", "q1", "med", "q3", "cilo", "cihi", "whislo", "whishi"]
+
+
+@pytest.fixture
+def delivery_time():
+    rng = np.random.default_rng(19)
+    return pd.Series(rng.gamma(2.0, 6, 20_000).astype(np.int64))
+
+
+@pytest.mark.parametrize("whis", [1.5, 0.5])
+def test_box_stats_match_cbook(delivery_time, whis):
+    counts = delivery_time.value_counts().sort_index()
+    box = density.box_stats(counts, whis=whis)
+    (expected,) = cbook.boxplot_stats(delivery_time.to_numpy(np.float64), whis=whis)
+    for key in KEYS:
+        assert box[key] == pytest.approx(expected[key]), key
+    assert box["n"] == len(delivery_time)
+    np.testing.assert_array_equal(box["fliers"], np.unique(expected["fliers"]))
+
+
+def test_fliers_are_capped(delivery_time):
+    counts = delivery_time.value_counts().sort_index()
+    box = density.box_stats(counts, max_fliers=5)
+    outliers = np.unique(
+        cbook.boxplot_stats(delivery_time.to_numpy(np.float64))[0]["fliers"]
+    )
+    assert len(outliers) > 5
+    assert len(box["fliers"]) <= 5
+    assert np.isin(box["fliers"], outliers).all()
+    assert box["fliers"][0] == outliers[0] and box["fliers"][-1] == outliers[-1]
+
+
+def test_delivery_boxes_per_score():
+    orders_reviews = make_orders_reviews(20_000, seed=20)
+    cells = cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS)
+    boxes = views.delivery_boxes(cells)
+
+    groups = orders_reviews.groupby("review_score")["delivery_time"]
+    assert [box["label"] for box in boxes] == list(groups.groups)
+    for box, (_, values) in zip(boxes, groups):
+        (expected,) = cbook.boxplot_stats(values.to_numpy(np.float64))
+        for key in KEYS:
+            assert box[key] == pytest.approx(expected[key]), key
+        assert box["n"] == len(values)
@@ -0,0 +1,90 @@
+"""Cube pra-agregasi: metrik dari sel cube sama dengan filter baris pandas"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_geo_orders, make_orders_reviews
+
+import cube
+
+# (date_range, score_range, delivery_range, status, states)
+FILTERS = [
+    (None, None, None, None, None),
+    ((datetime.date(2017, 3, 1), datetime.date(2017, 9, 30)), (1, 3), None, None, None),
+    (None, (2, 5), (5, 20), cube.LATE_STATUS, ["SP", "RJ"]),
+    (None, None, (0, 10), cube.ONTIME_STATUS, ["MG", "BA", "PR"]),
+]
+
+
+@pytest.fixture(scope="module")
+def datasets():
+    orders_reviews = make_orders_reviews(20_000, seed=4)
+    geo_orders = make_geo_orders(orders_reviews, seed=4)
+    return orders_reviews, geo_orders
+
+
+def _row_filter(df, date_range, score_range, delivery_range, status, states):
+    """Filter baris seperti dashboard sebelum ada cube"""
+    mask = pd.Series(True, index=df.index)
+    if date_range is not None and "order_purchase_timestamp" in df.columns:
+        dates = df["order_purchase_timestamp"].dt.date
+        mask &= (dates >= date_range[0]) & (dates <= date_range[1])
+    if score_range is not None and "review_score" in df.columns:
+        mask &= df["review_score"].between(*score_range)
+    if delivery_range is not None:
+        mask &= df["delivery_time"].between(*delivery_range)
+    if status is not None:
+        mask &= df["delivery_status"] == status
+    if states is not None and "customer_state" in df.columns:
+        mask &= df["customer_state"].isin(states)
+    return df[mask]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_review_metrics_match_rows(datasets, filters):
+    orders_reviews, _ = datasets
+    cells = cube.filter_cube(
+        cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS), *filters
+    )
+    rows = _row_filter(orders_reviews, *filters)
+    assert len(rows) > 0
+
+    totals = cube.total(cells)
+    assert totals["count"] == len(rows)
+    assert totals["delivery_sum"] == rows["delivery_time"].sum()
+    assert totals["late_count"] == (rows["delivery_status"] == cube.LATE_STATUS).sum()
+    assert totals["score_sum"] == rows["review_score"].sum()
+
+    pd.testing.assert_series_equal(
+        cube.describe(cells, "delivery_time"),
+        rows["delivery_time"].astype(np.float64).describe(),
+    )
+    assert cube.delivery_median(cells) == rows["delivery_time"].median()
+    assert cube.correlation(cells) == pytest.approx(
+        rows["delivery_time"].corr(rows["review_score"])
+    )
+    pd.testing.assert_series_equal(
+        cube.rollup(cells, "review_score")["count"],
+        rows.groupby("review_score").size(),
+        check_names=False,
+    )
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_geo_rollup_matches_rows(datasets, filters):
+    _, geo_orders = datasets
+    cells = cube.filter_cube(cube.build_cube(geo_orders, cube.GEO_DIMENSIONS), *filters)
+    rows = _row_filter(geo_orders, *filters)
+    assert len(rows) > 0
+
+    by_state = cube.rollup(cells, "customer_state")
+    expected = rows.groupby("customer_state", observed=True).agg(
+        count=("delivery_time", "size"),
+        delivery_sum=("delivery_time", "sum"),
+    )
+    pd.testing.assert_frame_equal(
+        by_state[["count", "delivery_sum"]], expected, check_dtype=False
+    )
@@ -0,0 +1,56 @@
+"""Histogram dan KDE dari jumlah per hari sama dengan perhitungan per order"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import density
+
+
+@pytest.fixture
+def delivery_time():
+    rng = np.random.default_rng(18)
+    return pd.Series(np.minimum(rng.gamma(2.5, 5, 30_000).astype(np.int64), 150))
+
+
+def _counts(delivery_time):
+    return delivery_time.value_counts().sort_index()
+
+
+def test_histogram_matches_rows(delivery_time):
+    heights, edges = density.histogram(_counts(delivery_time), bins=30)
+    expected, expected_edges = np.histogram(delivery_time, bins=30)
+    np.testing.assert_array_equal(heights, expected)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_summary_matches_rows(delivery_time):
+    stats = density.summary(_counts(delivery_time))
+    assert stats["n"] == len(delivery_time)
+    assert stats["mean"] == pytest.approx(delivery_time.mean())
+    assert stats["median"] == delivery_time.median()
+
+
+def test_bandwidth_is_scott(delivery_time):
+    expected = delivery_time.std() * len(delivery_time) ** (-1 / 5)
+    assert density.bandwidth(_counts(delivery_time)) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("bw_adjust", [0.5, 1.0, 2.0])
+def test_kde_matches_per_order_kernels(delivery_time, bw_adjust):
+    grid, values = density.kde(_counts(delivery_time), bw_adjust=bw_adjust)
+    assert len(grid) >= density.GRIDSIZE
+    assert grid[0] == delivery_time.min() and grid[-1] == delivery_time.max()
+
+    # Satu kernel Gaussian per order, dijumlahkan langsung di setiap titik grid
+    bw = density.bandwidth(_counts(delivery_time)) * bw_adjust
+    sample = delivery_time.to_numpy(dtype=np.float64)
+    z = (grid[:, None] - sample[None, :]) / bw
+    expected = np.exp(-0.5 * z * z).sum(axis=1) / (
+        len(sample) * bw * np.sqrt(2 * np.pi)
+    )
+    np.testing.assert_allclose(values, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_kde_undefined_for_single_day():
+    assert density.kde(pd.Series([10], index=[4])) is None
@@ -0,0 +1,110 @@
+"""Jarak haversine seller-pelanggan sama dengan perhitungan per baris"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline import etl, geocode
+
+PREFIX = "geolocation_zip_code_prefix"
+
+
+def _haversine(lat1, lng1, lat2, lng2):
+    """Haversine satu pasangan koordinat dengan modul ``math``"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * (
+        math.sin(dlmb / 2) ** 2
+    )
+    return 2 * etl.EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def test_haversine_matches_per_row():
+    rng = np.random.default_rng(15)
+    coords = [rng.uniform(-33, 5, 1000), rng.uniform(-73, -35, 1000)]
+    coords += [rng.uniform(-33, 5, 1000), rng.uniform(-73, -35, 1000)]
+    km = etl.haversine_km(*coords)
+    expected = [_haversine(*row) for row in zip(*coords)]
+    np.testing.assert_allclose(km, expected, rtol=1e-12)
+
+
+def test_haversine_known_distances():
+    # Seperempat keliling bumi dan titik antipode
+    quarter = math.pi / 2 * etl.EARTH_RADIUS_KM
+    km = etl.haversine_km([0, 0, 10], [0, 0, 20], [0, 0, -10], [90, 0, -160])
+    np.testing.assert_allclose(km, [quarter, 0, 2 * quarter])
+
+
+@pytest.fixture
+def tables():
+    rng = np.random.default_rng(16)
+    zips = np.arange(1000, 1300)
+    geo_agg = pd.DataFrame(
+        {
+            PREFIX: zips,
+            "geolocation_lat": rng.uniform(-33, 5, len(zips)),
+            "geolocation_lng": rng.uniform(-73, -35, len(zips)),
+        }
+    )
+    sellers = pd.DataFrame(
+        {
+            "seller_id": [f"s{i}" for i in range(40)],
+            "seller_zip_code_prefix": rng.choice(zips, 40),
+        }
+    )
+    orders = [f"o{i}" for i in range(200)]
+    geo_orders = pd.DataFrame(
+        {
+            "order_id": orders[:180],
+            "geolocation_lat": rng.uniform(-33, 5, 180),
+            "geolocation_lng": rng.uniform(-73, -35, 180),
+        }
+    )
+    items = pd.DataFrame(
+        {
+            "order_id": rng.choice(orders, 600),
+            "seller_id": rng.choice(sellers["seller_id"], 600),
+        }
+    )
+    return items, sellers, geo_orders, geo_agg
+
+
+def test_seller_distances_match_per_row(tables):
+    items, sellers, geo_orders, geo_agg = tables
+    index = geocode.build_index(geo_agg)
+    distances = etl.seller_distances(items, sellers, geo_orders, index)
+
+    seller_zip = dict(zip(sellers["seller_id"], sellers["seller_zip_code_prefix"]))
+    coords = dict(
+        zip(
+            geo_agg[PREFIX],
+            zip(
+                geo_agg["geolocation_lat"].astype(np.float32),
+                geo_agg["geolocation_lng"].astype(np.float32),
+            ),
+        )
+    )
+    customers = geo_orders.set_index("order_id")
+    per_order = {}
+    for order_id, seller_id in zip(items["order_id"], items["seller_id"]):
+        lat, lng = coords[seller_zip[seller_id]]
+        if order_id in customers.index:
+            row = customers.loc[order_id]
+            km = _haversine(lat, lng, row["geolocation_lat"], row["geolocation_lng"])
+        else:
+            km = math.nan
+        per_order.setdefault(order_id, []).append(km)
+
+    expected = pd.DataFrame(
+        {
+            "seller_customer_km_max": {k: max(v) for k, v in per_order.items()},
+            "seller_customer_km_mean": {k: np.mean(v) for k, v in per_order.items()},
+        }
+    )
+    result = distances.set_index("order_id").sort_index()
+    expected = expected.sort_index()
+    assert result.index.equals(expected.index)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-6)
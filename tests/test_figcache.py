@@ -0,0 +1,68 @@
+"""Cache gambar chart: bytes sama dengan render langsung, kunci, dan LRU"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+import figcache
+
+
+def _bar_chart(counts):
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.bar(counts.index.astype(str), counts.to_numpy())
+    return fig
+
+
+@pytest.fixture
+def counts():
+    return pd.Series([5, 3, 8], index=[1, 2, 3], name="count")
+
+
+def test_cached_bytes_match_direct_render(counts):
+    cache = figcache.new_cache()
+    direct = figcache.figure_bytes(_bar_chart(counts))
+    first = figcache.render(cache, "bars", _bar_chart, counts)
+    second = figcache.render(cache, "bars", _bar_chart, counts.copy())
+    assert first == direct
+    assert second is first
+    assert figcache.stats(cache)["hits"] == 1
+    assert figcache.stats(cache)["misses"] == 1
+
+
+def test_fingerprint_follows_inputs(counts):
+    base = figcache.fingerprint(counts, {"bins": 30})
+    assert figcache.fingerprint(counts.copy(), {"bins": 30}) == base
+    assert figcache.fingerprint(counts, {"bins": 20}) != base
+    changed = counts.copy()
+    changed.iloc[0] += 1
+    assert figcache.fingerprint(changed, {"bins": 30}) != base
+    assert figcache.fingerprint(counts.rename("other"), {"bins": 30}) != base
+    assert figcache.fingerprint(counts.to_numpy()) != figcache.fingerprint(
+        counts.to_numpy().astype(np.float64)
+    )
+
+
+def test_deps_select_the_key(counts):
+    cache = figcache.new_cache()
+    figcache.render(cache, "bars", _bar_chart, counts, deps=("scores", (1, 5)))
+    # Input lain diabaikan selama ``deps`` sama
+    figcache.render(cache, "bars", _bar_chart, counts * 2, deps=("scores", (1, 5)))
+    figcache.render(cache, "bars", _bar_chart, counts, deps=("scores", (2, 5)))
+    assert figcache.stats(cache)["hits"] == 1
+    assert figcache.stats(cache)["misses"] == 2
+
+
+def test_lru_eviction_respects_byte_limit(counts):
+    size = len(figcache.figure_bytes(_bar_chart(counts)))
+    cache = figcache.new_cache(max_bytes=int(size * 2.5))
+    figcache.render(cache, "chart0", _bar_chart, counts)
+    figcache.render(cache, "chart1", _bar_chart, counts)
+    # chart0 dipakai lagi sehingga chart1 yang paling lama tidak dipakai
+    figcache.render(cache, "chart0", _bar_chart, counts)
+    figcache.render(cache, "chart2", _bar_chart, counts)
+
+    stats = figcache.stats(cache)
+    assert [key[0] for key in cache["entries"]] == ["chart0", "chart2"]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
+    assert stats["bytes"] == 2 * size <= cache["max_bytes"]
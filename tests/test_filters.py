@@ -0,0 +1,66 @@
+"""Index filter sidebar: hasil ``select`` sama dengan mask boolean pandas"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_geo_orders, make_orders_reviews
+
+import cube
+import filters
+import schema
+
+# (date_range, score_range, delivery_range, status, states)
+FILTERS = [
+    (None, None, None, None, None),
+    ((datetime.date(2017, 3, 1), datetime.date(2017, 9, 30)), None, None, None, None),
+    (None, (1, 3), (5, 20), None, None),
+    (None, (5, 5), None, cube.LATE_STATUS, ["SP", "RJ"]),
+    (None, None, (0, 10), cube.ONTIME_STATUS, ["MG", "XX"]),
+    # Rentang di luar data
+    ((datetime.date(2030, 1, 1), datetime.date(2030, 12, 31)), None, None, None, []),
+]
+
+
+@pytest.fixture(scope="module")
+def datasets():
+    raw = make_orders_reviews(20_000, seed=6)
+    orders_reviews = schema.apply_schema(raw, "orders_reviews")
+    geo_orders = schema.apply_schema(make_geo_orders(raw, seed=6), "geo_orders")
+    return {
+        "orders_reviews": (orders_reviews, filters.REVIEW_INDEX),
+        "geo_orders": (geo_orders, filters.GEO_INDEX),
+    }
+
+
+def _mask(df, date_range, score_range, delivery_range, status, states):
+    """Mask boolean seperti blok "Apply filters" dashboard sebelum ada index"""
+    mask = pd.Series(True, index=df.index)
+    if date_range is not None and "order_purchase_timestamp" in df.columns:
+        dates = df["order_purchase_timestamp"].dt.date
+        mask &= (dates >= date_range[0]) & (dates <= date_range[1])
+    if score_range is not None and "review_score" in df.columns:
+        mask &= df["review_score"].between(*score_range)
+    if delivery_range is not None:
+        mask &= df["delivery_time"].between(*delivery_range)
+    if status is not None:
+        mask &= df["is_late"] == (status == cube.LATE_STATUS)
+    if states is not None and "customer_state" in df.columns:
+        mask &= df["customer_state"].isin(states)
+    return mask.to_numpy()
+
+
+@pytest.mark.parametrize("name", ["orders_reviews", "geo_orders"])
+@pytest.mark.parametrize("predicates", FILTERS)
+def test_select_matches_mask(datasets, name, predicates):
+    df, spec = datasets[name]
+    index = filters.build_index(df, spec)
+    rows = filters.select(index, *predicates)
+    np.testing.assert_array_equal(rows, np.flatnonzero(_mask(df, *predicates)))
+
+    columns = ["delivery_time", "is_late"]
+    pd.testing.assert_frame_equal(
+        filters.take(df, rows, columns), df[columns].iloc[rows]
+    )
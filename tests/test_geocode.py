@@ -0,0 +1,82 @@
+"""Index geocoding: lookup sama dengan merge pandas dan pencarian per baris"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline import geocode
+
+PREFIX = "geolocation_zip_code_prefix"
+
+
+@pytest.fixture(scope="module")
+def geo_agg():
+    rng = np.random.default_rng(13)
+    zips = np.sort(rng.choice(np.arange(1000, 99999), 3000, replace=False))
+    return pd.DataFrame(
+        {
+            PREFIX: rng.permutation(zips),
+            "geolocation_lat": rng.uniform(-33, 5, len(zips)),
+            "geolocation_lng": rng.uniform(-73, -35, len(zips)),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def keys(geo_agg):
+    rng = np.random.default_rng(14)
+    known = rng.choice(geo_agg[PREFIX].to_numpy(), 5000)
+    unknown = rng.integers(0, 100_000, 5000)
+    return rng.permutation(np.concatenate([known, unknown]))
+
+
+def test_exact_lookup_matches_merge(geo_agg, keys):
+    index = geocode.build_index(geo_agg)
+    lat, lng, exact = geocode.lookup(index, keys)
+    merged = pd.merge(pd.DataFrame({PREFIX: keys}), geo_agg, on=PREFIX, how="left")
+
+    np.testing.assert_array_equal(exact, merged["geolocation_lat"].notna())
+    np.testing.assert_array_equal(
+        lat, merged["geolocation_lat"].to_numpy(dtype=np.float32)
+    )
+    np.testing.assert_array_equal(
+        lng, merged["geolocation_lng"].to_numpy(dtype=np.float32)
+    )
+
+
+@pytest.mark.parametrize("max_gap", [None, 20])
+def test_nearest_matches_per_row_search(geo_agg, keys, max_gap):
+    index = geocode.build_index(geo_agg)
+    lat, _, _ = geocode.lookup(index, keys, nearest=True, max_gap=max_gap)
+
+    table = index["zip"].astype(np.int64)
+    expected = np.full(2000, np.nan, dtype=np.float32)
+    for i, key in enumerate(keys[:2000]):
+        gaps = np.abs(table - key)
+        # Jarak sama: prefix yang lebih kecil
+        best = int(np.argmin(gaps))
+        if max_gap is None or gaps[best] <= max_gap:
+            expected[i] = index["lat"][best]
+    np.testing.assert_array_equal(lat[:2000], expected)
+
+
+def test_nan_and_string_keys(geo_agg):
+    index = geocode.build_index(geo_agg)
+    zip_code = int(geo_agg[PREFIX].iloc[0])
+    keys = pd.Series([str(zip_code), None, "abc", zip_code], dtype=object)
+    lat, _, exact = geocode.lookup(index, keys, nearest=True)
+
+    np.testing.assert_array_equal(exact, [True, False, False, True])
+    assert np.isnan(lat[1]) and np.isnan(lat[2])
+    assert lat[0] == lat[3] == np.float32(geo_agg["geolocation_lat"].iloc[0])
+
+
+def test_index_roundtrip(geo_agg, keys, tmp_path):
+    index = geocode.build_index(geo_agg)
+    path = tmp_path / "geocode.snap"
+    geocode.write_index(index, path)
+    loaded = geocode.read_index(path)
+    for column in geocode.INDEX_COLUMNS:
+        np.testing.assert_array_equal(loaded[column], index[column])
+    for a, b in zip(geocode.lookup(loaded, keys), geocode.lookup(index, keys)):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,73 @@
+"""Agregasi geolokasi streaming sama dengan versi notebook"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_raw_tables
+from pipeline import etl, ingest
+
+GEOLOCATION = "geolocation_dataset.csv"
+PREFIX = "geolocation_zip_code_prefix"
+CHUNKSIZE = 2000
+
+
+@pytest.fixture(scope="module")
+def geolocation():
+    return make_raw_tables(1000, seed=5, zip_prefixes=300)[GEOLOCATION]
+
+
+def _notebook(data_dir):
+    """drop_duplicates + filter_bounds + groupby mean/first seperti notebook"""
+    geo = ingest.read_table(data_dir, "geolocation", etl.GEOLOCATION_COLUMNS)
+    geo = etl.filter_bounds(geo.drop_duplicates())
+    return (
+        geo.groupby(PREFIX)
+        .agg(
+            geolocation_lat=("geolocation_lat", "mean"),
+            geolocation_lng=("geolocation_lng", "mean"),
+            geolocation_city=("geolocation_city", "first"),
+            geolocation_state=("geolocation_state", "first"),
+        )
+        .reset_index()
+    )
+
+
+def _count_passes(monkeypatch):
+    passes = []
+    aggregate = etl._aggregate_geolocation
+
+    def counting(data_dir, chunksize, evict):
+        passes.append(evict)
+        return aggregate(data_dir, chunksize, evict)
+
+    monkeypatch.setattr(etl, "_aggregate_geolocation", counting)
+    return passes
+
+
+@pytest.mark.parametrize(
+    "layout, expected_passes",
+    [
+        ("shuffled", [True]),
+        ("sorted", [True]),
+        # Prefix yang hash-nya sudah dibuang muncul lagi di akhir file
+        ("reopened", [True, False]),
+    ],
+)
+def test_matches_notebook(geolocation, tmp_path, monkeypatch, layout, expected_passes):
+    geo = geolocation
+    if layout != "shuffled":
+        geo = geo.sort_values(PREFIX, kind="stable")
+    if layout == "reopened":
+        geo = pd.concat([geo, geo.head(50)])
+    geo.to_csv(tmp_path / GEOLOCATION, index=False)
+
+    passes = _count_passes(monkeypatch)
+    streamed = etl.aggregate_geolocation(tmp_path, chunksize=CHUNKSIZE)
+    expected = _notebook(tmp_path)
+
+    assert len(geo) >= 5 * CHUNKSIZE
+    assert passes == expected_passes
+    for column in ["geolocation_city", "geolocation_state"]:
+        streamed[column] = streamed[column].astype(object)
+        expected[column] = expected[column].astype(object)
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
@@ -0,0 +1,74 @@
+"""Pruning partisi bulan untuk ``load_dataset`` dengan ``date_range``"""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_orders_reviews
+from pipeline import build
+
+import snapshot
+
+NAME = "orders_reviews"
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    base_dir = str(tmp_path_factory.mktemp("parts"))
+    df = make_orders_reviews(5000, seed=11)
+    build.write_partitions(
+        df,
+        build.purchase_months(df["order_purchase_timestamp"]),
+        snapshot.partitions_path(base_dir, NAME),
+    )
+    return base_dir, snapshot.load_dataset(base_dir, NAME)
+
+
+def _count_reads(monkeypatch):
+    reads = []
+    read_snapshot = snapshot.read_snapshot
+
+    def counting(path, *args, **kwargs):
+        reads.append(path)
+        return read_snapshot(path, *args, **kwargs)
+
+    monkeypatch.setattr(snapshot, "read_snapshot", counting)
+    return reads
+
+
+@pytest.mark.parametrize(
+    "date_range",
+    [
+        (datetime.date(2017, 3, 15), datetime.date(2017, 4, 10)),
+        (datetime.date(2017, 6, 1), datetime.date(2017, 6, 30)),
+        (datetime.date(2016, 1, 1), datetime.date(2030, 1, 1)),
+        (datetime.date(2030, 1, 1), datetime.date(2030, 2, 1)),
+    ],
+)
+def test_pruned_load_matches_filter(dataset, monkeypatch, date_range):
+    base_dir, full = dataset
+    reads = _count_reads(monkeypatch)
+    pruned = snapshot.load_dataset(base_dir, NAME, date_range)
+
+    purchased = full["order_purchase_timestamp"].dt.normalize()
+    inside = purchased.between(pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]))
+    # Salinan: partisi tunggal yang utuh dikembalikan sebagai memmap
+    pd.testing.assert_frame_equal(pruned.copy(), full[inside].reset_index(drop=True))
+
+    # Hanya partisi bulan yang beririsan yang dibuka (plus satu untuk skema
+    # frame kosong)
+    months = set(purchased[inside].dt.strftime("%Y-%m"))
+    assert len(reads) == max(len(months), 1)
+
+
+def test_partition_stats_in_manifest(dataset):
+    base_dir, full = dataset
+    manifest = snapshot.read_manifest(snapshot.partitions_path(base_dir, NAME))
+    for key, entry in manifest["partitions"].items():
+        stats = entry["stats"][snapshot.PARTITION_COLUMN]
+        month = full["order_purchase_timestamp"].dt.strftime("%Y-%m") == key
+        values = full.loc[month, "order_purchase_timestamp"].astype("M8[ns]")
+        assert stats["min"] == values.min().value
+        assert stats["max"] == values.max().value
+        assert stats["nulls"] == 0
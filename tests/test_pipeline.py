@@ -0,0 +1,172 @@
+"""Build incremental menghasilkan output yang sama dengan full rebuild"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_raw_tables
+from pipeline import build, rollup, star
+
+import snapshot
+
+ORDERS = "orders_dataset.csv"
+REVIEWS = "order_reviews_dataset.csv"
+LOOKBACK = 60
+# Kolom key star schema -> dimensi yang memetakannya ke id
+KEY_DIMENSIONS = {
+    "order_key": "dim_order",
+    "customer_key": "dim_customer",
+    "seller_key": "dim_seller",
+    "product_key": "dim_product",
+    "category_key": "dim_category",
+}
+KEY_DIMENSIONS_BY_TABLE = {dim: key for key, dim in KEY_DIMENSIONS.items()}
+
+
+def _write(tables, data_dir):
+    for file, df in tables.items():
+        df.to_csv(os.path.join(data_dir, file), index=False)
+
+
+def _read_all(out_dir):
+    """Semua output build yang dibaca dashboard, sebagai frame biasa"""
+    frames = {
+        name: snapshot.read_partitioned(snapshot.partitions_path(out_dir, name))
+        for name in snapshot.DATASETS
+    }
+    frames[rollup.CATEGORY_ROLLUP] = snapshot.read_snapshot(
+        snapshot.snapshot_path(out_dir, rollup.CATEGORY_ROLLUP), mmap=False
+    )
+    for name in [star.FACT_TABLE, star.ITEMS_TABLE, *star.DIMENSIONS]:
+        frames[name] = star.read_star(out_dir, name, mmap=False)
+    return frames
+
+
+def _by_id(frames, name):
+    """Tabel star ``name`` dengan key diganti id-nya, diurutkan menurut id.
+
+    Key stabil bergantung pada urutan build, jadi build incremental dan build
+    full dari nol dibandingkan lewat id.
+    """
+    df = frames[name].copy()
+    for column, dim in KEY_DIMENSIONS.items():
+        if column not in df.columns or name == dim:
+            continue
+        ids = frames[dim][star.KEY_COLUMNS[dim]].to_numpy(dtype=object)
+        keys = df[column].to_numpy()
+        df[column] = np.where(keys >= 0, ids[np.maximum(keys, 0)], None)
+    if name in star.KEY_COLUMNS:
+        order = [star.KEY_COLUMNS[name]]
+        df = df.drop(columns=[KEY_DIMENSIONS_BY_TABLE[name]])
+    else:
+        order = [c for c in ["order_key", "order_item_id"] if c in df.columns]
+    return df.sort_values(order, ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def builds(tmp_path_factory):
+    """(output incremental, output full) setelah order dan review baru masuk"""
+    tables = make_raw_tables(3000, seed=7)
+    orders, reviews = tables[ORDERS], tables[REVIEWS]
+    purchased = pd.to_datetime(orders["order_purchase_timestamp"])
+    cut = purchased.quantile(0.9)
+
+    # Kondisi awal: 10% order terakhir dan reviewnya belum ada, sebagian
+    # order di jendela lookback masih "shipped"
+    before = orders[purchased < cut].copy()
+    recent = before[purchased[before.index] >= cut - pd.Timedelta(days=LOOKBACK)]
+    shipped = recent.sample(frac=0.1, random_state=1).index
+    before.loc[shipped, "order_status"] = "shipped"
+
+    # Sebagian order lama mendapat review kedua setelah ``cut``; review
+    # pertamanya jauh sebelum jendela yang dibaca build incremental
+    old = orders.loc[purchased < cut - pd.Timedelta(days=3 * LOOKBACK), "order_id"]
+    second = reviews[reviews["order_id"].isin(old.sample(20, random_state=2))].copy()
+    second["review_id"] = second["review_id"].str[::-1]
+    second["review_score"] = 1
+    second["review_creation_date"] = cut + pd.Timedelta(days=1)
+    reviews = pd.concat([reviews, second], ignore_index=True)
+    created = pd.to_datetime(reviews["review_creation_date"])
+
+    data_dir = tmp_path_factory.mktemp("raw")
+    inc_dir = tmp_path_factory.mktemp("incremental")
+    full_dir = tmp_path_factory.mktemp("full")
+    _write(
+        {**tables, ORDERS: before, REVIEWS: reviews[created < cut]},
+        data_dir,
+    )
+    build.run_pipeline(data_dir, inc_dir, csv=False)
+    first = _read_all(inc_dir)
+
+    # Data terbaru; geolocation dan sellers tidak disentuh
+    _write({ORDERS: orders, REVIEWS: reviews}, data_dir)
+    report = []
+    build.run_pipeline(
+        data_dir, inc_dir, incremental=True, lookback_days=LOOKBACK, report=report
+    )
+    build.run_pipeline(data_dir, full_dir, csv=False)
+    return report, _read_all(inc_dir), _read_all(full_dir), first
+
+
+def test_incremental_ran(builds):
+    report, _, full, _ = builds
+    stages = {stage["stage"]: stage for stage in report}
+    assert "upsert" in stages
+    assert "category_rollup" in stages
+    # Review dibaca sebatas jendela, ditambah review lama order yang
+    # mendapat review baru
+    assert 0 < stages["reviews"]["rows"] < len(full["orders_reviews"]) // 2
+    assert stages["reviews_history"]["rows"] > 0
+    # Star schema hanya dibangun ulang untuk order yang berubah
+    assert 0 < stages["star"]["rows"] < len(full[star.FACT_TABLE]) // 2
+
+
+@pytest.mark.parametrize("name", [*snapshot.DATASETS, rollup.CATEGORY_ROLLUP])
+def test_incremental_matches_full(builds, name):
+    _, incremental, full, _ = builds
+    assert len(full[name]) > 0
+    pd.testing.assert_frame_equal(incremental[name], full[name])
+
+
+@pytest.mark.parametrize("name", [star.FACT_TABLE, star.ITEMS_TABLE, *star.DIMENSIONS])
+def test_incremental_star_matches_full(builds, name):
+    _, incremental, full, _ = builds
+    assert len(full[name]) > 0
+    pd.testing.assert_frame_equal(_by_id(incremental, name), _by_id(full, name))
+
+
+@pytest.mark.parametrize("name", star.DIMENSIONS)
+def test_star_keys_are_stable(builds, name):
+    _, incremental, full, first = builds
+    column = star.KEY_COLUMNS[name]
+    key = KEY_DIMENSIONS_BY_TABLE[name]
+    before, after = first[name], incremental[name]
+    # Key tetap sama dengan posisi baris, id lama tidak bergeser
+    for dim in (before, after, full[name]):
+        np.testing.assert_array_equal(dim[key], np.arange(len(dim)))
+    pd.testing.assert_series_equal(
+        after[column].iloc[: len(before)], before[column], check_dtype=False
+    )
+    # Id baru ditambahkan terurut di belakang
+    assert after[column].iloc[len(before) :].is_monotonic_increasing
+
+
+def test_new_orders_append_keys(builds):
+    _, incremental, _, first = builds
+    before, after = first["dim_order"], incremental["dim_order"]
+    assert len(after) > len(before)
+    # Dengan key terurut id, order baru akan menggeser key order lama
+    assert not after["order_id"].is_monotonic_increasing
+
+
+def test_rollup_counts_new_orders(builds):
+    _, incremental, _, _ = builds
+    fact = incremental[star.FACT_TABLE]
+    delivered = (fact["order_status"] == "delivered") & fact["delivery_time"].notna()
+    months = incremental[rollup.CATEGORY_ROLLUP].groupby("month")["orders"].sum()
+    # Order dengan beberapa kategori dihitung sekali per kategori
+    assert months.sum() >= delivered.sum()
+    last = fact.loc[delivered, "order_purchase_timestamp"].max()
+    assert np.datetime64(last, "M") == np.datetime64(months.index.max(), "M")
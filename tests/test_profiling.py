@@ -0,0 +1,80 @@
+"""Profiling rerun: tracemalloc dan puncak memori saat run bersamaan"""
+
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import profiling
+
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    """Mulai tanpa tracemalloc (track_stage pipeline bisa menyalakannya)"""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    yield
+
+
+def test_keeps_tracing_it_did_not_start():
+    tracemalloc.start()
+    profiling.start_run()
+    profiling.finish_run()
+    assert tracemalloc.is_tracing()
+    tracemalloc.stop()
+
+
+def test_tracing_stops_after_last_run():
+    assert not tracemalloc.is_tracing()
+    profiling.start_run()
+    with profiling.stage("alloc"):
+        data = np.ones(2**20)
+    run = profiling.finish_run()
+    assert not tracemalloc.is_tracing()
+    assert not profiling.enabled()
+    assert run["stages"][0]["peak_mb"] >= data.nbytes / 2**20
+
+
+def test_overlapping_runs_drop_memory():
+    started, done = threading.Event(), threading.Event()
+    other = {}
+
+    def session():
+        profiling.start_run()
+        started.set()
+        done.wait()
+        with profiling.stage("other"):
+            pass
+        other["run"] = profiling.finish_run()
+
+    thread = threading.Thread(target=session)
+    profiling.start_run()
+    with profiling.stage("before"):
+        np.ones(1000)
+    thread.start()
+    started.wait()
+    with profiling.stage("during"):
+        np.ones(1000)
+    done.set()
+    thread.join()
+    assert tracemalloc.is_tracing()
+    run = profiling.finish_run()
+    assert not tracemalloc.is_tracing()
+
+    peaks = {s["name"]: s["peak_mb"] for s in run["stages"]}
+    assert peaks["before"] is not None
+    assert peaks["during"] is None
+    assert other["run"]["stages"][0]["peak_mb"] is None
+    assert profiling.stages_frame(run)["Puncak MB"].isna().sum() == 1
+
+
+def test_dead_thread_run_is_released():
+    # Rerun yang gagal tidak pernah memanggil finish_run
+    thread = threading.Thread(target=profiling.start_run)
+    thread.start()
+    thread.join()
+    profiling.start_run()
+    run = profiling.finish_run()
+    assert not run["shared"]
+    assert not tracemalloc.is_tracing()
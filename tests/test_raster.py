@@ -0,0 +1,64 @@
+"""Raster kepadatan peta: binning sama dengan ``np.histogram2d``"""
+
+import numpy as np
+import pytest
+
+import raster
+
+SHAPE = (40, 50)
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(8)
+    n = 50_000
+    # Sebagian koordinat di luar batas peta
+    lat = rng.uniform(-40, 10, n)
+    lng = rng.uniform(-80, -30, n)
+    late = rng.random(n) < 0.2
+    return lat, lng, late
+
+
+def _histogram(lat, lng):
+    x0, x1, y0, y1 = raster.GEO_EXTENT
+    counts, _, _ = np.histogram2d(lat, lng, bins=SHAPE, range=[[y0, y1], [x0, x1]])
+    return counts.astype(np.int64)
+
+
+def test_counts_match_histogram2d(points):
+    lat, lng, late = points
+    grid = raster.bin_geo(lat, lng, late, shape=SHAPE)
+
+    np.testing.assert_array_equal(grid["late"], _histogram(lat[late], lng[late]))
+    np.testing.assert_array_equal(grid["ontime"], _histogram(lat[~late], lng[~late]))
+    total = grid["ontime"] + grid["late"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        np.testing.assert_allclose(grid["ratio"], grid["late"] / total)
+
+
+def test_matches_per_row_loop(points):
+    lat, lng, late = (values[:2000] for values in points)
+    x0, x1, y0, y1 = raster.GEO_EXTENT
+    ny, nx = SHAPE
+    expected = {"ontime": np.zeros(SHAPE, np.int64), "late": np.zeros(SHAPE, np.int64)}
+    for y, x, is_late in zip(lat, lng, late):
+        if x0 <= x < x1 and y0 <= y < y1:
+            # Baris 0 adalah latitude terkecil
+            row = int((y - y0) * ny / (y1 - y0))
+            col = int((x - x0) * nx / (x1 - x0))
+            expected["late" if is_late else "ontime"][row, col] += 1
+
+    grid = raster.bin_geo(lat, lng, late, shape=SHAPE)
+    for key, counts in expected.items():
+        np.testing.assert_array_equal(grid[key], counts)
+
+
+def test_density_rgba_hides_empty_cells(points):
+    lat, lng, late = points
+    grid = raster.bin_geo(lat, lng, late, shape=SHAPE)
+    rgba = raster.density_rgba(grid)
+    total = grid["ontime"] + grid["late"]
+
+    assert rgba.shape == (*SHAPE, 4)
+    np.testing.assert_array_equal(rgba[..., 3] == 0, total == 0)
+    assert rgba[..., 3].max() == pytest.approx(1.0)
@@ -0,0 +1,84 @@
+"""Skema dtype ringkas: nilai sama dengan CSV mentah, memori lebih kecil"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_geo_orders, make_orders_reviews
+
+import cube
+import schema
+import snapshot
+
+
+@pytest.fixture(scope="module")
+def raw(tmp_path_factory):
+    """Dataset dashboard seperti dimuat dari CSV hasil notebook"""
+    base_dir = tmp_path_factory.mktemp("csv")
+    orders_reviews = make_orders_reviews(5000, seed=17)
+    datasets = {
+        "orders_reviews": orders_reviews,
+        "geo_orders": make_geo_orders(orders_reviews, seed=17),
+    }
+    frames = {}
+    for name, df in datasets.items():
+        path = snapshot.csv_path(base_dir, name)
+        df.to_csv(path, index=False)
+        frames[name] = snapshot.read_csv_dataset(path)
+    return frames
+
+
+@pytest.mark.parametrize("name", snapshot.DATASETS)
+def test_values_survive_schema(raw, name):
+    df = raw[name]
+    compact = schema.apply_schema(df, name)
+
+    for column, kind in schema.SCHEMAS[name].items():
+        if column not in df.columns:
+            continue
+        if kind == "late_flag":
+            assert compact["is_late"].dtype == bool
+            np.testing.assert_array_equal(
+                compact["is_late"], df[column] == cube.LATE_STATUS
+            )
+            assert column not in compact.columns
+        elif kind.startswith("float"):
+            np.testing.assert_allclose(
+                compact[column].to_numpy(np.float64),
+                df[column].to_numpy(np.float64),
+                rtol=1e-6,
+            )
+        else:
+            assert (compact[column].astype(object) == df[column].astype(object)).all()
+    untouched = [c for c in df.columns if c not in schema.SCHEMAS[name]]
+    pd.testing.assert_frame_equal(compact[untouched], df[untouched])
+
+
+@pytest.mark.parametrize("name", snapshot.DATASETS)
+def test_schema_shrinks_memory(raw, name):
+    compact = schema.apply_schema(raw[name], name)
+    report = schema.memory_report(raw[name], compact)
+    assert report.loc["Total", "Sesudah (MB)"] < report.loc["Total", "Sebelum (MB)"]
+    for column, kind in schema.SCHEMAS[name].items():
+        if kind in ("category", "int8", "int16") and column in compact.columns:
+            assert (
+                report.loc[column, "Sesudah (MB)"] <= report.loc[column, "Sebelum (MB)"]
+            )
+
+
+def test_filters_match_on_compact_columns(raw):
+    df = raw["geo_orders"]
+    compact = schema.apply_schema(df, "geo_orders")
+    states = ["SP", "RJ", "MG"]
+    expected = df["customer_state"].isin(states) & (
+        df["delivery_status"] == cube.LATE_STATUS
+    )
+    actual = compact["customer_state"].isin(states) & compact["is_late"]
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_integer_columns_with_missing_values():
+    df = pd.DataFrame({"delivery_time": [3.0, np.nan, 12.0]})
+    compact = schema.apply_schema(df, "orders_reviews")
+    assert compact["delivery_time"].dtype == np.float32
+    np.testing.assert_array_equal(compact["delivery_time"], df["delivery_time"])
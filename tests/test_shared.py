@@ -0,0 +1,94 @@
+"""Snapshot bersama: hasil ``freeze`` read-only dan penulisan snapshot"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_orders_reviews
+
+import cube
+import filters
+import schema
+import shared
+import snapshot
+
+
+@pytest.fixture
+def orders_reviews():
+    df = schema.apply_schema(make_orders_reviews(2000, seed=3), "orders_reviews")
+    cube.add_time_buckets(df)
+    return df
+
+
+def test_freeze_blocks_writes(orders_reviews):
+    cells = cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS)
+    memory = pd.Series({"Total": 1.0})
+    df, cells, extra = shared.freeze((orders_reviews, cells, {"memory": memory}))
+
+    with pytest.raises(ValueError):
+        df.loc[0, "review_score"] = 1
+    with pytest.raises(ValueError):
+        df.loc[0, "order_status"] = df["order_status"].cat.categories[-1]
+    with pytest.raises(ValueError):
+        cells.loc[cells.index[0], "count"] = 0
+    with pytest.raises(ValueError):
+        cells["delivery_time"].to_numpy()[0] = 0
+    with pytest.raises(ValueError):
+        extra["memory"].iloc[0] = 0
+
+
+def test_freeze_keeps_referenced_buffers(orders_reviews):
+    cells = shared.freeze(cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS))
+    counts = cells["count"]
+    before = counts.to_numpy().copy()
+    # Dengan referensi lain, Copy-on-Write menyalin blok, bukan menulis buffer
+    cells.loc[cells.index[0], "count"] = -1
+    np.testing.assert_array_equal(counts.to_numpy(), before)
+
+
+def test_frozen_frame_still_filters(orders_reviews):
+    index = filters.build_index(orders_reviews, filters.REVIEW_INDEX)
+    orders_reviews, index = shared.freeze((orders_reviews, index))
+    rows = filters.select(index, score_range=(4, 5))
+    out = filters.take(orders_reviews, rows, ["review_score"])
+    assert out["review_score"].between(4, 5).all()
+    # Hasil filter adalah salinan yang boleh diubah
+    out.loc[out.index[0], "review_score"] = 1
+
+
+def test_publish_leaves_only_snapshot(tmp_path, orders_reviews):
+    path = shared.shared_path(str(tmp_path), "orders_reviews", "abc")
+    os.makedirs(os.path.dirname(path))
+    # Folder sementara proses lain tidak disentuh
+    stale = path + ".1234.tmp"
+    os.makedirs(stale)
+    shared.publish(orders_reviews, path, extra={"rows": len(orders_reviews)})
+    shared.publish(orders_reviews, path, extra={"rows": len(orders_reviews)})
+
+    assert sorted(os.listdir(os.path.dirname(path))) == sorted(
+        [os.path.basename(path), os.path.basename(stale)]
+    )
+    assert os.stat(path).st_mode & 0o777 == 0o755
+    df, extra = shared.attach(path)
+    assert extra == {"rows": len(orders_reviews)}
+    np.testing.assert_array_equal(
+        df["review_score"].to_numpy(), orders_reviews["review_score"].to_numpy()
+    )
+
+
+def test_failed_write_removes_temp(tmp_path):
+    path = snapshot.snapshot_path(str(tmp_path), "bad")
+    df = pd.DataFrame({"value": [1, 2]})
+    with pytest.raises(TypeError):
+        snapshot.write_snapshot(df, path, extra={"bad": object()})
+    assert os.listdir(tmp_path) == []
+
+
+def test_freeze_shares_buffers(orders_reviews):
+    frozen = shared.freeze(orders_reviews)
+    assert frozen is not orders_reviews
+    pd.testing.assert_frame_equal(frozen, orders_reviews)
+    for col in ["review_score", "delivery_time", "order_purchase_timestamp"]:
+        assert np.shares_memory(frozen[col].to_numpy(), orders_reviews[col].to_numpy())
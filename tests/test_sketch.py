@@ -0,0 +1,106 @@
+"""Sketch KLL dan momen dibandingkan dengan pandas pada data acak tetap"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cube
+import sketch
+
+QS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def rank_error(values, estimates, qs):
+    """Galat rank ternormalisasi terbesar dari ``estimates`` untuk ``qs``"""
+    values = np.sort(values)
+    n = len(values)
+    error = 0.0
+    for estimate, q in zip(estimates, qs):
+        # Rank estimasi adalah rentang posisi nilai itu di data terurut
+        lo = np.searchsorted(values, estimate, side="left") / (n - 1)
+        hi = (np.searchsorted(values, estimate, side="right") - 1) / (n - 1)
+        error = max(error, lo - q, q - hi)
+    return error
+
+
+@pytest.fixture(scope="module")
+def geo():
+    rng = np.random.default_rng(42)
+    n = 200_000
+    df = pd.DataFrame(
+        {
+            "customer_state": pd.Categorical(
+                rng.choice(["SP", "RJ", "MG", "AC"], n, p=[0.5, 0.3, 0.199, 0.001])
+            ),
+            "is_late": rng.random(n) < 0.1,
+            "delivery_time": rng.poisson(10, n),
+        }
+    )
+    km = rng.lognormal(5, 0.8, n) + df["delivery_time"] * 3
+    km[rng.random(n) < 0.01] = np.nan
+    df["km"] = km
+    return df
+
+
+def test_rank_error_k200():
+    assert sketch.rank_error(200) == pytest.approx(0.013, abs=0.001)
+
+
+def test_small_sketch_is_exact():
+    values = np.random.default_rng(0).normal(size=150)
+    estimates = sketch.kll_quantiles(sketch.kll_sketch(values, k=200), QS)
+    np.testing.assert_allclose(estimates, pd.Series(values).quantile(QS))
+
+
+@pytest.mark.parametrize("k", [50, 200])
+def test_kll_rank_error_within_bound(k):
+    values = np.random.default_rng(1).lognormal(3, 1, 100_000)
+    s = sketch.kll_sketch(values, k=k, seed=1)
+    assert s["n"] == len(values)
+    assert sum(len(level) for level in s["levels"]) < len(values) // 10
+    estimates = sketch.kll_quantiles(s, QS)
+    assert rank_error(values, estimates, QS) <= sketch.rank_error(k)
+
+
+def test_merged_sketch_within_bound():
+    rng = np.random.default_rng(2)
+    chunks = [rng.exponential(50 * (i + 1), 20_000) for i in range(8)]
+    merged = sketch.kll_merge(
+        [sketch.kll_sketch(c, seed=i) for i, c in enumerate(chunks)]
+    )
+    values = np.concatenate(chunks)
+    assert merged["n"] == len(values)
+    estimates = sketch.kll_quantiles(merged, QS)
+    assert rank_error(values, estimates, QS) <= sketch.rank_error()
+
+
+@pytest.mark.parametrize(
+    "states", [["SP", "RJ", "MG", "AC"], ["RJ"], ["AC"], ["MG", "AC"]]
+)
+def test_describe_matches_pandas(geo, states):
+    parts = sketch.build_partitions(
+        geo, ["customer_state", "is_late"], "km", "delivery_time"
+    )
+    selected = parts["keys"].index[parts["keys"]["customer_state"].isin(states)]
+    summary, corr = sketch.describe(parts, selected)
+
+    rows = geo["customer_state"].isin(states)
+    km = geo.loc[rows, "km"]
+    exact = km.describe()
+    for stat in ["count", "mean", "std", "min", "max"]:
+        assert summary[stat] == pytest.approx(exact[stat], rel=1e-9)
+    assert corr == pytest.approx(km.corr(geo.loc[rows, "delivery_time"]), abs=1e-9)
+    quartiles = [summary["25%"], summary["50%"], summary["75%"]]
+    assert rank_error(km.dropna().to_numpy(), quartiles, [0.25, 0.5, 0.75]) <= (
+        sketch.rank_error(parts["k"])
+    )
+
+
+def test_describe_empty_selection(geo):
+    parts = sketch.build_partitions(
+        geo, ["customer_state", "is_late"], "km", "delivery_time"
+    )
+    summary, corr = sketch.describe(parts, [])
+    assert list(summary.index) == cube.DESCRIBE_INDEX
+    assert summary.isna().all()
+    assert np.isnan(corr)
@@ -0,0 +1,69 @@
+"""``month_id``/``weekday`` dan view tren sama dengan versi pandas per baris"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_orders_reviews
+
+import cube
+import views
+
+
+@pytest.fixture(scope="module")
+def orders_reviews():
+    return make_orders_reviews(20_000, seed=12)
+
+
+def test_time_buckets_match_pandas(orders_reviews):
+    df = cube.add_time_buckets(orders_reviews.copy())
+    timestamps = orders_reviews["order_purchase_timestamp"]
+
+    np.testing.assert_array_equal(
+        cube.month_labels(df["month_id"]),
+        timestamps.dt.to_period("M").astype(str),
+    )
+    np.testing.assert_array_equal(df["weekday"], timestamps.dt.dayofweek)
+    np.testing.assert_array_equal(
+        np.array(cube.WEEKDAY_NAMES)[df["weekday"]], timestamps.dt.day_name()
+    )
+
+
+def test_trend_matches_pandas(orders_reviews):
+    df = orders_reviews.copy()
+    df["month"] = df["order_purchase_timestamp"].dt.to_period("M").astype(str)
+    grouped = df.groupby("month").agg(
+        {
+            "order_id": "count",
+            "delivery_time": "mean",
+            "review_score": "mean",
+            "delivery_status": lambda x: (x == cube.LATE_STATUS).sum(),
+        }
+    )
+    expected_stats = grouped.round(2)
+    expected_stats.columns = ["Total Order", "Mean Delivery", "Mean Score", "Terlambat"]
+    expected_stats["Persen Terlambat"] = (
+        expected_stats["Terlambat"] / expected_stats["Total Order"] * 100
+    ).round(1)
+    expected_days = (
+        df["order_purchase_timestamp"]
+        .dt.day_name()
+        .value_counts()
+        .reindex(cube.WEEKDAY_NAMES)
+    )
+
+    cells = cube.build_cube(orders_reviews, cube.REVIEW_DIMENSIONS)
+    monthly, monthly_stats, day_counts = views.trend(cells)
+
+    pd.testing.assert_frame_equal(
+        monthly,
+        grouped[["order_id", "delivery_time", "review_score"]],
+        check_dtype=False,
+        check_names=False,
+    )
+    pd.testing.assert_frame_equal(
+        monthly_stats, expected_stats, check_dtype=False, check_names=False
+    )
+    pd.testing.assert_series_equal(
+        day_counts, expected_days, check_dtype=False, check_names=False
+    )